@@ -0,0 +1,146 @@
+"""Benchmarks of the padtest overhead on the offline fake Plaxis server.
+
+Each case is timed on `padtest.testing.FakePlaxis`, so the measured
+time is the time spent by padtest plus the emulated latency of the
+remote calls, which is reported separately.
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --latency 0.0005 --samples 10000 --json bench.json
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import padtest
+from padtest.model.model import Model
+from padtest.testing import FakePlaxis
+
+
+SOIL = {'SoilModel': 'mc', 'gammaUnsat': 18, 'gammaSat': 20, 'ERef': 1e4,
+        'nu': 0.3, 'cref': 5, 'phi': 30}
+CONCRETE = {'SoilModel': 'linear elastic', 'gammaUnsat': 24, 'gammaSat': 24,
+            'ERef': 3e7, 'nu': 0.2}
+
+
+def timed(records, server, case, function, *args, **kwargs):
+    """Times a benchmark case.
+
+    Parameters
+    ----------
+    records : list
+        Benchmark records.
+    server : FakePlaxis
+        Fake Plaxis server.
+    case : str
+        Case name.
+    function : callable
+        Function to time.
+    *args, **kwargs
+        Function arguments.
+
+    Returns
+    -------
+    object
+        Function output.
+    """
+    server.reset_calls()
+    start = time.perf_counter()
+    output = function(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    ncall = sum(server.calls.values())
+    records.append({'case': case,
+                    'time': elapsed,
+                    'calls': ncall,
+                    'latency': ncall * server.latency})
+    return output
+
+
+def run(samples, stages, nstep, latency):
+    """Runs the benchmark cases.
+
+    Parameters
+    ----------
+    samples : int
+        Number of samples of the dynamic load and base shake records.
+    stages : int
+        Number of stages of the load test.
+    nstep : int
+        Steps of each static phase.
+    latency : float
+        Delay of each remote call [s].
+
+    Returns
+    -------
+    list
+        Benchmark records.
+    """
+    records = []
+    server = FakePlaxis(nstep=nstep, capacity=5000, latency=latency)
+    time_history = np.linspace(0, samples / 100, samples)
+    load = -100 * np.sin(2 * np.pi * time_history)
+    acceleration = 0.1 * np.sin(2 * np.pi * time_history)
+
+    model = timed(records, server, 'build SSolid', padtest.SSolid, server,
+                  server.g_i, server.g_o, 1.5, 1, 0.3, 0.3, SOIL, CONCRETE)
+    timed(records, server, 'load_test', model.load_test, 'load',
+          -np.linspace(100, 1000, stages))
+    timed(records, server, 'failure_test', model.failure_test, 'failure', -100)
+    timed(records, server, 'safety_test', model.safety_test, 'safety', 'load')
+    timed(records, server, 'dynamic_test', model.dynamic_test, 'dynamic',
+          time_history, load)
+    timed(records, server, 'plot_test', model.plot_test, 'load')
+    timed(records, server, 'plot_safety_test', model.plot_safety_test, 'safety')
+    timed(records, server, 'plot_dynamic_test', model.plot_dynamic_test, 'dynamic')
+    plt.close('all')
+
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, 'model.pkl')
+        with mock.patch.object(Model, 'query_yes_no', return_value=True):
+            timed(records, server, 'save', model.save, filename)
+        timed(records, server, 'load', padtest.load, filename)
+
+    model = timed(records, server, 'build Solid (boundary interface)',
+                  padtest.Solid, server, server.g_i, server.g_o, 1.5, 1, 0.3,
+                  0.3, SOIL, CONCRETE, boundary_interface=True)
+    timed(records, server, 'shake_test', model.shake_test, 'shake',
+          time_history, acceleration)
+    timed(records, server, 'plot_shake_test', model.plot_shake_test, 'shake')
+    plt.close('all')
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--samples', type=int, default=2000,
+                        help='samples of the dynamic records (default 2000)')
+    parser.add_argument('--stages', type=int, default=10,
+                        help='stages of the load test (default 10)')
+    parser.add_argument('--nstep', type=int, default=50,
+                        help='steps of the static phases (default 50)')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='delay of each remote call [s] (default 0)')
+    parser.add_argument('--json', default=None,
+                        help='write the results to a json file')
+    args = parser.parse_args()
+
+    records = run(args.samples, args.stages, args.nstep, args.latency)
+    print('{:<34}{:>10}{:>10}{:>12}'.format('case', 'time [s]', 'calls', 'latency [s]'))
+    for record in records:
+        print('{case:<34}{time:>10.3f}{calls:>10d}{latency:>12.3f}'.format(**record))
+    if args.json is not None:
+        with open(args.json, 'w') as handle:
+            json.dump({'arguments': vars(args), 'results': records}, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,9 @@ from padtest.model.solid import NonSymmetricSolidModel as Solid
 # load model
 load = Solid.load
 
+# analytical bearing capacity
+from padtest.model.capacity import bearing_capacity
+
 # concrete plates
 from padtest.material.plate import PlateMaterial
 concrete = PlateMaterial.concrete
\ No newline at end of file
@@ -0,0 +1,399 @@
+import importlib
+import json
+import numbers
+import os
+import shutil
+import uuid
+
+import numpy as np
+
+from padtest.model.results import ModelResults
+
+SCHEMA_VERSION = 1
+_MANIFEST = 'manifest.json'
+_RESULTS = 'results'
+_ARRAYS = 'arrays'
+_INLINE_SIZE = 1024 # larger arrays are stored in binary files
+
+
+class _Encoder():
+    """Converts a model state to JSON values. Arrays larger than
+    `_INLINE_SIZE` are written to binary files and padtest objects are
+    stored with their class and state, each one once, later occurrences
+    being references. Other objects, e.g. Plaxis objects, are stored as
+    None.
+
+    Parameters
+    ----------
+    folder : str
+        Archive folder.
+    """
+
+    def __init__(self, folder):
+        """Initialize a new instance of `_Encoder`.
+
+        Parameters
+        ----------
+        folder : str
+            Archive folder.
+        """
+        self._folder = folder
+        self._objects = {}
+        self._narray = 0
+
+    def encode(self, value):
+        """JSON representation of a value.
+
+        Parameters
+        ----------
+        value : object
+            Value.
+
+        Returns
+        -------
+        object
+            Representation built with None, bool, int, float, str, lists
+            and dicts.
+        """
+        if isinstance(value, np.generic):
+            value = value.item()
+        if value is None or isinstance(value, (bool, str)):
+            return value
+        if isinstance(value, numbers.Integral):
+            return int(value)
+        if isinstance(value, numbers.Real):
+            return float(value)
+        if isinstance(value, np.ndarray):
+            return self._encode_array(value)
+        module = type(value).__module__
+        if module.startswith('padtest.') and not module.startswith('padtest.testing'):
+            return self._encode_object(value)
+        if isinstance(value, list):
+            return [self.encode(item) for item in value]
+        if isinstance(value, tuple):
+            return {'__tuple__': [self.encode(item) for item in value]}
+        if isinstance(value, dict):
+            if all([isinstance(key, str) and not key.startswith('__') for key in value]):
+                return {key: self.encode(item) for key, item in value.items()}
+            return {'__dict__': [[self.encode(key), self.encode(item)] for key, item in value.items()]}
+        return None
+
+    def _encode_array(self, value):
+        """JSON representation of an array.
+
+        Parameters
+        ----------
+        value : np.ndarray
+            Array.
+
+        Returns
+        -------
+        dict
+            Values or file of the array.
+        """
+        if value.dtype == object:
+            return {'__object_array__': [self.encode(item) for item in value.tolist()]}
+        if value.size <= _INLINE_SIZE:
+            return {'__array__': value.tolist(), 'dtype': value.dtype.str}
+        name = os.path.join(_ARRAYS, 'array_{:d}.npy'.format(self._narray))
+        self._narray += 1
+        np.save(os.path.join(self._folder, name), value)
+        return {'__file__': name.replace(os.sep, '/')}
+
+    def _encode_object(self, value):
+        """JSON representation of a padtest object.
+
+        Parameters
+        ----------
+        value : object
+            padtest object.
+
+        Returns
+        -------
+        dict
+            Class, state and dict items of the object, or a reference
+            to the object if it was already stored.
+        """
+        if id(value) in self._objects:
+            return {'__ref__': self._objects[id(value)]}
+        self._objects[id(value)] = len(self._objects)
+        cls = type(value)
+        state = value.__getstate__() if hasattr(value, '__getstate__') else vars(value)
+        encoded = {'__object__': '{}:{}'.format(cls.__module__, cls.__qualname__),
+                   'id': self._objects[id(value)],
+                   'state': self.encode(state)}
+        if isinstance(value, dict):
+            encoded['items'] = self.encode(dict(value))
+        return encoded
+
+
+class _Decoder():
+    """Rebuilds a model state from the JSON values written by
+    `_Encoder`. Arrays stored in binary files are memory-mapped.
+
+    Parameters
+    ----------
+    folder : str
+        Archive folder.
+    """
+
+    def __init__(self, folder):
+        """Initialize a new instance of `_Decoder`.
+
+        Parameters
+        ----------
+        folder : str
+            Archive folder.
+        """
+        self._folder = folder
+        self._objects = {}
+
+    def decode(self, value):
+        """Value of a JSON representation.
+
+        Parameters
+        ----------
+        value : object
+            JSON representation.
+
+        Returns
+        -------
+        object
+            Value.
+        """
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        if '__tuple__' in value:
+            return tuple([self.decode(item) for item in value['__tuple__']])
+        if '__dict__' in value:
+            return {self.decode(key): self.decode(item) for key, item in value['__dict__']}
+        if '__array__' in value:
+            return np.array(value['__array__'], dtype=np.dtype(value['dtype']))
+        if '__object_array__' in value:
+            items = [self.decode(item) for item in value['__object_array__']]
+            array = np.empty(len(items), dtype=object)
+            array[:] = items
+            return array
+        if '__file__' in value:
+            return np.asarray(np.load(os.path.join(self._folder, value['__file__']), mmap_mode='c'))
+        if '__ref__' in value:
+            return self._objects[value['__ref__']]
+        if '__object__' in value:
+            return self._decode_object(value)
+        return {key: self.decode(item) for key, item in value.items()}
+
+    def _decode_object(self, value):
+        """padtest object of a JSON representation.
+
+        Parameters
+        ----------
+        value : dict
+            Class, state and dict items of the object.
+
+        Returns
+        -------
+        object
+            padtest object.
+
+        Raises
+        ------
+        RuntimeError
+            Class not defined in padtest.
+        """
+        msg = 'Archive class <{}> is not a padtest class.'.format(value['__object__'])
+        module, name = value['__object__'].split(':')
+        if not module.startswith('padtest.') or module.startswith('padtest.testing'):
+            raise RuntimeError(msg)
+        cls = importlib.import_module(module)
+        for attr in name.split('.'):
+            cls = getattr(cls, attr)
+        if not isinstance(cls, type) or not cls.__module__.startswith('padtest.'):
+            raise RuntimeError(msg)
+        obj = cls.__new__(cls)
+        self._objects[value['id']] = obj
+        if 'items' in value:
+            obj.update(self.decode(value['items']))
+        state = self.decode(value['state'])
+        if hasattr(obj, '__setstate__'):
+            obj.__setstate__(state)
+        elif state is not None:
+            obj.__dict__.update(state)
+        return obj
+
+
+def _is_mapped(value, folder):
+    """Checks if an array is memory-mapped from a file of a folder.
+
+    Parameters
+    ----------
+    value : np.ndarray
+        Array.
+    folder : str
+        Folder.
+
+    Returns
+    -------
+    bool
+        True if the array memory is mapped from a file in the folder.
+    """
+    folder = os.path.join(os.path.abspath(folder), '')
+    base = value
+    while isinstance(base, np.ndarray):
+        if isinstance(base, np.memmap) and base.filename is not None \
+           and os.path.abspath(base.filename).startswith(folder):
+            return True
+        base = base.base
+    return False
+
+
+def _materialize(value, folder, seen):
+    """Reads into memory the arrays of a value that are memory-mapped
+    from the files of a folder. Lists, dicts and padtest objects are
+    updated in place.
+
+    Parameters
+    ----------
+    value : object
+        Value.
+    folder : str
+        Folder.
+    seen : set
+        Ids of the padtest objects already updated.
+
+    Returns
+    -------
+    object
+        Value without arrays mapped from the folder.
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            for idx, item in enumerate(value.flat):
+                value.flat[idx] = _materialize(item, folder, seen)
+            return value
+        return np.array(value) if _is_mapped(value, folder) else value
+    module = type(value).__module__
+    if module.startswith('padtest.') and not module.startswith('padtest.testing'):
+        if id(value) in seen:
+            return value
+        seen.add(id(value))
+        if isinstance(value, ModelResults):
+            value.materialize()
+            return value
+        for attr, item in list(getattr(value, '__dict__', {}).items()):
+            new_item = _materialize(item, folder, seen)
+            if new_item is not item:
+                setattr(value, attr, new_item)
+    if isinstance(value, list):
+        value[:] = [_materialize(item, folder, seen) for item in value]
+    elif isinstance(value, tuple):
+        return tuple([_materialize(item, folder, seen) for item in value])
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            value[key] = _materialize(item, folder, seen)
+    return value
+
+
+def write_archive(model, path):
+    """Writes a model to an archive folder. The folder holds a JSON
+    manifest with the schema version, the model class, the model input
+    properties and the test log, a folder with a binary `.npy` file per
+    results column and a folder with the large arrays of the model, e.g.
+    dynamic load histories. The archive is written in a temporary folder
+    that replaces the previous one when complete. When the folder
+    exists, the model arrays memory-mapped from it are read into memory
+    first, so a model loaded from an archive can be saved back to it.
+
+    Parameters
+    ----------
+    model : Model
+        Model without Plaxis objects.
+    path : str
+        Archive folder.
+
+    Raises
+    ------
+    RuntimeError
+        Previous archive in use, e.g. memory-mapped by another loaded
+        model.
+    """
+    if os.path.isdir(path):
+        _materialize(model, path, set())
+    temporary = '{}.{}.tmp'.format(path, uuid.uuid4().hex)
+    os.makedirs(os.path.join(temporary, _RESULTS))
+    os.makedirs(os.path.join(temporary, _ARRAYS))
+    encoder = _Encoder(temporary)
+    state = {attr: value for attr, value in vars(model).items() if attr not in ['_results', '_test_log']}
+    results = model._results.to_archive(os.path.join(temporary, _RESULTS))
+    cls = type(model)
+    manifest = {'schema version': SCHEMA_VERSION,
+                'class': '{}:{}'.format(cls.__module__, cls.__qualname__),
+                'model': encoder.encode(state),
+                'test log': encoder.encode(model._test_log),
+                'results': encoder.encode(results)}
+    with open(os.path.join(temporary, _MANIFEST), 'w') as handle:
+        json.dump(manifest, handle)
+    previous = None
+    if os.path.isdir(path):
+        previous = '{}.{}.old'.format(path, uuid.uuid4().hex)
+        try:
+            os.replace(path, previous)
+        except OSError:
+            shutil.rmtree(temporary, ignore_errors=True)
+            raise RuntimeError('Archive <{}> is in use and cannot be replaced.'.format(path))
+    os.replace(temporary, path)
+    if previous is not None:
+        shutil.rmtree(previous, ignore_errors=True)
+
+
+def is_archive(path):
+    """Checks if a path is a model archive.
+
+    Parameters
+    ----------
+    path : str
+        Path.
+
+    Returns
+    -------
+    bool
+        True if the path is an archive folder.
+    """
+    return os.path.isfile(os.path.join(path, _MANIFEST))
+
+
+def read_archive(path):
+    """Reads a model from an archive folder. Results columns and large
+    arrays are memory-mapped, so the model is available without reading
+    the results from disk.
+
+    Parameters
+    ----------
+    path : str
+        Archive folder.
+
+    Returns
+    -------
+    Model
+        Model without Plaxis objects.
+
+    Raises
+    ------
+    RuntimeError
+        Unsupported schema version.
+    RuntimeError
+        Archive class not defined in padtest.
+    """
+    with open(os.path.join(path, _MANIFEST), 'r') as handle:
+        manifest = json.load(handle)
+    version = manifest.get('schema version')
+    if version != SCHEMA_VERSION:
+        msg = 'Archive <{}> schema version <{}> not supported. Supported version is {}.'
+        raise RuntimeError(msg.format(path, version, SCHEMA_VERSION))
+    decoder = _Decoder(path)
+    model = decoder.decode({'__object__': manifest['class'], 'id': -1, 'state': manifest['model']})
+    model._test_log = decoder.decode(manifest['test log'])
+    model._results = ModelResults.from_archive(os.path.join(path, _RESULTS),
+                                               decoder.decode(manifest['results']))
+    return model
@@ -0,0 +1,437 @@
+import hashlib
+import numbers
+import os
+import pickle
+import shutil
+import uuid
+
+import numpy as np
+
+
+def _canonical(value, seen=None):
+    """Plain representation of a value used to hash model and test
+    definitions. Numbers are converted to float, arrays to lists and
+    padtest objects to their attributes. Other objects, e.g. Plaxis
+    objects, are ignored.
+
+    Parameters
+    ----------
+    value : object
+        Value.
+    seen : set, None, optional
+        Ids of the padtest objects being represented, used to skip
+        circular references. By default None.
+
+    Returns
+    -------
+    object
+        Representation built with None, bool, float, str and lists.
+    """
+    if seen is None:
+        seen = set()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, numbers.Number):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return ['array', _canonical(value.tolist(), seen)]
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item, seen) for item in value]
+    if isinstance(value, dict):
+        items = [[str(key), _canonical(item, seen)] for key, item in value.items()]
+        return ['dict'] + sorted(items, key=lambda item: item[0])
+    module = type(value).__module__
+    if module.startswith('padtest.') and not module.startswith('padtest.testing') and id(value) not in seen:
+        seen.add(id(value))
+        return [type(value).__name__, _canonical(vars(value), seen)]
+    return None
+
+
+def definition_key(*values):
+    """Hash of a model or test definition.
+
+    Parameters
+    ----------
+    *values
+        Values that define the model or test.
+
+    Returns
+    -------
+    str
+        SHA-256 hex digest of the values representation.
+    """
+    return hashlib.sha256(repr(_canonical(list(values))).encode('utf-8')).hexdigest()
+
+
+class ResultsCache():
+    """Persistent on-disk cache of calculated tests. Each entry is a
+    pickle file named after the hash of the model and test definition,
+    so the same test of the same model is found across sessions and
+    models. When the cache exceeds its size cap the entries are evicted
+    following the cache policy: 'lru' removes the least recently used
+    entries first and 'fifo' the oldest ones.
+
+    Parameters
+    ----------
+    path : str
+        Cache folder. It is created if it does not exist.
+    max_size : int, optional
+        Size cap of the cache [bytes]. By default 1 GB.
+    policy : str, optional
+        Eviction policy, 'lru' or 'fifo'. By default 'lru'.
+
+    Methods
+    -------
+    get(key)
+        Cached entry.
+    put(key, entry)
+        Adds an entry to the cache.
+    evict()
+        Removes entries until the cache is within its size cap.
+    clear()
+        Removes all the entries.
+    """
+    _suffix = '.pkl'
+
+    def __init__(self, path, max_size=2**30, policy='lru'):
+        """Initialize a new instance of `ResultsCache`.
+
+        Parameters
+        ----------
+        path : str
+            Cache folder. It is created if it does not exist.
+        max_size : int, optional
+            Size cap of the cache [bytes]. By default 1 GB.
+        policy : str, optional
+            Eviction policy, 'lru' or 'fifo'. By default 'lru'.
+
+        Raises
+        ------
+        RuntimeError
+            Unsupported eviction policy.
+        """
+        if policy not in ['lru', 'fifo']:
+            raise RuntimeError("Supported cache eviction policies are 'lru' and 'fifo'.")
+        self._path = path
+        self._max_size = max_size
+        self._policy = policy
+        os.makedirs(path, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries())
+
+    #===================================================================
+    # PRIVATE METHODS
+    #===================================================================
+    def _filename(self, key):
+        """Entry file name.
+
+        Parameters
+        ----------
+        key : str
+            Entry key.
+
+        Returns
+        -------
+        str
+            File name.
+        """
+        return os.path.join(self._path, key + self._suffix)
+
+    def _entries(self):
+        """Entry files.
+
+        Returns
+        -------
+        list
+            (file name, size [bytes], modification time) of each entry.
+        """
+        entries = []
+        for name in os.listdir(self._path):
+            if not name.endswith(self._suffix):
+                continue
+            filename = os.path.join(self._path, name)
+            try:
+                stat = os.stat(filename)
+            except FileNotFoundError:
+                continue
+            entries.append((filename, stat.st_size + self._extra_size(filename), stat.st_mtime))
+        return entries
+
+    def _extra_size(self, filename):
+        """Size of the files stored along an entry.
+
+        Parameters
+        ----------
+        filename : str
+            Entry file name.
+
+        Returns
+        -------
+        int
+            Size [bytes].
+        """
+        return 0
+
+    def _remove(self, filename):
+        """Removes an entry.
+
+        Parameters
+        ----------
+        filename : str
+            Entry file name.
+        """
+        try:
+            os.remove(filename)
+        except FileNotFoundError:
+            pass
+
+    #===================================================================
+    # PUBLIC METHODS
+    #===================================================================
+    @property
+    def size(self):
+        """Size of the cache [bytes]."""
+        return sum([entry[1] for entry in self._entries()])
+
+    def get(self, key):
+        """Cached entry. With the 'lru' policy the entry is marked as
+        used.
+
+        Parameters
+        ----------
+        key : str
+            Entry key.
+
+        Returns
+        -------
+        object, None
+            Cached entry or None if the key is not in the cache.
+        """
+        filename = self._filename(key)
+        try:
+            with open(filename, 'rb') as handle:
+                entry = pickle.load(handle)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        if self._policy == 'lru':
+            os.utime(filename)
+        return entry
+
+    def put(self, key, entry):
+        """Adds an entry to the cache and evicts entries if the cache
+        exceeds its size cap. The file is written under a temporary name
+        and then renamed, so concurrent readers never see partial
+        entries.
+
+        Parameters
+        ----------
+        key : str
+            Entry key.
+        entry : object
+            Picklable entry.
+        """
+        filename = self._filename(key)
+        temporary = '{}.{}.tmp'.format(filename, uuid.uuid4().hex)
+        with open(temporary, 'wb') as handle:
+            pickle.dump(entry, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, filename)
+        self.evict()
+
+    def evict(self):
+        """Removes entries until the cache is within its size cap,
+        least recently used ('lru') or oldest ('fifo') first.
+
+        Returns
+        -------
+        int
+            Number of removed entries.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum([entry[1] for entry in entries])
+        nremoved = 0
+        for filename, entry_size, _ in entries:
+            if size <= self._max_size:
+                break
+            self._remove(filename)
+            size -= entry_size
+            nremoved += 1
+        return nremoved
+
+    def clear(self):
+        """Removes all the entries."""
+        for filename, _, _ in self._entries():
+            self._remove(filename)
+
+
+class ProjectCache(ResultsCache):
+    """Persistent on-disk cache of built Plaxis projects. Each entry is
+    a Plaxis project with the model built and its initial phases
+    calculated, along with a pickle file with the data needed to bind
+    the model to the project. Entries are named after the hash of the
+    model definition. Plaxis never works on the cached files: projects
+    are copied into the cache after they are saved and copied out of it
+    before they are opened, since calculating a phase saves the open
+    project. The size cap and eviction policy of `ResultsCache` include
+    the project files.
+
+    Parameters
+    ----------
+    path : str
+        Cache folder. It is created if it does not exist.
+    max_size : int, optional
+        Size cap of the cache [bytes]. By default 10 GB.
+    policy : str, optional
+        Eviction policy, 'lru' or 'fifo'. By default 'lru'.
+
+    Methods
+    -------
+    get(key)
+        Cached entry.
+    put(key, entry)
+        Adds an entry to the cache.
+    get_project(key, folder)
+        Copies a cached project to a folder.
+    put_project(key, filename, entry)
+        Adds a project to the cache.
+    evict()
+        Removes entries until the cache is within its size cap.
+    clear()
+        Removes all the entries.
+    """
+    _project_suffix = '.p2dx'
+    _data_suffix = 'dat' # Plaxis stores the results in a '.p2dxdat' folder
+
+    def __init__(self, path, max_size=10 * 2**30, policy='lru'):
+        """Initialize a new instance of `ProjectCache`.
+
+        Parameters
+        ----------
+        path : str
+            Cache folder. It is created if it does not exist.
+        max_size : int, optional
+            Size cap of the cache [bytes]. By default 10 GB.
+        policy : str, optional
+            Eviction policy, 'lru' or 'fifo'. By default 'lru'.
+        """
+        super().__init__(path, max_size=max_size, policy=policy)
+
+    #===================================================================
+    # PRIVATE METHODS
+    #===================================================================
+    def _project(self, filename):
+        """Project file and data folder of an entry.
+
+        Parameters
+        ----------
+        filename : str
+            Entry file name.
+
+        Returns
+        -------
+        str
+            Project file name.
+        str
+            Project data folder.
+        """
+        project = filename[:-len(self._suffix)] + self._project_suffix
+        return project, project + self._data_suffix
+
+    def _extra_size(self, filename):
+        """Size of the project files of an entry.
+
+        Parameters
+        ----------
+        filename : str
+            Entry file name.
+
+        Returns
+        -------
+        int
+            Size [bytes].
+        """
+        project, data = self._project(filename)
+        size = os.path.getsize(project) if os.path.isfile(project) else 0
+        for root, _, files in os.walk(data):
+            size += sum([os.path.getsize(os.path.join(root, name)) for name in files])
+        return size
+
+    def _remove(self, filename):
+        """Removes an entry and its project files.
+
+        Parameters
+        ----------
+        filename : str
+            Entry file name.
+        """
+        super()._remove(filename)
+        project, data = self._project(filename)
+        if os.path.isfile(project):
+            os.remove(project)
+        shutil.rmtree(data, ignore_errors=True)
+
+    @staticmethod
+    def _copy(source, target):
+        """Copies a project file and its data folder.
+
+        Parameters
+        ----------
+        source : str
+            Source project file name.
+        target : str
+            Target project file name.
+        """
+        shutil.copyfile(source, target)
+        data = source + ProjectCache._data_suffix
+        if os.path.isdir(data):
+            shutil.copytree(data, target + ProjectCache._data_suffix, dirs_exist_ok=True)
+
+    #===================================================================
+    # PUBLIC METHODS
+    #===================================================================
+    def get_project(self, key, folder):
+        """Copies a cached project to a folder. With the 'lru' policy the
+        entry is marked as used.
+
+        Parameters
+        ----------
+        key : str
+            Entry key.
+        folder : str
+            Target folder.
+
+        Returns
+        -------
+        str, None
+            Project file name in the target folder, None if the project
+            is not in the cache.
+        object, None
+            Cached entry, None if the project is not in the cache.
+        """
+        project, _ = self._project(self._filename(key))
+        entry = self.get(key)
+        if entry is None or not os.path.isfile(project):
+            return None, None
+        filename = os.path.join(folder, os.path.basename(project))
+        self._copy(project, filename)
+        return filename, entry
+
+    def put_project(self, key, filename, entry):
+        """Adds a project to the cache. The entry is written after the
+        project files, so entries without project are never found.
+
+        Parameters
+        ----------
+        key : str
+            Entry key.
+        filename : str
+            Saved project file name.
+        entry : object
+            Picklable entry.
+        """
+        project, data = self._project(self._filename(key))
+        shutil.rmtree(data, ignore_errors=True)
+        self._copy(filename, project)
+        self.put(key, entry)
@@ -0,0 +1,342 @@
+import numbers
+
+import numpy as np
+
+from padtest.material.soil import BaseSoilMaterial
+
+
+_GAMMA_WATER = 9.81
+_METHODS = ['terzaghi', 'meyerhof', 'vesic']
+_INCLINATION_ITERATIONS = 50
+
+
+def _soil_parameter(material, parameter, default=None):
+    """Value of a soil material parameter, accepting any of the
+    parameter names supported by the soil materials.
+
+    Parameters
+    ----------
+    material : dict
+        Dictionary with the soil material parameters.
+    parameter : str
+        Plaxis parameter name. E.g.: 'phi', 'cref', 'gammaUnsat'.
+    default : numeric, None, optional
+        Value returned when the parameter is not in the material. If
+        None the parameter is required. By default None.
+
+    Returns
+    -------
+    numeric
+        Parameter value.
+
+    Raises
+    ------
+    RuntimeError
+        Missing required parameter.
+    """
+    supported = [BaseSoilMaterial._sanitized_name(name)
+                 for name in BaseSoilMaterial._parameter_map[parameter]]
+    for key, value in material.items():
+        if BaseSoilMaterial._sanitized_name(key) in supported:
+            return value
+    if default is None:
+        msg = 'Soil material <{}> requires the <{}> parameter for the bearing capacity estimate.'
+        msg = msg.format(material.get('Identification', ''), parameter)
+        raise RuntimeError(msg)
+    return default
+
+
+def _soil_profile(soil, dstrata, wt, top, bottom):
+    """Soil properties between two depths. The friction angle, cohesion
+    and effective unit weight are averaged by thickness and the last
+    layer is extended downwards. Soil under the water table has the
+    buoyant unit weight.
+
+    Parameters
+    ----------
+    soil : list
+        (nstrata,) dictionaries with the soil material parameters.
+    dstrata : np.ndarray
+        (nstrata,) width of the soil layers [m].
+    wt : float, None
+        Water table depth [m].
+    top : float
+        Top depth [m].
+    bottom : float
+        Bottom depth [m].
+
+    Returns
+    -------
+    float
+        Average friction angle [deg].
+    float
+        Average cohesion [kPa].
+    float
+        Average effective unit weight [kN/m3].
+    float
+        Effective vertical stress increment between the two depths
+        [kPa].
+    """
+    zbottom = np.cumsum(dstrata)
+    zbottom[-1] = np.inf
+    depths = np.hstack([[top, bottom], zbottom[:-1]])
+    if wt is not None:
+        depths = np.hstack([depths, [wt]])
+    depths = np.unique(depths[(depths >= top) & (depths <= bottom)])
+    if len(depths) < 2:
+        depths = np.array([top, top])
+
+    phi = 0
+    cohesion = 0
+    stress = 0
+    for ztop, zbot in zip(depths[:-1], depths[1:]):
+        material = soil[int(np.searchsorted(zbottom, (ztop + zbot) / 2))]
+        gamma = _soil_parameter(material, 'gammaUnsat')
+        if wt is not None and ztop >= wt:
+            gamma = _soil_parameter(material, 'gammaSat', gamma) - _GAMMA_WATER
+        phi += _soil_parameter(material, 'phi', 0) * (zbot - ztop)
+        cohesion += _soil_parameter(material, 'cref', 0) * (zbot - ztop)
+        stress += gamma * (zbot - ztop)
+
+    thickness = depths[-1] - depths[0]
+    if thickness == 0:
+        material = soil[int(np.searchsorted(zbottom, top))]
+        gamma = _soil_parameter(material, 'gammaUnsat')
+        if wt is not None and top >= wt:
+            gamma = _soil_parameter(material, 'gammaSat', gamma) - _GAMMA_WATER
+        return (_soil_parameter(material, 'phi', 0),
+                _soil_parameter(material, 'cref', 0), gamma, 0)
+    return phi / thickness, cohesion / thickness, stress / thickness, stress
+
+
+def _bearing_factors(phi, method):
+    """Bearing capacity factors.
+
+    Parameters
+    ----------
+    phi : float
+        Friction angle [deg].
+    method : str
+        'terzaghi', 'meyerhof' or 'vesic'.
+
+    Returns
+    -------
+    float
+        Cohesion factor Nc.
+    float
+        Overburden factor Nq.
+    float
+        Self weight factor Ngamma.
+    """
+    phir = np.radians(phi)
+    if method == 'terzaghi':
+        a = np.exp((0.75 * np.pi - phir / 2) * np.tan(phir))
+        nq = a**2 / (2 * np.cos(np.radians(45 + phi / 2))**2)
+        ngamma = 2 * (nq + 1) * np.tan(phir) / (1 + 0.4 * np.sin(4 * phir))
+        nc = 5.7 if phi == 0 else (nq - 1) / np.tan(phir)
+        return nc, nq, ngamma
+    nq = np.exp(np.pi * np.tan(phir)) * np.tan(np.radians(45 + phi / 2))**2
+    nc = 2 + np.pi if phi == 0 else (nq - 1) / np.tan(phir)
+    if method == 'meyerhof':
+        ngamma = (nq - 1) * np.tan(1.4 * phir)
+    else:
+        ngamma = 2 * (nq + 1) * np.tan(phir)
+    return nc, nq, ngamma
+
+
+def _ultimate_pressure(method, phi, cohesion, q, gamma, b, d, ratio,
+                       inclination, nc, nq, ngamma, area):
+    """Gross ultimate bearing pressure on the effective foundation area.
+
+    Parameters
+    ----------
+    method : str
+        'terzaghi', 'meyerhof' or 'vesic'.
+    phi : float
+        Friction angle [deg].
+    cohesion : float
+        Cohesion [kPa].
+    q : float
+        Effective overburden at the foundation level [kPa].
+    gamma : float
+        Effective unit weight under the foundation [kN/m3].
+    b : float
+        Effective foundation width [m].
+    d : float
+        Foundation depth [m].
+    ratio : float
+        Foundation width to length ratio, 0 for strip foundations and
+        1 for circular foundations.
+    inclination : float
+        Horizontal to vertical load ratio.
+    nc, nq, ngamma : float
+        Bearing capacity factors.
+    area : float
+        Effective foundation area [m2] or width [m] in plane strain.
+
+    Returns
+    -------
+    float
+        Ultimate pressure [kPa].
+    """
+    phir = np.radians(phi)
+    if method == 'terzaghi':
+        sc, sq, sgamma = (1.3, 1, 0.6) if ratio == 1 else (1, 1, 1)
+        return cohesion * nc * sc + q * nq * sq + 0.5 * gamma * b * ngamma * sgamma
+
+    if method == 'meyerhof':
+        kp = np.tan(np.radians(45 + phi / 2))**2
+        sc = 1 + 0.2 * kp * ratio
+        dc = 1 + 0.2 * np.sqrt(kp) * d / b
+        sq = 1 + 0.1 * kp * ratio if phi > 10 else 1
+        dq = 1 + 0.1 * np.sqrt(kp) * d / b if phi > 10 else 1
+        alpha = np.degrees(np.arctan(inclination))
+        ic = iq = (1 - alpha / 90)**2
+        igamma = max(1 - alpha / phi, 0)**2 if phi > 0 else 1
+        return (cohesion * nc * sc * dc * ic + q * nq * sq * dq * iq
+                + 0.5 * gamma * b * ngamma * sq * dq * igamma)
+
+    sc = 1 + nq / nc * ratio
+    sq = 1 + ratio * np.tan(phir)
+    sgamma = 1 - 0.4 * ratio
+    k = d / b if d <= b else np.arctan(d / b)
+    dc = 1 + 0.4 * k
+    dq = 1 + 2 * np.tan(phir) * (1 - np.sin(phir))**2 * k
+    m = (2 + ratio) / (1 + ratio)
+    qult = (cohesion * nc * sc * dc + q * nq * sq * dq
+            + 0.5 * gamma * b * ngamma * sgamma)
+    if inclination == 0:
+        return qult
+    # the inclination factors depend on the vertical load, which is
+    # solved by fixed point iteration
+    for _ in range(_INCLINATION_ITERATIONS):
+        vertical = qult * area
+        if phi > 0:
+            iq = max(1 - inclination * vertical / (vertical + area * cohesion / np.tan(phir)), 0)**m
+            igamma = max(1 - inclination * vertical / (vertical + area * cohesion / np.tan(phir)), 0)**(m + 1)
+            ic = iq - (1 - iq) / (nc * np.tan(phir))
+        else:
+            iq = igamma = 1
+            ic = max(1 - m * inclination * vertical / (area * max(cohesion, 1e-12) * nc), 0)
+        qult = (cohesion * nc * sc * dc * ic + q * nq * sq * dq * iq
+                + 0.5 * gamma * b * ngamma * sgamma * igamma)
+    return qult
+
+
+def bearing_capacity(b, soil, d=0, dstrata=None, wt=None, load=[-1, 0, 0],
+                     model_type='planestrain', method='vesic'):
+    """Analytical bearing capacity estimate of a shallow foundation
+    following Terzaghi, Meyerhof or Vesic. Strip foundations are
+    assumed in plane strain and circular foundations in axisymmetry.
+
+    The strength parameters and effective unit weight are averaged over
+    a depth b under the foundation level, the overburden is computed
+    from the soil above it. Eccentric loads are considered with the
+    Meyerhof effective width b - 2 e. Inclined loads are considered with
+    the Meyerhof and Vesic inclination factors, the Terzaghi method
+    ignores the load inclination. The load is assumed to increase
+    proportionally, so the ultimate load has the direction of `load`.
+
+    Parameters
+    ----------
+    b : float
+        Foundation width [m].
+    soil : dict, list
+        Dictionary with the soil material properties or list of
+        dictionaries, one per layer. Uses 'phi', 'cref', 'gammaUnsat'
+        and 'gammaSat'.
+    d : float, optional
+        Foundation depth [m]. By default 0.
+    dstrata : list, None, optional
+        Width of soil layers [m]. The last layer is extended
+        downwards. If None a single layer is assumed. By default None.
+    wt : float, None, optional
+        Water table depth [m]. By default None.
+    load : numeric, array-like, optional
+        (3,) load direction (Fy, Fx, M), with compressive Fy negative.
+        Numeric input is assumed as Fy. By default [-1, 0, 0].
+    model_type : str, optional
+        'planestrain' for strip foundations with forces per unit length
+        or 'axisymmetry' for circular foundations. By default
+        'planestrain'.
+    method : str, optional
+        'terzaghi', 'meyerhof' or 'vesic'. By default 'vesic'.
+
+    Returns
+    -------
+    dict
+        Estimate with keys: 'qult' gross ultimate pressure [kPa],
+        'qnet' net ultimate pressure [kPa], 'q' overburden at the
+        foundation level [kPa], 'b' effective width [m], 'e'
+        eccentricity [m], 'phi' [deg], 'c' [kPa] and 'gamma' [kN/m3]
+        averaged soil properties, 'Nc', 'Nq' and 'Ngamma' bearing
+        capacity factors, 'force' net ultimate vertical force [kN/m]
+        or [kN] and 'load' (3,) ultimate load (Fy, Fx, M).
+
+    Raises
+    ------
+    RuntimeError
+        Unsupported method or model type.
+    RuntimeError
+        Non compressive or eccentric load beyond the foundation.
+    RuntimeError
+        Non vertical load in an axisymmetric model.
+    RuntimeError
+        Number of soil materials does not match the number of layers.
+    """
+    if method not in _METHODS:
+        msg = "Unsupported bearing capacity method <{}>. Supported methods are 'terzaghi', 'meyerhof' and 'vesic'."
+        raise RuntimeError(msg.format(method))
+    if model_type not in ['planestrain', 'axisymmetry']:
+        msg = "Unsupported model type <{}>. Supported types are 'planestrain' and 'axisymmetry'."
+        raise RuntimeError(msg.format(model_type))
+    if isinstance(load, numbers.Number):
+        load = [load, 0, 0]
+    load = np.array(load, dtype=float)
+    if load[0] >= 0:
+        raise RuntimeError('The bearing capacity estimate requires a compressive vertical load <Fy> < 0.')
+    if model_type == 'axisymmetry' and (load[1] != 0 or load[2] != 0):
+        raise RuntimeError('Axisymmetric models only allow for vertical loading.')
+    if isinstance(soil, dict):
+        soil = [soil]
+    if dstrata is None:
+        dstrata = [d + 3 * b]
+    if isinstance(dstrata, numbers.Number):
+        dstrata = [dstrata]
+    dstrata = np.array(dstrata, dtype=float)
+    if len(soil) != len(dstrata):
+        msg = "A material must be specified for each of the {:.0f} soil layers."
+        raise RuntimeError(msg.format(len(dstrata)))
+
+    eccentricity = np.abs(load[2] / load[0])
+    inclination = np.abs(load[1] / load[0])
+    beff = b - 2 * eccentricity
+    if beff <= 0:
+        msg = 'Load eccentricity <{:.2f}> beyond the foundation edge.'
+        raise RuntimeError(msg.format(eccentricity))
+    if model_type == 'axisymmetry':
+        ratio = 1
+        area = np.pi * b**2 / 4
+    else:
+        ratio = 0
+        area = beff
+
+    _, _, _, q = _soil_profile(soil, dstrata, wt, 0, d)
+    phi, cohesion, gamma, _ = _soil_profile(soil, dstrata, wt, d, d + b)
+    nc, nq, ngamma = _bearing_factors(phi, method)
+    qult = _ultimate_pressure(method, phi, cohesion, q, gamma, beff, d, ratio,
+                              inclination, nc, nq, ngamma, area)
+    force = (qult - q) * area
+    return {'qult': qult,
+            'qnet': qult - q,
+            'q': q,
+            'b': beff,
+            'e': eccentricity,
+            'phi': phi,
+            'c': cohesion,
+            'gamma': gamma,
+            'Nc': nc,
+            'Nq': nq,
+            'Ngamma': ngamma,
+            'force': force,
+            'load': load * force / np.abs(load[0])}
@@ -0,0 +1,208 @@
+import numpy as np
+
+from padtest.model.scripting import PlxScriptingError
+
+
+class ResultsExtractor():
+    """Reads curve results from Plaxis Output. The results of a phase
+    are requested as whole result paths, with a single
+    `getcurveresultspath` call per output point and result type,
+    instead of one `getcurveresults` call per step. When the Output
+    server rejects a result path, or returns a path that does not match
+    the phase steps, the results of that point and result type are read
+    step by step, and paths are still requested in later phases.
+
+    Parameters
+    ----------
+    g_o : PlxProxyGlobalObject
+        Global object of the current open Plaxis model in Output.
+    use_path : bool, optional
+        Request whole result paths. If False results are always read
+        step by step. By default True.
+
+    Methods
+    -------
+    step_results(points, step, result_types)
+        Results of the output points at a calculation step.
+    phase_results(ophase, points, result_types, nstep, steps=None)
+        Results of the output points at the steps of a phase.
+    phase_reached(ophase, quantities, nstep, point=None, result_group=None, steps=None)
+        Reached values at the steps of a phase.
+    """
+
+    def __init__(self, g_o, use_path=True):
+        """Initialize a new instance of `ResultsExtractor`.
+
+        Parameters
+        ----------
+        g_o : PlxProxyGlobalObject
+            Global object of the current open Plaxis model in Output.
+        use_path : bool, optional
+            Request whole result paths. If False results are always
+            read step by step. By default True.
+        """
+        self._g_o = g_o
+        self._use_path = use_path
+        self._reached_path = {} # False for reached values without result type
+
+    #===================================================================
+    # PRIVATE METHODS
+    #===================================================================
+    def _path(self, point, ophase, result_type, nstep):
+        """Result path of an output point along a phase.
+
+        Parameters
+        ----------
+        point : CombinedClass
+            Plaxis output point.
+        ophase : CombinedClass
+            Phase object in Output.
+        result_type : CombinedClass
+            Plaxis result type.
+        nstep : int
+            Number of steps in the phase.
+
+        Returns
+        -------
+        np.ndarray, None
+            (nstep,) results, None if the path is not available.
+        """
+        try:
+            values = self._g_o.getcurveresultspath(point, ophase, ophase, result_type)
+        except PlxScriptingError:
+            return None
+        values = np.array(values, dtype=float)
+        if values.shape != (nstep,):
+            return None
+        return values
+
+    #===================================================================
+    # PUBLIC METHODS
+    #===================================================================
+    def step_results(self, points, step, result_types):
+        """Results of the output points at a calculation step.
+
+        Parameters
+        ----------
+        points : list
+            Plaxis output points.
+        step : CombinedClass
+            Plaxis calculation step.
+        result_types : list
+            Plaxis result types.
+
+        Returns
+        -------
+        np.ndarray
+            (ntype, npoint) results.
+        """
+        results = np.zeros((len(result_types), len(points)))
+        for pidx, point in enumerate(points):
+            for tidx, result_type in enumerate(result_types):
+                results[tidx, pidx] = self._g_o.getcurveresults(point, step, result_type)
+        return results
+
+    def phase_results(self, ophase, points, result_types, nstep, steps=None):
+        """Results of the output points at the steps of a phase.
+
+        Parameters
+        ----------
+        ophase : CombinedClass
+            Phase object in Output.
+        points : list
+            Plaxis output points.
+        result_types : list
+            Plaxis result types.
+        nstep : int
+            Number of steps in the phase.
+        steps : np.ndarray, None, optional
+            Indexes of the phase steps to read. If None all the steps
+            are read. By default None.
+
+        Returns
+        -------
+        np.ndarray
+            (ntype, npoint, nstep) results, or (ntype, npoint, nsteps)
+            if `steps` is provided.
+        """
+        if steps is None:
+            steps = np.arange(nstep)
+        results = np.zeros((len(result_types), len(points), len(steps)))
+        missing = []
+        for pidx, point in enumerate(points):
+            for tidx, result_type in enumerate(result_types):
+                values = None
+                if self._use_path:
+                    values = self._path(point, ophase, result_type, nstep)
+                if values is None:
+                    missing.append((tidx, pidx))
+                else:
+                    results[tidx, pidx, :] = values[steps]
+        if len(missing) == 0:
+            return results
+        phase_steps = ophase.Steps.value
+        for sidx, step_idx in enumerate(steps):
+            step = phase_steps[step_idx]
+            for tidx, pidx in missing:
+                results[tidx, pidx, sidx] = self._g_o.getcurveresults(points[pidx], step, result_types[tidx])
+        return results
+
+    def phase_reached(self, ophase, quantities, nstep, point=None,
+                      result_group=None, steps=None):
+        """Reached values at the steps of a phase.
+
+        Parameters
+        ----------
+        ophase : CombinedClass
+            Phase object in Output.
+        quantities : list
+            Names of the reached values, e.g. 'SumMstage', 'SumMsf' or
+            'DynamicTime'.
+        nstep : int
+            Number of steps in the phase.
+        point : CombinedClass, None, optional
+            Output point used to request the reached values as result
+            paths. If None they are read step by step. By default None.
+        result_group : CombinedClass, None, optional
+            Plaxis result type group with the reached values, e.g.
+            `g_o.ResultTypes.Soil`. If None they are read step by step.
+            By default None.
+        steps : np.ndarray, None, optional
+            Indexes of the phase steps to read. If None all the steps
+            are read. By default None.
+
+        Returns
+        -------
+        dict
+            (nstep,) array with the values of each quantity, or
+            (nsteps,) if `steps` is provided.
+        """
+        if steps is None:
+            steps = np.arange(nstep)
+        reached = {}
+        missing = []
+        for quantity in quantities:
+            values = None
+            if self._use_path and point is not None and result_group is not None \
+               and self._reached_path.get(quantity, True):
+                try:
+                    result_type = getattr(result_group, quantity)
+                except AttributeError:
+                    # quantity without result type, always read step by step
+                    self._reached_path[quantity] = False
+                    result_type = None
+                if result_type is not None:
+                    values = self._path(point, ophase, result_type, nstep)
+            if values is None:
+                missing.append(quantity)
+                reached[quantity] = np.zeros(len(steps))
+            else:
+                reached[quantity] = values[steps]
+        if len(missing) == 0:
+            return reached
+        phase_steps = ophase.Steps.value
+        for sidx, step_idx in enumerate(steps):
+            step = phase_steps[step_idx]
+            for quantity in missing:
+                reached[quantity][sidx] = getattr(step.Reached, quantity).value
+        return reached
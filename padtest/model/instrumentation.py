@@ -0,0 +1,293 @@
+import numbers
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_MODULE_FILE = os.path.abspath(__file__)
+_PLAIN_TYPES = (str, bytes, numbers.Number, np.ndarray, type(None))
+
+
+class CallRecorder():
+    """Counts and times the remote calls made to the Plaxis scripting
+    servers. Each call is attributed to the padtest method that issued
+    it and to the test and phase being processed, taken from the
+    `testid` and `phaseid` variables of the calling methods.
+
+    Method calls are recorded with the method name (e.g. `set`,
+    `calculate`, `getcurveresults`), reading or writing the value of a
+    property as `value`, fetching an attribute with the attribute name
+    preceded by a dot (e.g. `.Deform`, `.phase`), setting an attribute
+    with the attribute name and indexing an object as `[]`.
+
+    Methods
+    -------
+    wrap(obj)
+        Wraps a Plaxis object so that its remote calls are recorded.
+    unwrap(obj)
+        Plaxis object behind a recorded object.
+    record(call, elapsed)
+        Adds a call to the record.
+    report(testid=None)
+        Summary of the recorded calls.
+    reset()
+        Removes all the records.
+    """
+
+    def __init__(self):
+        """Initialize a new instance of `CallRecorder`."""
+        self._calls = {}
+        self._lock = threading.Lock() # calls are recorded from worker threads
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    #===================================================================
+    # PRIVATE METHODS
+    #===================================================================
+    @staticmethod
+    def _caller():
+        """Method, test and phase that issued a call.
+
+        Returns
+        -------
+        str, None
+            Name of the innermost padtest method in the call stack.
+        str, None
+            Test id of the innermost padtest method with a `testid`
+            variable.
+        str, None
+            Phase id of the innermost padtest method with a `phaseid`
+            variable.
+        """
+        method = None
+        testid = None
+        phaseid = None
+        frame = sys._getframe(2)
+        while frame is not None:
+            filename = os.path.abspath(frame.f_code.co_filename)
+            if filename.startswith(_PACKAGE_DIR) and filename != _MODULE_FILE:
+                if method is None:
+                    method = frame.f_code.co_name
+                local = frame.f_locals
+                if testid is None and isinstance(local.get('testid'), str):
+                    testid = local['testid']
+                if phaseid is None and isinstance(local.get('phaseid'), str):
+                    phaseid = local['phaseid']
+                if testid is not None and phaseid is not None:
+                    break
+            frame = frame.f_back
+        return method, testid, phaseid
+
+    #===================================================================
+    # PUBLIC METHODS
+    #===================================================================
+    def wrap(self, obj):
+        """Wraps a Plaxis object so that its remote calls are recorded.
+        Numbers, strings and None are returned as they are and lists
+        and tuples are wrapped item by item.
+
+        Parameters
+        ----------
+        obj : object
+            Plaxis object.
+
+        Returns
+        -------
+        object
+            Recorded object.
+        """
+        if isinstance(obj, _PLAIN_TYPES) or isinstance(obj, InstrumentedProxy):
+            return obj
+        if isinstance(obj, list):
+            return [self.wrap(item) for item in obj]
+        if isinstance(obj, tuple):
+            return tuple(self.wrap(item) for item in obj)
+        return InstrumentedProxy(obj, self)
+
+    @staticmethod
+    def unwrap(obj):
+        """Plaxis object behind a recorded object.
+
+        Parameters
+        ----------
+        obj : object
+            Recorded object, list or tuple of recorded objects.
+
+        Returns
+        -------
+        object
+            Plaxis object.
+        """
+        if isinstance(obj, InstrumentedProxy):
+            return object.__getattribute__(obj, '_target')
+        if isinstance(obj, list):
+            return [CallRecorder.unwrap(item) for item in obj]
+        if isinstance(obj, tuple):
+            return tuple(CallRecorder.unwrap(item) for item in obj)
+        return obj
+
+    def record(self, call, elapsed):
+        """Adds a call to the record.
+
+        Parameters
+        ----------
+        call : str
+            Call name.
+        elapsed : float
+            Duration of the call [s].
+        """
+        method, testid, phaseid = self._caller()
+        key = (testid, phaseid, method, call)
+        with self._lock:
+            if key not in self._calls:
+                self._calls[key] = [0, 0.0]
+            self._calls[key][0] += 1
+            self._calls[key][1] += elapsed
+
+    def report(self, testid=None):
+        """Summary of the recorded calls.
+
+        Parameters
+        ----------
+        testid : str, None, optional
+            Only report the calls of a test. If None all the calls are
+            reported. By default None.
+
+        Returns
+        -------
+        pd.DataFrame
+            Number of calls and total time [s] by test, phase, method
+            and call.
+        """
+        columns = ['test', 'phase', 'method', 'call', 'count', 'time']
+        rows = [list(key) + value for key, value in self._calls.items()
+                if testid is None or key[0] == testid]
+        report = pd.DataFrame(rows, columns=columns)
+        return report.sort_values(['test', 'phase', 'time'], ascending=[True, True, False],
+                                  na_position='first', ignore_index=True)
+
+    def reset(self):
+        """Removes all the records."""
+        self._calls = {}
+
+
+class InstrumentedProxy():
+    """Transparent wrapper of a Plaxis object that records the remote
+    calls made through it. Objects returned by the wrapped object are
+    wrapped as well and recorded objects passed as arguments are
+    unwrapped before reaching Plaxis.
+
+    Parameters
+    ----------
+    target : object
+        Plaxis object.
+    recorder : CallRecorder
+        Call recorder.
+    """
+
+    def __init__(self, target, recorder):
+        """Initialize a new instance of `InstrumentedProxy`.
+
+        Parameters
+        ----------
+        target : object
+            Plaxis object.
+        recorder : CallRecorder
+            Call recorder.
+        """
+        object.__setattr__(self, '_target', target)
+        object.__setattr__(self, '_recorder', recorder)
+        object.__setattr__(self, '_name', None)
+
+    def _timed(self, call, function, *args):
+        """Calls a function recording its duration.
+
+        Parameters
+        ----------
+        call : str
+            Call name.
+        function : callable
+            Function.
+        *args
+            Function arguments.
+
+        Returns
+        -------
+        object
+            Function output.
+        """
+        recorder = object.__getattribute__(self, '_recorder')
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            recorder.record(call, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        target = object.__getattribute__(self, '_target')
+        recorder = object.__getattribute__(self, '_recorder')
+        if name == 'value':
+            return recorder.wrap(self._timed('value', getattr, target, name))
+        attribute = recorder.wrap(self._timed('.' + name, getattr, target, name))
+        if isinstance(attribute, InstrumentedProxy):
+            object.__setattr__(attribute, '_name', name)
+        return attribute
+
+    def __setattr__(self, name, value):
+        target = object.__getattribute__(self, '_target')
+        value = CallRecorder.unwrap(value)
+        self._timed(name, setattr, target, name, value)
+
+    def __getitem__(self, key):
+        target = object.__getattribute__(self, '_target')
+        recorder = object.__getattribute__(self, '_recorder')
+        key = CallRecorder.unwrap(key)
+        return recorder.wrap(self._timed('[]', lambda: target[key]))
+
+    def __call__(self, *args, **kwargs):
+        target = object.__getattribute__(self, '_target')
+        recorder = object.__getattribute__(self, '_recorder')
+        name = object.__getattribute__(self, '_name') or '()'
+        args = CallRecorder.unwrap(args)
+        kwargs = {key: CallRecorder.unwrap(value) for key, value in kwargs.items()}
+        return recorder.wrap(self._timed(name, lambda: target(*args, **kwargs)))
+
+    def __iter__(self):
+        target = object.__getattribute__(self, '_target')
+        recorder = object.__getattribute__(self, '_recorder')
+        return iter(recorder.wrap(self._timed('[]', list, target)))
+
+    def __len__(self):
+        return len(object.__getattribute__(self, '_target'))
+
+    def __bool__(self):
+        return bool(object.__getattribute__(self, '_target'))
+
+    def __eq__(self, other):
+        return object.__getattribute__(self, '_target') == CallRecorder.unwrap(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(object.__getattribute__(self, '_target'))
+
+    def __repr__(self):
+        return repr(object.__getattribute__(self, '_target'))
+
+    def __str__(self):
+        return str(object.__getattribute__(self, '_target'))
@@ -1,14 +1,29 @@
 from abc import ABC, abstractmethod
+import asyncio
 import copy
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import numpy as np
 import matplotlib.pyplot as plt
 import numbers
+import os
 import pandas as pd
 import pickle
+import shutil
 import sys
+import tempfile
 
 from padtest.material.plate import PlateMaterial
 from padtest.material.soil import SoilMaterialSelector
+from padtest.model.archive import is_archive, read_archive, write_archive
+from padtest.model.cache import ResultsCache, ProjectCache, definition_key
+from padtest.model.capacity import bearing_capacity
+from padtest.model.extraction import ResultsExtractor
+from padtest.model.instrumentation import CallRecorder
+from padtest.model.planner import PhaseTree
+from padtest.model.results import ModelResults
+from padtest.model.scripting import PlxScriptingError
+from padtest.model.signal import compress_history
 
 
 class Model(ABC):
@@ -67,6 +82,27 @@ class Model(ABC):
         with keys `XMin`, `XMax`, `YMin` and `YMax`, with supported
         values 'None', 'Viscous', 'Free-field' and 'Compliant base'.
         By default None.
+    boundary_interface : bool, optional
+        Include boundary interfaces needed for a base shake test.
+        This requires a much denser mesh and more computationally
+        demanding models. By default False.
+    results_dtype : str, optional
+        Floating point type used to store the displacement and force
+        results: 'float64' or 'float32'. Single precision halves the
+        memory of long dynamic and shake tests. By default 'float64'.
+    instrument : bool, optional
+        Count and time the remote calls to Plaxis. The report is
+        available in `call_report`. By default False.
+    cache : ResultsCache, str, None, optional
+        Persistent cache of calculated tests, or its folder. Tests
+        already calculated with the same model and test definition are
+        restored from the cache without calling Plaxis. By default
+        None.
+    project_cache : ProjectCache, str, None, optional
+        Persistent cache of built Plaxis projects, or its folder.
+        Models with the same definition open the cached project instead
+        of building it and calculating the initial phases. By default
+        None.
 
     Methods
     -------
@@ -75,13 +111,19 @@ class Model(ABC):
     regen(s_i, g_i, g_o, test=False) : 
         Regenerates the model in Plaxis. Optinoally it recalculates
         previous load tests.
-    save(filename)
+    save(filename, archive=False)
         Saves model to file. Plaxis objects cannot be stored, only
         input properties and results. When loaded, the model can
         be regenerated with <regen> method.
-    load(filename)
+    load(filename, tests=None)
         Loads saved test.
-    failure_test(testid, load, max_load=[np.inf, np.inf, np.inf], load_factor=2, load_increment=[0, 0, 0], qsurf=None, start_from='construction', delete_fail=True)
+    checkpoint(path)
+        Checkpoints the model after every calculated phase.
+    resume(path, s_i, g_i, g_o)
+        Restores a checkpointed model after a crash.
+    bearing_capacity(load=[-1, 0, 0], method='vesic')
+        Analytical bearing capacity estimate of the foundation.
+    failure_test(testid, load, max_load=[np.inf, np.inf, np.inf], load_factor=2, load_increment=[0, 0, 0], qsurf=None, start_from='construction', delete_fail=True, search='increment', tolerance=0.05, warm_start=False, first_guess=None)
         Test the foundation until the model does not converge.
     load_test(testid, load, start_from='construction', qsurf=None, delete_fail=True)
         Conducts a load test in the model.
@@ -91,6 +133,10 @@ class Model(ABC):
         Apply a dynamic load to the foundation.
     shake_test(testid, time, acceleration, start_from='construction', qsurf=None, nsubstep=10, delete_fail=True)
         Apply a displacement time history at the model base.
+    abuild(), aload_test(testid, ...), afailure_test(testid, ...), asafety_test(testid, ...), adynamic_test(testid, ...), ashake_test(testid, ...)
+        Asynchronous versions of the build and test methods.
+    run_plan(tests)
+        Calculates a test plan sharing the common phases of the tests.
     delete_test( testid, delete_fail=True) 
         Deletes a test from the model.
     plot_test(testid, force=None, displacement=None, phase=None, location=None, compression_positive=True, pullout_positive=False, reset_start=False, legend=False, xlim=None, ylim=None, figsize=(4, 3))
@@ -102,13 +148,46 @@ class Model(ABC):
     plot_shake_test(self, testid, displacement=None, acceleration=None, location=None, pullout_positive=False, xlim=None, ylim=None, legend=False, figsize=(8, 2))
         Plot shake test results versus time.
     """
+    _table_chunk = 1000 # multiplier table rows sent in each batch of commands
+    _async_workers = 8 # threads shared by the asynchronous methods of all models
+    _async_executor = None
+    _async_busy = False # model running an asynchronous method
+    _cancel_requested = False # cancel the running test at the next phase
+    _checkpoint = None # checkpoint folder
+    _checkpoint_model = 'model.pkl'
+    _checkpoint_log = 'log.pkl'
+    _checkpoint_project = 'project.p2dx'
+    _plan_shared = {} # test phases calculated by a previous test of the running plan
+    _project_folder = None # working copy of the project opened from the project cache
+    _max_dynamic_steps = 10000 # time steps of a dynamic phase in Plaxis
+    # Plaxis objects created when the model is built
+    _plaxis_attributes = ['_soil_plx', '_soil_material_plx', '_plate_material_plx',
+                          '_structure_polygons', '_structure_soil',
+                          '_phase_polygons', '_waterlevel', '_column_plx',
+                          '_footing_plx', '_boundary_interface',
+                          '_acceleration', '_load', '_mesh', '_surface_load',
+                          '_multipliers']
+    # other attributes set when the model is built
+    _build_attributes = ['_start_phase', '_start_phase_idx', '_nphase', '_phase_log']
+    # attributes that are not part of the model definition hashed by the cache
+    _cache_exclude = ['_s_i', '_g_i', '_g_o', '_recorder', '_extractor',
+                      '_results', '_test_log', '_iphases', '_ophases',
+                      '_output_point', '_cache', '_project_cache',
+                      '_model_key', '_test_keys', '_async_busy',
+                      '_cancel_requested', '_checkpoint', '_plan_shared',
+                      '_project_folder'] + _plaxis_attributes + _build_attributes
+    # test log keys that are not part of the test definition
+    _cache_volatile = ['phase', 'trials', 'bracket', 'estimate', 'path', 'cached',
+                       'breakpoints', 'compression error']
 
     def __init__(self, s_i, g_i, g_o, model_type, element_type, title,
                  comments, soil, fill, ratchetting_material,
                  ratchetting_threshold, mesh_density, locations, excavation,
                  deformation_boundary_condition=None,
                  dynamic_boundary_condtions=None, 
-                 shake_boundary_condtions=None, boundary_interface=False):
+                 shake_boundary_condtions=None, boundary_interface=False,
+                 results_dtype='float64', instrument=False,
+                 cache=None, project_cache=None):
         """Initialize a new instance of `Model`.
 
         Parameters
@@ -168,27 +247,70 @@ class Model(ABC):
             Include boundary interfaces needed for a base shake test.
             This requires a much denser mesh and more computationally
             demanding models. By default False.
+        results_dtype : str, optional
+            Floating point type used to store the displacement and force
+            results: 'float64' or 'float32'. Single precision halves the
+            memory of long dynamic and shake tests. By default 'float64'.
+        instrument : bool, optional
+            Count and time the remote calls to Plaxis. The report is
+            available in `call_report`. By default False.
+        cache : ResultsCache, str, None, optional
+            Persistent cache of calculated tests, or its folder. Tests
+            already calculated with the same model and test definition are
+            restored from the cache without calling Plaxis. By default
+            None.
+        project_cache : ProjectCache, str, None, optional
+            Persistent cache of built Plaxis projects, or its folder.
+            Models with the same definition open the cached project
+            instead of building it and calculating the initial phases. By
+            default None.
         """
-        self._s_i = s_i
-        self._g_i = g_i
-        self._g_o = g_o
+        self._recorder = CallRecorder() if instrument else None
+        self._set_servers(s_i, g_i, g_o)
+        self._cache = ResultsCache(cache) if isinstance(cache, str) else cache
+        self._project_cache = ProjectCache(project_cache) if isinstance(project_cache, str) else project_cache
+        self._model_key = None
+        self._test_keys = {}
         self._soil_material = {} # inputs required to create the materials
         self._plate_material = {} # inputs required to create the materials
+        self._soil_plx = {} # Plaxis soil objects of the polygons
         self._soil_material_plx = {} # Plaxis objects of the materials
         self._plate_material_plx = {} # Plaxis objects of the materials
         self._iphases = {}
+        self._phase_log = {} # parent phase and test of each phase id
+        self._multipliers = {} # Plaxis table multipliers by history hash
         self._init_model_settings(title, comments, model_type, element_type)
         self._init_strata_materials(soil)
         self._init_fill_materials(fill)
         self._init_ratchetting_material(ratchetting_material, ratchetting_threshold)
         self._init_mesh(mesh_density)
-        self._init_output(locations)
+        self._init_output(locations, results_dtype)
         self._init_boundary_conditions(deformation_boundary_condition, dynamic_boundary_condtions, shake_boundary_condtions, boundary_interface)
         self._build_excavation = excavation
     
     #===================================================================
     # PRIVATE METHODS
     #===================================================================   
+    def _set_servers(self, s_i, g_i, g_o):
+        """Sets the Plaxis scripting objects. When the calls are
+        instrumented, the objects are wrapped by the call recorder.
+
+        Parameters
+        ----------
+        s_i : Server
+            Plaxis Input Application remote sripting server.
+        g_i : PlxProxyGlobalObject
+            Global object of the current open Plaxis model in Input.
+        g_o : PlxProxyGlobalObject
+            Global object of the current open Plaxis model in Output.
+        """
+        if getattr(self, '_recorder', None) is not None:
+            s_i, g_i, g_o = [self._recorder.wrap(x) for x in [s_i, g_i, g_o]]
+        self._s_i = s_i
+        self._g_i = g_i
+        self._g_o = g_o
+        self._extractor = ResultsExtractor(g_o)
+
     def _init_model_settings(self, title, comments, model_type, element_type):
         """Initialize model settings.
 
@@ -305,7 +427,7 @@ class Model(ABC):
         """
         self._mesh_density = mesh_density
 
-    def _init_output(self, locations):
+    def _init_output(self, locations, results_dtype='float64'):
         """Initializes output.
 
         Parameters
@@ -314,17 +436,14 @@ class Model(ABC):
             (nloc, 1) location of output points in the foundation
             bottom, measured as [0, 1] where 0 is the center of the
             foundation and 1 the edge.
+        results_dtype : str, optional
+            Floating point type used to store the displacement and
+            force results: 'float64' or 'float32'. By default
+            'float64'.
         """
         self._ophases = {}
         self._test_log = {}
-        results_df = pd.DataFrame(columns=['test', 'phase', 'previous', 'plx id',
-                                           'previous plx id', 'location', 'step',
-                                           'time', 'sumMstage', 'SumMsf', 'uy',
-                                           'ux', 'Fy', 'Fx', 'M', 'qy0', 'qy1',
-                                           'qx', 'agx', 'agy',
-                                           'Fy target', 'Fx target',
-                                           'M target', 'ratchetting'])
-        self._results = results_df
+        self._results = ModelResults(dtype=results_dtype)
         self._ophases = {}
         locations = np.array(locations)
         if self._b2 == 0:
@@ -503,6 +622,10 @@ class Model(ABC):
     def _build_initial_phases(self):
         """Add the initial phases to the model.
         """
+        self._iphases = {}
+        self._ophases = {}
+        self._phase_log = {}
+        self._multipliers = {}
         if self._fill is not None and self._excavation:
             self._initial_phases_with_excavation()
         elif self._fill is not None and not self._excavation:
@@ -532,20 +655,24 @@ class Model(ABC):
         if self._column is not None:
             self._g_i.deactivate(self._column_plx[2], self._g_i.Model.CurrentPhase)
 
+        assignments = []
         for strata_idx, poly_idxs in self._excavation.items():
             for poly_idx in poly_idxs:
-                self._set_soil_material(self._g_i, poly_idx + 1, 0, 'strata_{:.0f}'.format(strata_idx + 1))
+                assignments.append((poly_idx + 1, 'strata_{:.0f}'.format(strata_idx + 1)))
         for strata_idx, poly_idxs in self._strata.items():
             for poly_idx in poly_idxs:
-                self._set_soil_material(self._g_i, poly_idx + 1, 0, 'strata_{:.0f}'.format(strata_idx + 1))
+                assignments.append((poly_idx + 1, 'strata_{:.0f}'.format(strata_idx + 1)))
         if self._ratchetting is not None:
             for strata_idx, poly_idxs in self._ratchetting.items():
                 for poly_idx in poly_idxs:
-                    self._set_soil_material(self._g_i, poly_idx + 1, 0, 'strata_{:.0f}'.format(strata_idx + 1))
+                    assignments.append((poly_idx + 1, 'strata_{:.0f}'.format(strata_idx + 1)))
+        self._set_soil_materials(0, assignments)
 
         # Excavation phase
         self._iphases['excavation'] = self._g_i.phase(self._g_i.InitialPhase)
         self._iphases['excavation'].Identification = "excavation"
+        self._phase_log['Initial Phase'] = {'parent': None, 'test': None}
+        self._phase_log['excavation'] = {'parent': 'Initial Phase', 'test': None}
         self._g_i.Model.CurrentPhase = self._iphases['excavation']
         self._g_i.set(self._g_i.Model.CurrentPhase.MaxStepsStored, 1000)
 
@@ -556,6 +683,7 @@ class Model(ABC):
         # construction phase
         self._iphases['construction'] = self._g_i.phase(self._iphases['excavation'])
         self._iphases['construction'].Identification = "construction"
+        self._phase_log['construction'] = {'parent': 'excavation', 'test': None}
         self._g_i.Model.CurrentPhase = self._iphases['construction']
         self._g_i.set(self._g_i.Model.CurrentPhase.MaxStepsStored, 1000)
         self._activate_foundation(2)
@@ -563,9 +691,11 @@ class Model(ABC):
             for poly_idx in poly_idxs:
                 self._g_i.activate(self._structure_polygons[poly_idx], self._g_i.Model.CurrentPhase)
 
+        assignments = []
         for strata_idx, poly_idxs in self._fill.items():
             for poly_idx in poly_idxs:
-                self._set_soil_material(self._g_i, poly_idx + 1, 2, 'fill_{:.0f}'.format(strata_idx + 1))
+                assignments.append((poly_idx + 1, 'fill_{:.0f}'.format(strata_idx + 1)))
+        self._set_soil_materials(2, assignments)
 
         self._interfaces.activate(self._g_i)
     
@@ -591,47 +721,74 @@ class Model(ABC):
 
         self._activate_foundation(0)
 
+        assignments = []
         for strata_idx, poly_idxs in self._strata.items():
             for poly_idx in poly_idxs:
-                self._set_soil_material(self._g_i, poly_idx + 1, 0, 'strata_{:.0f}'.format(strata_idx + 1))
-        
+                assignments.append((poly_idx + 1, 'strata_{:.0f}'.format(strata_idx + 1)))
         if self._ratchetting is not None:
             for strata_idx, poly_idxs in self._ratchetting.items():
                 for poly_idx in poly_idxs:
-                    self._set_soil_material(self._g_i, poly_idx + 1, 0, 'strata_{:.0f}'.format(strata_idx + 1))
+                    assignments.append((poly_idx + 1, 'strata_{:.0f}'.format(strata_idx + 1)))
+        self._set_soil_materials(0, assignments)
 
         self._interfaces.activate(self._g_i)
 
         if fill and self._fill is not None:
+            assignments = []
             for strata_idx, poly_idxs in self._fill.items():
                 for poly_idx in poly_idxs:
-                    self._set_soil_material(self._g_i, poly_idx + 1, 2, 'fill_{:.0f}'.format(strata_idx + 1))
+                    assignments.append((poly_idx + 1, 'fill_{:.0f}'.format(strata_idx + 1)))
+            self._set_soil_materials(2, assignments)
         
         # construction phase
         self._iphases['construction'] = self._g_i.phase(self._iphases['Initial Phase'])
         self._iphases['construction'].Identification = "construction"
+        self._phase_log['Initial Phase'] = {'parent': None, 'test': None}
+        self._phase_log['construction'] = {'parent': 'Initial Phase', 'test': None}
         self._g_i.Model.CurrentPhase = self._iphases['construction']
         self._g_i.set(self._g_i.Model.CurrentPhase.MaxStepsStored, 1000)
 
-    def _set_soil_material(self, g_i, soil_idx, phase_idx, material):
-        """Assings a soil material to a polygon in a given phase. g_i
-        must be passed as an argument so it is in the variable space.
+    def _build_soil_registry(self):
+        """Resolves the Plaxis soil object of each polygon, Soil_#,
+        once after the geometry is built.
+        """
+        self._soil_plx = {}
+        for poly_idx in range(len(self._polygons)):
+            soilid = 'Soil_{:.0f}'.format(poly_idx + 1)
+            self._soil_plx[poly_idx + 1] = getattr(self._g_i, soilid)
+
+    def _set_soil_materials(self, phase_idx, assignments):
+        """Assings soil materials to polygons in a given phase. The
+        assignments are sent to Plaxis in a single batch of commands.
+        If the server rejects the batch, the materials are assigned one
+        at a time.
 
         Parameters
         ----------
-        g_i : PlxProxyGlobalObject
-            Global object of the current open Plaxis model in Input.
-        soil_idx : int
-            Numer that identifies the soil, e.g. Soil_#.
         phase_idx : int
             Index of the phase in the self._g_i.phases list.
-        material : str
-            Material key in the soil material dictionary.
+        assignments : list
+            (soil number, material key) of each polygon, where the soil
+            number identifies the soil, e.g. Soil_#, and the material
+            key is the key in the soil material dictionary.
         """
-        material = "self._soil_material_plx['{}']".format(material)
-        txt = "self._g_i.setmaterial(self._g_i.Soil_{:.0f}, self._g_i.phases[{:.0f}], {})"
-        txt = txt.format(soil_idx, phase_idx, material)
-        exec(txt)
+        if len(assignments) == 0:
+            return
+        phase = self._g_i.phases[phase_idx]
+        phase_name = phase.Name.value
+        material_names = {}
+        commands = []
+        for soil_idx, material in assignments:
+            if material not in material_names:
+                material_names[material] = self._soil_material_plx[material].Name.value
+            commands.append('setmaterial Soil_{:.0f} {} {}'.format(soil_idx, phase_name, material_names[material]))
+        try:
+            self._s_i.call_and_handle_commands(*commands)
+            return
+        except PlxScriptingError:
+            pass
+        for soil_idx, material in assignments:
+            self._g_i.setmaterial(self._soil_plx[soil_idx], phase, self._soil_material_plx[material])
 
     @abstractmethod
     def _activate_foundation(self, phase):
@@ -672,37 +829,34 @@ class Model(ABC):
         
         sumMstage, Uy, Ux = self._extract_initial_phase_results(phaseid, nstep)
         
-        # ad results to dataframe
+        # ad results to the results table
+        phase_name = self._iphases[phase].Identification.value
+        plx_id = self._iphases[phase].Name.value
         for locidx, loc in enumerate(self._output_point):
-            df = pd.DataFrame({'test':[None] * nstep,
-                               'phase':[self._iphases[phase].Identification.value] * nstep,
-                               'previous':[None] * (nstep),
-                               'plx id':[self._iphases[phase].Name.value] * nstep,
-                               'previous plx id':[None] * nstep,
-                               'location': [loc] * nstep,
-                               'step': np.linspace(1, nstep, nstep),
-                               'time': [None] * nstep,
-                               'sumMstage':sumMstage, 
-                               'SumMsf': [None] * nstep,
-                               'uy': Uy[locidx, :],
-                               'ux': Ux[locidx, :],
-                               'Fy': [0] * nstep,
-                               'Fx': [0] * nstep,
-                               'M': [0] * nstep,
-                               'qy0': [0] * nstep,
-                               'qy1': [0] * nstep,
-                               'qx': [0] * nstep,
-                               'agx':[0] * nstep,
-                               'agy':[0] * nstep,
-                               'Fy target': [0] * nstep,
-                               'Fx target':[0] * nstep,
-                               'M target': [0] * nstep,                            
-                               'ratchetting': [False] * nstep})
-            if len(self._results) == 0:
-                self._results = df
-            else:
-                self._results = pd.concat([self._results, df])
-            self._results.reset_index(inplace=True, drop=True)
+            self._results.append({'test': None,
+                                  'phase': phase_name,
+                                  'previous': None,
+                                  'plx id': plx_id,
+                                  'previous plx id': None,
+                                  'location': loc,
+                                  'step': np.linspace(1, nstep, nstep),
+                                  'time': None,
+                                  'sumMstage': sumMstage,
+                                  'SumMsf': None,
+                                  'uy': Uy[locidx, :],
+                                  'ux': Ux[locidx, :],
+                                  'Fy': 0,
+                                  'Fx': 0,
+                                  'M': 0,
+                                  'qy0': 0,
+                                  'qy1': 0,
+                                  'qx': 0,
+                                  'agx': 0,
+                                  'agy': 0,
+                                  'Fy target': 0,
+                                  'Fx target': 0,
+                                  'M target': 0,
+                                  'ratchetting': False}, nstep)
 
     @abstractmethod
     def _extract_initial_phase_results(self, phaseid, sumMstage, Uy):
@@ -774,23 +928,25 @@ class Model(ABC):
         np.ndarray
             (3,) load applied at the end of the phase (Fy, Fx, M).
         """
-        idx = self._results['phase'] == phaseid
-        locs = self._results.loc[idx, 'location'].unique()
-        idx = idx & (self._results['location'] == locs[0])
+        testid = self._results.phase_test(phaseid)
+        locs = self._results.locations(testid, phaseid)
+        rows = self._results.rows(testid, phaseid, locs[0])
+        if isinstance(rows, slice):
+            rows = [rows.start, rows.stop - 1]
 
         if when=='end':
-            idx = np.max(self._results.loc[idx].index.to_numpy())
+            idx = rows[-1]
         elif when=='start':
-            idx = np.min(self._results.loc[idx].index.to_numpy())
+            idx = rows[0]
         
         if target:
-            load = [self._results.loc[idx, 'Fy target'],
-                    self._results.loc[idx, 'Fx target'],
-                    self._results.loc[idx, 'M target']]
+            load = [self._results.get('Fy target')[idx],
+                    self._results.get('Fx target')[idx],
+                    self._results.get('M target')[idx]]
         else:
-            load = [self._results.loc[idx, 'Fy'],
-                    self._results.loc[idx, 'Fx'],
-                    self._results.loc[idx, 'M']]
+            load = [self._results.get('Fy')[idx],
+                    self._results.get('Fx')[idx],
+                    self._results.get('M')[idx]]
         return np.array(load)
 
     def _set_deformation_boundary_conditions(self):
@@ -801,7 +957,8 @@ class Model(ABC):
         self._g_i.set(self._g_i.Deformations.BoundaryYMin, self._g_i.Model.CurrentPhase,  self._deformation_bc['YMin'])
         self._g_i.set(self._g_i.Deformations.BoundaryYMax, self._g_i.Model.CurrentPhase,  self._deformation_bc['YMax'])
 
-    def _set_dynamic_test_phase(self, testid, time, start_phaseid, nsubstep, shake):
+    def _set_dynamic_test_phase(self, testid, time, start_phaseid, nsubstep, shake,
+                                phaseid=None, reset_time=False):
         """Set up a dynamic design phase in the model
 
         Parameters
@@ -816,17 +973,25 @@ class Model(ABC):
             Substests in each time step.
         shake : bool
             True if base shake test.
+        phaseid : str, None, optional
+            Phase id. If None the test id is used. By default None.
+        reset_time : bool, optional
+            Restart the dynamic time at the start of the phase. By
+            default False.
         """
-        self._iphases[testid] = self._g_i.phase(self._iphases[start_phaseid])
-        self._iphases[testid].Identification = testid
-        self._g_i.Model.CurrentPhase = self._iphases[testid]
+        if phaseid is None:
+            phaseid = testid
+        self._add_phase(phaseid, start_phaseid, testid)
+        self._g_i.Model.CurrentPhase = self._iphases[phaseid]
         self._g_i.set(self._g_i.Model.CurrentPhase.DeformCalcType, "Dynamic")
+        if reset_time:
+            self._g_i.set(self._g_i.Model.CurrentPhase.Deform.ResetTime, True)
         self._g_i.set(self._g_i.Model.CurrentPhase.Deform.TimeIntervalSeconds, time[-1])
         self._g_i.set(self._g_i.Model.CurrentPhase.Deform.UseDefaultIterationParams, False)
         self._g_i.set(self._g_i.Model.CurrentPhase.Deform.TimeStepDetermType, "Manual")
         self._g_i.set(self._g_i.Model.CurrentPhase.Deform.MaxSteps, len(time))
         self._g_i.set(self._g_i.Model.CurrentPhase.Deform.SubSteps, nsubstep)
-        self._g_i.set(self._g_i.Model.CurrentPhase.MaxStepsStored, len(time))
+        self._set_steps_stored(testid, len(time))
 
         if shake:
             self._g_i.set(self._g_i.Dynamics.BoundaryXMin, self._g_i.Model.CurrentPhase,  self._shake_bc['XMin'])
@@ -839,6 +1004,282 @@ class Model(ABC):
             self._g_i.set(self._g_i.Dynamics.BoundaryYMax, self._g_i.Model.CurrentPhase,  self._dynamic_bc['YMax'])
             self._g_i.set(self._g_i.Dynamics.BoundaryYMin, self._g_i.Model.CurrentPhase,  self._dynamic_bc['YMin'])
         
+    def _dynamic_chunks(self, nt, chunk):
+        """Splits a time history in consecutive dynamic phases. Each
+        phase starts at the last time step of the previous one.
+
+        Parameters
+        ----------
+        nt : int
+            Number of time steps.
+        chunk : int, None
+            Maximum number of time steps of each phase. If None
+            `_max_dynamic_steps` is used.
+
+        Returns
+        -------
+        list
+            (start, end) indexes of the time steps of each phase.
+
+        Raises
+        ------
+        RuntimeError
+            Chunk length out of range.
+        """
+        if chunk is None:
+            chunk = self._max_dynamic_steps
+        if not isinstance(chunk, numbers.Integral) or chunk < 2 or chunk > self._max_dynamic_steps:
+            msg = 'Number of time steps in each phase must be an integer between 2 and {:,.0f}.'
+            raise RuntimeError(msg.format(self._max_dynamic_steps))
+        if nt <= chunk:
+            return [(0, nt)]
+        return [(start, min(start + chunk, nt)) for start in range(0, nt - 1, chunk - 1)]
+
+    def _calculate_dynamic_phases(self, testid, time, history, start_phaseid,
+                                  nsubstep, chunks, shake, delete_fail,
+                                  breakpoints=None):
+        """Calculates a dynamic or shake test as consecutive dynamic
+        phases. Each phase only
+        uploads the multiplier tables of its time steps and its results
+        are extracted before the next phase is calculated. The dynamic
+        time restarts in each phase, so the time of the results is
+        shifted to be continuous along the test. The first phase id is
+        the test id and the following ones '<testid>_chunk_#'.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        time : np.ndarray
+            (nt,) time array.
+        history : np.ndarray
+            (ncomp, nt) load or base acceleration history.
+        start_phaseid : str
+            Id of the test start phase.
+        nsubstep : int
+            Substests in each time step.
+        chunks : list
+            (start, end) indexes of the time steps of each phase, see
+            `_dynamic_chunks`.
+        shake : bool
+            True if base shake test.
+        delete_fail : bool
+            Deletes test phases from model if there is a calculation
+            error.
+        breakpoints : np.ndarray, None, optional
+            (nt,) boolean mask of the time steps uploaded to the
+            multiplier tables, see `_compress_history`. The number of
+            calculation steps is not changed. If None all the time
+            steps are uploaded. By default None.
+        """
+        prevphaseid = start_phaseid
+        for idx, (start, end) in enumerate(chunks):
+            phaseid = testid if idx == 0 else '{}_chunk_{:.0f}'.format(testid, idx)
+            offset = 0 if idx == 0 else time[start]
+            phase_time = time[start:end] - offset
+            self._set_dynamic_test_phase(testid, phase_time, prevphaseid, nsubstep, shake,
+                                         phaseid=phaseid, reset_time=idx > 0)
+            table = np.arange(start, end)
+            if breakpoints is not None:
+                table = start + np.flatnonzero(breakpoints[start:end])
+            if shake:
+                status = self._calculate_shake_phase(phaseid, time[table] - offset, history[:, table])
+            else:
+                status = self._calculate_dynamic_load_phase(phaseid, time[table] - offset, history[:, table])
+            self._check_phase_status(status, testid, phaseid, delete_fail)
+            self._set_phase_results(testid, phaseid, prevphaseid, [0, 0, 0])
+            if offset != 0:
+                rows = self._results.rows(testid, phaseid)
+                self._results.set('time', rows, self._results.get('time', rows) + offset)
+            prevphaseid = phaseid
+
+    def _compress_history(self, testid, time, history, chunks, compression):
+        """Selects the breakpoints of a dynamic or shake test history
+        uploaded to Plaxis and logs the achieved compression. The first
+        and last time steps of each dynamic phase are always kept.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        time : np.ndarray
+            (nt,) time array.
+        history : np.ndarray
+            (ncomp, nt) load or base acceleration history.
+        chunks : list
+            (start, end) indexes of the time steps of each phase, see
+            `_dynamic_chunks`.
+        compression : float, None
+            Maximum interpolation error relative to the peak of each
+            component. None for no compression.
+
+        Returns
+        -------
+        np.ndarray, None
+            (nt,) boolean mask of the breakpoints, None for no
+            compression.
+        """
+        self._test_log[testid]['compression'] = compression
+        if compression is None:
+            return None
+        keep = [start for start, _ in chunks] + [end - 1 for _, end in chunks]
+        breakpoints, error = compress_history(time, history, compression, keep=keep)
+        self._test_log[testid]['breakpoints'] = int(np.sum(breakpoints))
+        self._test_log[testid]['compression error'] = error
+        return breakpoints
+
+    def _calculate_shake_phase(self, phaseid, time, acceleration):
+        """Calculates a base shake phase.
+
+        Parameters
+        ----------
+        phaseid : str
+            Phase id.
+        time : np.ndarray
+            (nt,) time array.
+        acceleration : np.ndarray
+            (2, nt) base acceleration (ux, uy).
+
+        Returns
+        -------
+        str
+            Calculation status.
+        """
+        accel_x = self._set_table_multiplier(phaseid, 'displacement', time, acceleration[0], data_type="Accelerations")
+        accel_y = self._set_table_multiplier(phaseid, 'displacement', time, acceleration[1], data_type="Accelerations")
+
+        self._g_i.activate(self._g_i.DynLineDisplacement_1_1, self._g_i.Model.CurrentPhase)
+       
+        self._g_i.set(self._g_i.DynLineDisplacement_1_1.Multiplierx, self._g_i.Model.CurrentPhase, accel_x)
+        self._g_i.set(self._g_i.DynLineDisplacement_1_1.Multipliery, self._g_i.Model.CurrentPhase, accel_y)
+        self._g_i.set(self._g_i.LineDisplacement_1_1.Displacement_x, self._g_i.Model.CurrentPhase, "Prescribed")
+        self._g_i.set(self._g_i.LineDisplacement_1_1.Displacement_y, self._g_i.Model.CurrentPhase, "Prescribed")
+        self._g_i.set(self._g_i.LineDisplacement_1_1.ux_start, self._g_i.Model.CurrentPhase, 1)
+        self._g_i.set(self._g_i.LineDisplacement_1_1.uy_start, self._g_i.Model.CurrentPhase, 1)
+        
+        if not self._symmetric:
+            self._g_i.activate(self._g_i.DynLineDisplacement_1_2, self._g_i.Model.CurrentPhase)
+            self._g_i.set(self._g_i.DynLineDisplacement_1_2.Multiplierx, self._g_i.Model.CurrentPhase, accel_x)
+            self._g_i.set(self._g_i.DynLineDisplacement_1_2.Multipliery, self._g_i.Model.CurrentPhase, accel_y)
+            self._g_i.set(self._g_i.LineDisplacement_1_2.Displacement_x, self._g_i.Model.CurrentPhase, "Prescribed")
+            self._g_i.set(self._g_i.LineDisplacement_1_2.Displacement_y, self._g_i.Model.CurrentPhase, "Prescribed")
+            self._g_i.set(self._g_i.LineDisplacement_1_2.ux_start, self._g_i.Model.CurrentPhase, 1)
+            self._g_i.set(self._g_i.LineDisplacement_1_2.uy_start, self._g_i.Model.CurrentPhase, 1)
+
+        status = self._g_i.calculate(self._g_i.Model.CurrentPhase)
+        return status
+
+    def _new_table_multiplier(self, multiplier_type, data_type=None):
+        """Creates an empty table multiplier.
+
+        Parameters
+        ----------
+        multiplier_type : str
+            'load' or 'displacement'.
+        data_type : str, None, optional
+            Data type of a displacement multiplier, e.g.
+            'Accelerations'. If None the Plaxis default is kept. By
+            default None.
+
+        Returns
+        -------
+        CombinedClass
+            Plaxis multiplier object.
+        """
+        if multiplier_type == 'load':
+            multiplier = self._g_i.loadmultiplier()
+        else:
+            multiplier = self._g_i.displmultiplier()
+        self._g_i.set(multiplier.Signal, "Table")
+        if data_type is not None:
+            self._g_i.set(multiplier.DataType, data_type)
+        return multiplier
+
+    def _set_table_multiplier(self, phaseid, multiplier_type, time, values, data_type=None):
+        """Table multiplier with a time history used in a phase. The
+        multipliers are registered by the hash of their type, data type
+        and table, so a history applied again, e.g. from a different
+        start phase or surface load, reuses the existing multiplier.
+        New tables are sent to Plaxis as batches of commands of
+        `_table_chunk` rows. If the server rejects the batch, the
+        multiplier is deleted and rebuilt adding the table rows one at
+        a time.
+
+        Parameters
+        ----------
+        phaseid : str
+            Id of the phase that uses the multiplier.
+        multiplier_type : str
+            'load' or 'displacement'.
+        time : np.ndarray
+            (nt,) time array.
+        values : np.ndarray
+            (nt,) multiplier values.
+        data_type : str, None, optional
+            Data type of a displacement multiplier, e.g.
+            'Accelerations'. If None the Plaxis default is kept. By
+            default None.
+
+        Returns
+        -------
+        CombinedClass
+            Plaxis multiplier object.
+        """
+        key = definition_key(multiplier_type, data_type, np.asarray(time, dtype=float),
+                             np.asarray(values, dtype=float))
+        multipliers = self._phase_log[phaseid].setdefault('multipliers', [])
+        if key not in multipliers:
+            multipliers.append(key)
+        if key in self._multipliers:
+            return self._multipliers[key]
+        self._multipliers[key] = self._upload_table_multiplier(multiplier_type, time, values, data_type)
+        return self._multipliers[key]
+
+    def _upload_table_multiplier(self, multiplier_type, time, values, data_type=None):
+        """Creates a table multiplier with a time history. The table is
+        sent to Plaxis as batches of commands of `_table_chunk` rows.
+        If the server rejects the batch, the multiplier is deleted and
+        rebuilt adding the table rows one at a time.
+
+        Parameters
+        ----------
+        multiplier_type : str
+            'load' or 'displacement'.
+        time : np.ndarray
+            (nt,) time array.
+        values : np.ndarray
+            (nt,) multiplier values.
+        data_type : str, None, optional
+            Data type of a displacement multiplier, e.g.
+            'Accelerations'. If None the Plaxis default is kept. By
+            default None.
+
+        Returns
+        -------
+        CombinedClass
+            Plaxis multiplier object.
+        """
+        multiplier = self._new_table_multiplier(multiplier_type, data_type)
+        name = multiplier.Name.value
+        try:
+            for start in range(0, len(time), self._table_chunk):
+                commands = []
+                for idx in range(start, min(start + self._table_chunk, len(time))):
+                    commands.append('{}.Table.add'.format(name))
+                    commands.append('set {}.Table[{:.0f}].Time {!r}'.format(name, idx, float(time[idx])))
+                    commands.append('set {}.Table[{:.0f}].Multiplier {!r}'.format(name, idx, float(values[idx])))
+                self._s_i.call_and_handle_commands(*commands)
+            return multiplier
+        except PlxScriptingError:
+            self._g_i.delete(multiplier)
+
+        multiplier = self._new_table_multiplier(multiplier_type, data_type)
+        for idx, (t, value) in enumerate(zip(time, values)):
+            multiplier.Table.add()
+            self._g_i.set(multiplier.Table[idx].Time, t)
+            self._g_i.set(multiplier.Table[idx].Multiplier, value)
+        return multiplier
+
     def _get_start_phase(self, start):
         """Get the phase id to be used as the start conditions for
         a new load test.
@@ -877,7 +1318,7 @@ class Model(ABC):
             Wrong input format.
         """
         if isinstance(start, str):
-            if start in self._iphases and start not in self._test_log:
+            if start not in self._test_log and (start in self._iphases or self._test_of_phase(start) is not None):
                 return start
             if start in self._test_log:
                 if self._test_log[start] in ['failure', 'safety incremental', 'safety target']:
@@ -895,13 +1336,175 @@ class Model(ABC):
                 raise RuntimeError('Failure and safety tests cannot be used as start configurations.')
             if not isinstance(phaseid, int):
                 raise RuntimeError('A stage within a test must be specified by its number as an integer.')
-            phaseid = "{}_stage_{:.0f}".format(testid, phaseid)
-            if phaseid not in self._test_log[testid]['phase']:
-                raise RuntimeError('Requested start stage <{}> not available in test <{}>.'.format(phaseid, testid))
-            return phaseid
+            stage = phaseid
+            phaseid = "{}_stage_{:.0f}".format(testid, stage)
+            if phaseid in self._test_log[testid]['phase']:
+                return phaseid
+            if self._test_log[testid]['type'] == 'load':
+                # stages shared with a previous test of a test plan
+                stages = self._load_stages(testid)
+                if 0 <= stage < len(stages):
+                    return stages[stage]
+            raise RuntimeError('Requested start stage <{}> not available in test <{}>.'.format(phaseid, testid))
         msg = "Test start phase must be specified as a test id string, or a tuple (test id, stage number)."
         raise RuntimeError(msg)
 
+    def _calculate_load_stages(self, testid, load, test_phases, previous_phase,
+                               ratchetting, delete_fail):
+        """Calculates the stages of a load test.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        load : list
+            (nl, 3) loads applied in each stage.
+        test_phases : list
+            Phase id of each stage. Stages shared with a previous test
+            of a test plan are not calculated, see `_share_phase`.
+        previous_phase : list
+            Id of the previous phase of each stage.
+        ratchetting : bool
+            Flag indicating that ratchetting has alredy occured in the
+            test.
+        delete_fail : bool
+            Deletes test phases from model if there is a calculation
+            error.
+        """
+        for load_value, phaseid, prevphaseid in zip(load, test_phases, previous_phase):
+            if phaseid in self._plan_shared:
+                self._share_phase(testid, self._plan_shared[phaseid])
+                continue
+            status = self._calculate_load_phase(testid, phaseid, prevphaseid,
+                                                load_value, ratchetting)
+            self._check_phase_status(status, testid, phaseid, delete_fail)
+            self._set_phase_results(testid, phaseid, prevphaseid, load_value)
+            ratchetting = self._check_ratchetting(testid, phaseid, ratchetting)
+            self._checkpoint_phase(testid, phaseid)
+
+    def _calculate_load_stages_pipelined(self, testid, load, test_phases,
+                                         previous_phase, delete_fail):
+        """Calculates the stages of a load test extracting the results
+        of each stage in a worker thread while the next stage is
+        calculated. No second Output connection is opened: the worker
+        uses the model `g_o`, since the Output phases and output points
+        are bound to it, and the main thread waits for the worker
+        before the status of the next stage is checked, which may read
+        Output. The Input data of each stage is read before the next
+        one is calculated, so each server is used by a single thread at
+        a time and the results are added in the same order as in the
+        sequential calculation. Requires a model without ratchetting
+        material.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        load : list
+            (nl, 3) loads applied in each stage.
+        test_phases : list
+            Phase id of each stage.
+        previous_phase : list
+            Id of the previous phase of each stage.
+        delete_fail : bool
+            Deletes test phases from model if there is a calculation
+            error.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            extraction = None
+            for load_value, phaseid, prevphaseid in zip(load, test_phases, previous_phase):
+                status = self._calculate_load_phase(testid, phaseid, prevphaseid,
+                                                    load_value, False)
+                if extraction is not None:
+                    extraction.result()
+                self._check_phase_status(status, testid, phaseid, delete_fail)
+                phase_input = self._phase_input(phaseid, prevphaseid)
+                extraction = executor.submit(self._extract_phase_results, testid, phaseid,
+                                             prevphaseid, load_value, phase_input)
+            extraction.result()
+
+    def _check_storage(self, storage):
+        """Validates a step storage policy.
+
+        Parameters
+        ----------
+        storage : str, tuple, None
+            None, 'final', ('every', n), ('uniform', n) or ('log', n).
+
+        Returns
+        -------
+        str, tuple, None
+            Storage policy.
+
+        Raises
+        ------
+        RuntimeError
+            Unsupported storage policy.
+        """
+        if storage is None or storage == 'final':
+            return storage
+        if isinstance(storage, (tuple, list)) and len(storage) == 2 \
+           and storage[0] in ['every', 'uniform', 'log'] \
+           and isinstance(storage[1], numbers.Integral) and storage[1] > 0:
+            return (storage[0], int(storage[1]))
+        msg = ("Supported storage policies are None, 'final', ('every', n), "
+               "('uniform', n) and ('log', n), with n a positive integer.")
+        raise RuntimeError(msg)
+
+    def _set_steps_stored(self, testid, nstep):
+        """Sets the maximum number of steps stored by Plaxis in the
+        current phase following the test storage policy. Plaxis
+        distributes the stored steps along the phase, so only the
+        'final' and 'uniform' policies reduce the stored steps. The
+        other policies are applied when the results are extracted.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        nstep : int
+            Steps stored if all the steps are kept.
+        """
+        storage = self._test_log[testid].get('storage')
+        if storage == 'final':
+            nstep = 1
+        elif storage is not None and storage[0] == 'uniform':
+            nstep = min(nstep, storage[1])
+        self._g_i.set(self._g_i.Model.CurrentPhase.MaxStepsStored, nstep)
+
+    def _stored_steps(self, testid, nstep):
+        """Indexes of the stored steps of a phase extracted to the
+        results following the test storage policy. The last step is
+        always extracted.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        nstep : int
+            Number of steps stored in the phase.
+
+        Returns
+        -------
+        np.ndarray
+            Step indexes.
+        """
+        storage = self._test_log.get(testid, {}).get('storage')
+        if storage is None or nstep == 0:
+            return np.arange(nstep)
+        if storage == 'final':
+            return np.array([nstep - 1])
+        policy, n = storage
+        if policy == 'every':
+            steps = np.arange(n - 1, nstep, n)
+        elif n >= nstep:
+            return np.arange(nstep)
+        elif policy == 'uniform':
+            steps = np.round(np.linspace(0, nstep - 1, n)).astype(int)
+        else:
+            steps = np.round(np.geomspace(1, nstep, n)).astype(int) - 1
+        return np.unique(np.append(steps, nstep - 1))
+
     def _calculate_surface_load(self, testid, qsurf, start_phaseid, delete_phases): 
         """Calcualtes the surface load stage.
 
@@ -925,16 +1528,20 @@ class Model(ABC):
         if qsurf is None:
             return start_phaseid
         phaseid = testid + '_qsurf'
+        if phaseid in self._plan_shared:
+            phaseid = self._plan_shared[phaseid]
+            self._share_phase(testid, phaseid)
+            return phaseid
         self._test_log[testid]['phase'].append(phaseid)
-        self._iphases[phaseid] = self._g_i.phase(self._iphases[start_phaseid])
-        self._iphases[phaseid].Identification = phaseid
+        self._add_phase(phaseid, start_phaseid, testid)
 
         self._g_i.Model.CurrentPhase = self._iphases[phaseid]
-        self._g_i.set(self._g_i.Model.CurrentPhase.MaxStepsStored, 1000)
+        self._set_steps_stored(testid, 1000)
         self._set_surface_load(qsurf)
         status = self._g_i.calculate(self._g_i.Model.CurrentPhase)
         self._check_phase_status(status, testid, phaseid, delete_phases)
         self._set_phase_results(testid, phaseid, start_phaseid, [0, 0, 0])
+        self._checkpoint_phase(testid, phaseid)
         
         return phaseid
 
@@ -961,157 +1568,951 @@ class Model(ABC):
             Calculation status, 'OK' or error message.
         """
         self._test_log[testid]['phase'].append(phaseid)
-        self._iphases[phaseid] = self._g_i.phase(self._iphases[prevphaseid])
-        self._iphases[phaseid].Identification = phaseid
+        self._add_phase(phaseid, prevphaseid, testid)
 
         self._g_i.Model.CurrentPhase = self._iphases[phaseid]
-        self._g_i.set(self._g_i.Model.CurrentPhase.MaxStepsStored, 1000)
+        self._set_steps_stored(testid, 1000)
         self._update_ratchetting_material(testid, ratchetting, phaseid, prevphaseid)
         
         self._set_load(load)
         status = self._g_i.calculate(self._g_i.Model.CurrentPhase)
         return status
 
-    @abstractmethod
-    def _set_dynamic_load(self, time, load):
-        """Sets dynamic load."""
-        return NotImplementedError
-    
-    @abstractmethod
-    def _calculate_dynamic_load_phase(self, time, load):
-        """Calcualtes a dynamic load phase."""
-        return NotImplementedError
-    
-    @abstractmethod
-    def _set_dynamic_load_result(self, testid, time, load):
-        """Adds dynamic load values to results dataframe."""
-        return NotImplementedError
+    def _share_phase(self, testid, phaseid):
+        """Adds to a test a phase calculated by a previous test of a
+        test plan. The phase is added to the test log and its results
+        are copied under the test id.
 
-    @abstractmethod
-    def _set_load(self, load):
-        """Sets load value in the current phase.
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        phaseid : str
+            Id of the shared phase.
+        """
+        self._test_log[testid]['phase'].append(phaseid)
+        owner = self._results.phase_test(phaseid)
+        columns = self._checkpoint_columns(self._results.rows(owner, phaseid))
+        columns['test'] = testid
+        self._results.append(columns, len(columns['step']))
+        self._checkpoint_phase(testid, phaseid)
+
+    def _load_stages(self, testid):
+        """Phase ids of the stages of a load test, including the
+        stages shared with a previous test of a test plan.
 
         Parameters
         ----------
-        load : float, array-like
-            (3,) Fy, Fx and M [kN]. If float, the value is assuemd to be
-            Fy and Fx and M are set to 0.
+        testid : str
+            Test id.
+
+        Returns
+        -------
+        list
+            Phase id of each calculated stage.
+        """
+        test = self._test_log[testid]
+        if test['qsurf'] is None:
+            return list(test['phase'])
+        return test['phase'][1:]
+
+    def _calculate_failure_trial(self, testid, phaseid, prevphaseid, load):
+        """Computes a trial phase of a failure test and records its
+        outcome in the test log.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        phaseid : str
+            Phase id
+        prevphaseid : str
+            Id of the previous phase.
+        load : np.ndarray
+            (3,) load applied at the end of the phase (Fy, Fx, M).
+
+        Returns
+        -------
+        str
+            Calculation status, 'OK' or error message.
+        """
+        if phaseid in self._test_log[testid]['phase']:
+            self._test_log[testid]['phase'].remove(phaseid)
+        status = self._calculate_load_phase(testid, phaseid, prevphaseid, load, False)
+        self._test_log[testid]['trials'].append({'load': copy.deepcopy(load),
+                                                 'previous': prevphaseid,
+                                                 'status': status})
+        return status
+
+    def _add_phase(self, phaseid, prevphaseid, testid):
+        """Adds a phase to the Plaxis model and to the phase registry.
+
+        Parameters
+        ----------
+        phaseid : str
+            Phase id.
+        prevphaseid : str
+            Id of the parent phase.
+        testid : str
+            Id of the test that owns the phase.
+
+        Returns
+        -------
+        CombinedClass
+            Plaxis Input phase.
+
+        Raises
+        ------
+        RuntimeError
+            Test cancelled by an asynchronous method.
+        """
+        if self._cancel_requested:
+            raise RuntimeError('Test <{}> cancelled.'.format(testid))
+        if prevphaseid not in self._iphases:
+            # parent shared with a test of a plan restored from the cache
+            self._materialize_phase(prevphaseid)
+        self._iphases[phaseid] = self._g_i.phase(self._iphases[prevphaseid])
+        self._iphases[phaseid].Identification = phaseid
+        self._phase_log[phaseid] = {'parent': prevphaseid, 'test': testid}
+        return self._iphases[phaseid]
+
+    def _delete_phase(self, phaseid, delete_phase=True):
+        """Deletes a phase from the phase registry and, optionally,
+        from the Plaxis model.
+
+        Parameters
+        ----------
+        phaseid : str
+            Phase id.
+        delete_phase : bool, optional
+            Deletes the Input and Output phases from Plaxis. By default
+            True.
+        """
+        iphase = self._iphases.pop(phaseid, None)
+        ophase = self._ophases.pop(phaseid, None)
+        log = self._phase_log.pop(phaseid, None)
+        multipliers = [] if log is None else log.get('multipliers', [])
+        if not delete_phase:
+            # the Plaxis phase keeps using its multipliers, the model only
+            # forgets the ones that no other phase uses
+            used = self._used_multipliers()
+            for key in multipliers:
+                if key not in used:
+                    _ = self._multipliers.pop(key, None)
+            return
+        if iphase is not None:
+            self._g_i.delete(iphase)
+        if ophase is not None:
+            self._g_o.delete(ophase)
+        self._delete_multipliers(multipliers)
+
+    def _delete_multipliers(self, keys):
+        """Deletes the multipliers that are no longer used by any
+        phase in the registry.
+
+        Parameters
+        ----------
+        keys : list
+            Keys of the multipliers used by the deleted phases.
+        """
+        used = self._used_multipliers()
+        for key in keys:
+            if key in used or key not in self._multipliers:
+                continue
+            self._g_i.delete(self._multipliers.pop(key))
+
+    def _used_multipliers(self):
+        """Keys of the multipliers used by the phases in the registry.
+
+        Returns
+        -------
+        set
+            Multiplier keys.
+        """
+        used = set()
+        for log in self._phase_log.values():
+            used.update(log.get('multipliers', []))
+        return used
+
+    def _rename_phase(self, phaseid, new_phaseid):
+        """Changes the id of a phase.
+
+        Parameters
+        ----------
+        phaseid : str
+            Phase id.
+        new_phaseid : str
+            New phase id.
+        """
+        self._iphases[new_phaseid] = self._iphases.pop(phaseid)
+        self._iphases[new_phaseid].Identification = new_phaseid
+        if phaseid in self._ophases:
+            self._ophases[new_phaseid] = self._ophases.pop(phaseid)
+        self._phase_log[new_phaseid] = self._phase_log.pop(phaseid)
+
+    def _get_output_phase(self, phaseid):
+        """Output phase of a calculated phase, retrieved by the Plaxis
+        name of the Input phase. Output must be showing the phase or
+        one of its descendants.
+
+        Parameters
+        ----------
+        phaseid : str
+            Phase id.
+
+        Returns
+        -------
+        CombinedClass
+            Plaxis Output phase.
+        """
+        if phaseid not in self._ophases:
+            self._ophases[phaseid] = getattr(self._g_o, self._iphases[phaseid].Name.value)
+        return self._ophases[phaseid]
+
+    def _test_phases(self, testid):
+        """Ids of the phases owned by a test in the phase registry.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+
+        Returns
+        -------
+        list
+            Phase ids in creation order.
+        """
+        phase_log = getattr(self, '_phase_log', {})
+        return [phaseid for phaseid, phase in phase_log.items() if phase['test'] == testid]
+
+    def _keep_failure_trial(self, testid, phaseid, prevphaseid, load, chain, warm_start):
+        """Handles a converged failure test trial. Without warm start
+        the trial phase is deleted. With warm start it is kept as the
+        next stage of the test, from which the following trial starts.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        phaseid : str
+            Phase id of the trial.
+        prevphaseid : str
+            Id of the phase the trial started from.
+        load : np.ndarray
+            (3,) load applied at the end of the trial (Fy, Fx, M).
+        chain : list
+            (stage id, previous phase id, load) of the kept stages.
+        warm_start : bool
+            Keep the converged trials.
+
+        Returns
+        -------
+        str
+            Id of the phase the next trial starts from.
+        """
+        if not warm_start:
+            self._delete_phase(phaseid)
+            self._test_log[testid]['phase'].remove(phaseid)
+            return prevphaseid
+        stageid = '{}_stage_{:.0f}'.format(testid, len(chain))
+        self._rename_phase(phaseid, stageid)
+        self._test_log[testid]['phase'][-1] = stageid
+        chain.append((stageid, prevphaseid, copy.deepcopy(load)))
+        return stageid
+
+    def _search_failure_load(self, testid, phaseid, start_phaseid, load,
+                             max_load, load_factor, load_increment, search,
+                             tolerance, warm_start):
+        """Searchs the failure load. The trial load is incremented
+        until the calculation does not converge. With the bisection
+        search, the bracket between the last converged and the first
+        failed trials is then halved until its relative width is
+        smaller than the tolerance, keeping the lowest failed trial as
+        the test phase.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        phaseid : str
+            Phase id
+        start_phaseid : str
+            Id of the test start phase.
+        load : np.ndarray
+            (3,) load of the first trial (Fy, Fx, M).
+        max_load : array-like
+            (3,) maximum load to be applied to the model (Fy, Fx, M) in
+            absolute value.
+        load_factor : numeric
+            Multiplicative factor applied to the previous load.
+        load_increment : np.ndarray
+            (3,) load increment applied to the previous load.
+        search : str
+            'increment' or 'bisection'.
+        tolerance : float
+            Bracket width relative to the failure load at which the
+            bisection search stops.
+        warm_start : bool
+            Start each trial from the last converged trial.
+
+        Returns
+        -------
+        np.ndarray
+            (3,) load of the test phase kept in the model.
+        str
+            Id of the phase previous to the test phase.
+        list
+            (stage id, previous phase id, load) of the converged stages
+            kept in the model.
+        """
+        chain = []
+        prevphaseid = start_phaseid
+        lower = np.zeros_like(load, dtype=float)
+        status = self._calculate_failure_trial(testid, phaseid, prevphaseid, load)
+        while status == 'OK' and not any(np.greater_equal(np.abs(load), max_load)):
+            lower = load
+            prevphaseid = self._keep_failure_trial(testid, phaseid, prevphaseid, load, chain, warm_start)
+            load = load_factor * load + load_increment
+            status = self._calculate_failure_trial(testid, phaseid, prevphaseid, load)
+        if search == 'increment' or status == 'OK':
+            return load, prevphaseid, chain
+
+        upper = load
+        failed_phaseid = '{}_failed'.format(testid)
+        while np.linalg.norm(upper - lower) > tolerance * np.linalg.norm(upper):
+            if status == 'OK':
+                prevphaseid = self._keep_failure_trial(testid, phaseid, prevphaseid, load, chain, warm_start)
+            else:
+                if failed_phaseid in self._iphases:
+                    self._delete_phase(failed_phaseid)
+                self._rename_phase(phaseid, failed_phaseid)
+                self._test_log[testid]['phase'].remove(phaseid)
+                failed_previous = prevphaseid
+                failed_chain = len(chain)
+            load = (lower + upper) / 2
+            status = self._calculate_failure_trial(testid, phaseid, prevphaseid, load)
+            if status == 'OK':
+                lower = load
+            else:
+                upper = load
+
+        if status == 'OK':
+            self._delete_phase(phaseid)
+            for stageid, _, _ in reversed(chain[failed_chain:]):
+                self._delete_phase(stageid)
+                self._test_log[testid]['phase'].remove(stageid)
+            del chain[failed_chain:]
+            self._rename_phase(failed_phaseid, phaseid)
+            self._test_log[testid]['phase'][-1] = phaseid
+            self._g_i.Model.CurrentPhase = self._iphases[phaseid]
+            prevphaseid = failed_previous
+        elif failed_phaseid in self._iphases:
+            self._delete_phase(failed_phaseid)
+        self._test_log[testid]['bracket'] = [copy.deepcopy(lower), copy.deepcopy(upper)]
+        return upper, prevphaseid, chain
+
+    @abstractmethod
+    def _set_dynamic_load(self, time, load):
+        """Sets dynamic load."""
+        return NotImplementedError
+    
+    @abstractmethod
+    def _calculate_dynamic_load_phase(self, phaseid, time, load):
+        """Calcualtes a dynamic load phase."""
+        return NotImplementedError
+    
+    @abstractmethod
+    def _set_dynamic_load_result(self, testid, time, load):
+        """Adds dynamic load values to results dataframe."""
+        return NotImplementedError
+
+    @abstractmethod
+    def _capacity_load(self, load):
+        """Converts a load on the whole foundation to the load applied
+        to the model."""
+        return NotImplementedError
+
+    @abstractmethod
+    def _set_load(self, load):
+        """Sets load value in the current phase.
+
+        Parameters
+        ----------
+        load : float, array-like
+            (3,) Fy, Fx and M [kN]. If float, the value is assuemd to be
+            Fy and Fx and M are set to 0.
+        """
+        return NotImplementedError
+    
+    @abstractmethod
+    def _set_surface_load(self, qsurf):
+        """Activates and sets a value to the surface load in the
+        curernt phase. 
+
+        Parameters
+        ----------
+        qsurf : numeric
+            Surface load.
+        """
+        return NotImplementedError
+
+    def _update_ratchetting_material(self, testid, ratchetting, phaseid, prevphaseid):
+        """Sets the ratchetting material under the base if ratchetting
+        occured in the previous phase.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        ratchetting : bool
+            Flag indicating that ratchetting has alredy occured in any
+            previous phase.
+        phaseid : str
+            Phase id
+        prevphaseid : str
+            Id of the previous phase.
+        """
+        if not ratchetting:
+            return
+        for phase in self._results.phases(testid):
+            if phase in [phaseid, prevphaseid]:
+                continue
+            if np.any(self._results.get('ratchetting', self._results.rows(testid, phase))):
+                return
+        assignments = []
+        for _, poly_idxs in self._ratchetting.items():
+            for poly_idx in poly_idxs:
+                assignments.append((poly_idx + 1, 'ratchetting'))
+        self._set_soil_materials(self._iphases[phaseid].Number.value, assignments)
+
+    def _check_phase_status(self, status, testid, phaseid, delete_phases):
+        """Checks calculation status.
+
+        Parameters
+        ----------
+        status : str
+            Calculation status, 'OK' or error message.
+        testid : str
+            Test id.
+        phaseid : str
+            Phase id
+        delete_phases : bool, optional
+            Deletes test phases from model if there is a calculation
+            error, by default True.
+
+        Raises
+        ------
+        RuntimeError
+            Calculation failed.
+        """
+        if status == 'OK':
+            self._g_i.view(self._g_i.Model.CurrentPhase)
+            self._ophases[phaseid] = self._g_o.phases[-1]
+            return
+        self.delete_test(testid, delete_phases=delete_phases)
+        raise RuntimeError(status + ' <{}>'.format(phaseid))
+    
+    def _check_ratchetting(self, testid, phaseid, ratchetting):
+        """Checks if ratchetting occurred in a calculation phase.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        phaseid : str
+            Phase id
+        ratchetting : bool
+            Flag indicating that ratchetting has alredy occured in any
+            previous phase.
+
+        Returns
+        -------
+        Bool
+            True if ratchetting occured in the phase.
+        """
+        if ratchetting or self._ratchetting is None:
+            return ratchetting
+        uy = [self._results.get('uy', self._results.rows(testid, phaseid, loc))
+              for loc in self._results.locations(testid, phaseid) if loc != 'top']
+        uy = np.concatenate(uy) if len(uy) > 0 else np.array([])
+        uy = uy[uy<0]
+        if len(uy) > 0 and -uy.min() >= self._ratchetting_threshold:
+            ratchetting = True
+            self._results.set('ratchetting', self._results.rows(testid, phaseid), True)
+        return ratchetting
+
+    def _set_phase_results(self, testid, phaseid, prevphaseid, load):
+        """Adds phase results to the results dataframe.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        phaseid : str
+            Phase id
+        prevphaseid : str
+            Id of the previous phase.
+        load : np.ndarray
+            (3,) load applied at the end of the phase (Fy, Fx, M).
+        """
+        phase_input = self._phase_input(phaseid, prevphaseid)
+        self._extract_phase_results(testid, phaseid, prevphaseid, load, phase_input)
+
+    @abstractmethod
+    def _phase_input(self, phaseid, prevphaseid):
+        """Reads from Plaxis Input the phase data needed to add the
+        phase results to the results dataframe."""
+        return NotImplementedError
+
+    @abstractmethod
+    def _extract_phase_results(self, testid, phaseid, prevphaseid, load, phase_input):
+        """Extracts the phase results from Plaxis Output and adds them
+        to the results dataframe."""
+        return NotImplementedError
+
+    def _run_logged_test(self, test):
+        """Calculates a test from its test log entry.
+
+        Parameters
+        ----------
+        test : dict
+            Test log entry.
+        """
+        if test['type'] == 'load':
+            self.load_test(test['id'], test['load'], start_from=test['start phaseid'], qsurf=test['qsurf'],
+                           storage=test.get('storage'))
+        elif test['type'] == 'failure':
+            self.failure_test(test['id'], test['load'],
+                              max_load=test['max_load'],
+                              load_factor=test['load_factor'], load_increment=test['load_increment'],
+                              start_from=test['start phaseid'], qsurf=test['qsurf'],
+                              search=test.get('search', 'increment'),
+                              tolerance=test.get('tolerance', 0.05),
+                              warm_start=test.get('warm_start', False),
+                              first_guess=test.get('first_guess', None),
+                              storage=test.get('storage'))
+        elif test['type'] == 'safety incremental':
+            self.safety_test(test['id'], test['start phaseid'], test='incremental', Msf=test['Msf'], qsurf=test['qsurf'], storage=test.get('storage'))
+        elif test['type'] == 'safety target':
+            self.safety_test(test['id'], test['start phaseid'], test='target', SumMsf=test['SumMsf'], qsurf=test['qsurf'], storage=test.get('storage'))
+        elif test['type'] == 'dynamic':
+            self.dynamic_test(test['id'], test['time'], test['load'], start_from=test['start phaseid'], qsurf=test['qsurf'], nsubstep=test['nsubstep'], chunk=test.get('chunk'), compression=test.get('compression'), storage=test.get('storage'))
+        elif test['type'] == 'shake':
+            self.shake_test(test['id'], test['time'], test['load'], start_from=test['start phaseid'], qsurf=test['qsurf'], nsubstep=test['nsubstep'], chunk=test.get('chunk'), compression=test.get('compression'), storage=test.get('storage'))
+
+    def _definition_key(self):
+        """Hash of the model definition: model class, geometry,
+        materials, mesh and boundary conditions.
+
+        Returns
+        -------
+        str
+            Model definition hash.
+        """
+        definition = {key: value for key, value in vars(self).items()
+                      if key not in self._cache_exclude}
+        return definition_key(type(self).__name__, definition)
+
+    def _test_of_phase(self, phaseid):
+        """Test that calculated a phase.
+
+        Parameters
+        ----------
+        phaseid : str
+            Phase id.
+
+        Returns
+        -------
+        str, None
+            Test id, None for the initial phases.
+        """
+        for testid, test in self._test_log.items():
+            if phaseid in test['phase']:
+                return testid
+        return None
+
+    def _test_key(self, testid):
+        """Hash of a test definition. It includes the model definition
+        and the definition of the test that calculated the start phase.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+
+        Returns
+        -------
+        str
+            Test definition hash.
+        """
+        test = {key: value for key, value in self._test_log[testid].items()
+                if key not in self._cache_volatile}
+        start_phaseid = test.pop('start phaseid')
+        start_testid = self._test_of_phase(start_phaseid)
+        start_key = None
+        if start_testid is not None:
+            if start_testid not in self._test_keys:
+                self._test_keys[start_testid] = self._test_key(start_testid)
+            start_key = self._test_keys[start_testid]
+        return definition_key(self._model_key, test, start_phaseid, start_key)
+
+    def _restore_test(self, testid):
+        """Restores a test from the cache. If the test is not cached,
+        its start phase is recalculated in Plaxis when it belongs to a
+        test restored from the cache.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+
+        Returns
+        -------
+        bool
+            True if the test was restored from the cache.
+        """
+        if getattr(self, '_cache', None) is not None:
+            if self._model_key is None:
+                self._model_key = self._definition_key()
+            self._test_keys[testid] = self._test_key(testid)
+            entry = self._cache.get(self._test_keys[testid])
+            if entry is not None:
+                self._test_log[testid] = copy.deepcopy(entry['test'])
+                self._test_log[testid]['cached'] = True
+                self._results.append(entry['columns'], entry['nrow'])
+                self._checkpoint_test(testid)
+                return True
+        self._materialize_phase(self._test_log[testid]['start phaseid'])
+        return False
+
+    def _store_test(self, testid):
+        """Adds a calculated test to the cache and to the checkpoint.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        """
+        self._checkpoint_test(testid)
+        if getattr(self, '_cache', None) is None:
+            return
+        rows = self._results.rows(testid)
+        columns = {column: self._results.get(column, rows) for column in ModelResults._COLUMNS}
+        entry = {'test': copy.deepcopy(self._test_log[testid]),
+                 'columns': columns,
+                 'nrow': len(columns['step'])}
+        self._cache.put(self._test_keys[testid], entry)
+
+    def _materialize_phase(self, phaseid):
+        """Recalculates in Plaxis the test restored from the cache that
+        calculated a phase, keeping the order of the test log.
+
+        Parameters
+        ----------
+        phaseid : str
+            Phase id.
+        """
+        testid = self._test_of_phase(phaseid)
+        if testid is None or phaseid in self._iphases:
+            return
+        order = list(self._test_log.keys())
+        test = self._test_log.pop(testid)
+        self._results.drop_test(testid)
+        cache = self._cache
+        self._cache = None
+        try:
+            self._run_logged_test(test)
+        finally:
+            self._cache = cache
+        self._test_log = {key: self._test_log[key] for key in order if key in self._test_log}
+
+    def _plaxis_names(self, value):
+        """Replaces the Plaxis objects in a value by their names.
+
+        Parameters
+        ----------
+        value : object
+            Plaxis object, or list, tuple or dict of Plaxis objects.
+
+        Returns
+        -------
+        object
+            Value with {'plaxis': name} in place of the Plaxis objects.
+        """
+        if value is None or isinstance(value, (str, numbers.Number)):
+            return value
+        if isinstance(value, (list, tuple)):
+            return type(value)([self._plaxis_names(item) for item in value])
+        if isinstance(value, dict):
+            return {key: self._plaxis_names(item) for key, item in value.items()}
+        return {'plaxis': value.Name.value}
+
+    def _plaxis_objects(self, value):
+        """Replaces the names returned by `_plaxis_names` by the Plaxis
+        objects of the open project.
+
+        Parameters
+        ----------
+        value : object
+            Value with {'plaxis': name} in place of the Plaxis objects.
+
+        Returns
+        -------
+        object
+            Value with Plaxis objects.
+        """
+        if isinstance(value, (list, tuple)):
+            return type(value)([self._plaxis_objects(item) for item in value])
+        if isinstance(value, dict):
+            if list(value.keys()) == ['plaxis']:
+                return getattr(self._g_i, value['plaxis'])
+            return {key: self._plaxis_objects(item) for key, item in value.items()}
+        return value
+
+    def _save_project(self):
+        """Adds the built project to the project cache, with the names
+        of the Plaxis objects held by the model and the results of the
+        initial phases.
+        """
+        if getattr(self, '_project_cache', None) is None:
+            return
+        rows = self._results.rows(None)
+        columns = {column: self._results.get(column, rows) for column in ModelResults._COLUMNS}
+        entry = {'objects': {attr: self._plaxis_names(getattr(self, attr))
+                             for attr in self._plaxis_attributes if hasattr(self, attr)},
+                 'attributes': {attr: getattr(self, attr) for attr in self._build_attributes},
+                 'iphases': {phaseid: phase.Name.value for phaseid, phase in self._iphases.items()},
+                 'ophase': list(self._ophases.keys())[-1],
+                 'columns': columns,
+                 'nrow': len(columns['step'])}
+        with tempfile.TemporaryDirectory(prefix='padtest_') as folder:
+            filename = os.path.join(folder, self._model_key + '.p2dx')
+            self._g_i.save(filename)
+            self._project_cache.put_project(self._model_key, filename, entry)
+
+    def _open_project(self):
+        """Opens the project of the model from the project cache and
+        binds the model to it: Plaxis objects, Input and Output initial
+        phases and output points. The project is opened from a working
+        copy kept in `_project_folder` until the model is rebuilt or
+        saved.
+
+        Returns
+        -------
+        bool
+            True if the project was in the cache.
+        """
+        if getattr(self, '_project_cache', None) is None:
+            return False
+        folder = tempfile.mkdtemp(prefix='padtest_')
+        filename, entry = self._project_cache.get_project(self._model_key, folder)
+        if filename is None:
+            shutil.rmtree(folder, ignore_errors=True)
+            return False
+        self._project_folder = folder
+        self._s_i.open(filename)
+        for attr, value in entry['attributes'].items():
+            setattr(self, attr, value)
+        self._bind_project(entry['objects'], entry['iphases'], entry['ophase'], [entry['ophase']])
+        self._results.append(entry['columns'], entry['nrow'])
+        return True
+
+    def _remove_project_folder(self):
+        """Removes the working copy of the project opened from the
+        project cache.
+        """
+        if self._project_folder is None:
+            return
+        shutil.rmtree(self._project_folder, ignore_errors=True)
+        self._project_folder = None
+
+    def _bind_project(self, objects, iphases, view_phaseid, ophases):
+        """Binds the model to the project open in Plaxis: Plaxis
+        objects, Input and Output phases and output points.
+
+        Parameters
+        ----------
+        objects : dict
+            Names of the Plaxis objects held by the model, see
+            `_plaxis_names`.
+        iphases : dict
+            Plaxis name of each Input phase by phase id. Phases missing
+            in the project are skipped.
+        view_phaseid : str
+            Id of the phase shown in Output to set the output points.
+        ophases : list
+            Ids of the phases bound to their Output phase.
+        """
+        for attr, value in objects.items():
+            setattr(self, attr, self._plaxis_objects(value))
+        self._interfaces.remove_plaxis_objects()
+        project_phases = {phase.Name.value: phase for phase in self._g_i.phases}
+        self._iphases = {phaseid: project_phases[name] for phaseid, name in iphases.items()
+                         if name in project_phases}
+        self._ophases = {}
+        self._output_point = {}
+        self._set_output_precalc()
+        self._g_i.view(self._iphases[view_phaseid])
+        self._set_output_postcalc()
+        output_phases = {ophase.Identification.value: ophase for ophase in self._g_o.phases}
+        for phaseid in ophases:
+            identification = self._iphases[phaseid].Identification.value
+            if identification in output_phases:
+                self._ophases[phaseid] = output_phases[identification]
+
+    def _checkpoint_binding(self):
+        """Names of the Plaxis objects and phases held by the model,
+        used to bind the model to the checkpoint project.
+
+        Returns
+        -------
+        dict
+            Plaxis objects, Input phase names and phase registry.
+        """
+        return {'objects': {attr: self._plaxis_names(getattr(self, attr))
+                            for attr in self._plaxis_attributes if hasattr(self, attr)},
+                'iphases': {phaseid: phase.Name.value for phaseid, phase in self._iphases.items()},
+                'phase_log': copy.deepcopy(self._phase_log)}
+
+    def _checkpoint_columns(self, rows):
+        """Results columns of a set of rows.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            Row indexes.
+
+        Returns
+        -------
+        dict
+            Values of each column.
         """
-        return NotImplementedError
-    
-    @abstractmethod
-    def _set_surface_load(self, qsurf):
-        """Activates and sets a value to the surface load in the
-        curernt phase. 
+        return {column: self._results.get(column, rows) for column in ModelResults._COLUMNS}
+
+    def _write_checkpoint(self, record):
+        """Saves the Plaxis project in the checkpoint folder and appends
+        a record to the checkpoint log.
 
         Parameters
         ----------
-        qsurf : numeric
-            Surface load.
+        record : dict
+            Checkpoint record.
         """
-        return NotImplementedError
+        if self._checkpoint is None:
+            return
+        self._g_i.save(os.path.join(self._checkpoint, self._checkpoint_project))
+        record['binding'] = self._checkpoint_binding()
+        with open(os.path.join(self._checkpoint, self._checkpoint_log), 'ab') as handle:
+            pickle.dump(record, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            handle.flush()
+            os.fsync(handle.fileno())
 
-    def _update_ratchetting_material(self, testid, ratchetting, phaseid, prevphaseid):
-        """Sets the ratchetting material under the base if ratchetting
-        occured in the previous phase.
+    def _checkpoint_phase(self, testid, phaseid):
+        """Adds a calculated phase to the checkpoint: test log entry and
+        phase results.
 
         Parameters
         ----------
         testid : str
             Test id.
-        ratchetting : bool
-            Flag indicating that ratchetting has alredy occured in any
-            previous phase.
         phaseid : str
-            Phase id
-        prevphaseid : str
-            Id of the previous phase.
+            Phase id.
         """
-        if not ratchetting:
-            return
-        idx = (self._results['test'] == testid) \
-              & (self._results['phase'] != phaseid) \
-              & (self._results['phase'] != prevphaseid)
-        if any(self._results.loc[idx, 'ratchetting'].to_list()):
+        if self._checkpoint is None:
             return
-        for _, poly_idxs in self._ratchetting.items():
-            for poly_idx in poly_idxs:
-                self._set_soil_material(self._g_i, poly_idx + 1, self._iphases[phaseid].Number.value, 'ratchetting')
+        columns = self._checkpoint_columns(self._results.rows(testid, phaseid))
+        self._write_checkpoint({'record': 'phase', 'test': testid,
+                                'log': copy.deepcopy(self._test_log[testid]),
+                                'columns': columns,
+                                'nrow': len(columns['step'])})
 
-    def _check_phase_status(self, status, testid, phaseid, delete_phases):
-        """Checks calculation status.
+    def _checkpoint_test(self, testid):
+        """Adds a completed test to the checkpoint: test log entry and
+        test results.
 
         Parameters
         ----------
-        status : str
-            Calculation status, 'OK' or error message.
         testid : str
             Test id.
-        phaseid : str
-            Phase id
-        delete_phases : bool, optional
-            Deletes test phases from model if there is a calculation
-            error, by default True.
-
-        Raises
-        ------
-        RuntimeError
-            Calculation failed.
         """
-        if status == 'OK':
-            self._g_i.view(self._g_i.Model.CurrentPhase)
-            self._ophases[phaseid] = self._g_o.phases[-1]
+        if self._checkpoint is None:
             return
-        self.delete_test(testid, delete_phases=delete_phases)
-        raise RuntimeError(status + ' <{}>'.format(phaseid))
-    
-    def _check_ratchetting(self, testid, phaseid, ratchetting):
-        """Checks if ratchetting occurred in a calculation phase.
+        columns = self._checkpoint_columns(self._results.rows(testid))
+        self._write_checkpoint({'record': 'test', 'test': testid,
+                                'log': copy.deepcopy(self._test_log[testid]),
+                                'columns': columns,
+                                'nrow': len(columns['step'])})
+
+    @staticmethod
+    def _read_checkpoint(path):
+        """Records of a checkpoint log. A record cut by a crash while it
+        was written ends the log.
 
         Parameters
         ----------
-        testid : str
-            Test id.
-        phaseid : str
-            Phase id
-        ratchetting : bool
-            Flag indicating that ratchetting has alredy occured in any
-            previous phase.
+        path : str
+            Checkpoint folder.
 
         Returns
         -------
-        Bool
-            True if ratchetting occured in the phase.
+        list
+            Checkpoint records.
         """
-        if ratchetting or self._ratchetting is None:
-            return ratchetting
-        idx = (self._results['test'] == testid) \
-              & (self._results['phase'] == phaseid) \
-              & (self._results['location'] != 'top') \
-              & (self._results['uy']<0)
-        if -self._results.loc[idx, 'uy'].min() >= self._ratchetting_threshold:
-            ratchetting = True
-            idx = (self._results['test'] == testid) \
-                  & (self._results['phase'] == phaseid) 
-            self._results.loc[idx, 'ratchetting'] = True
-        return ratchetting
+        records = []
+        filename = os.path.join(path, Model._checkpoint_log)
+        if not os.path.isfile(filename):
+            return records
+        with open(filename, 'rb') as handle:
+            while True:
+                try:
+                    records.append(pickle.load(handle))
+                except (EOFError, pickle.UnpicklingError):
+                    break
+        return records
+
+    def _resume_test(self, testid):
+        """Completes a test interrupted by a crash. Load tests continue
+        from their last calculated stage and other tests are
+        recalculated.
 
-    @abstractmethod
-    def _set_phase_results(self, testid, phaseid, prevphaseid, load):
-        """Adds phase results to the results dataframe.
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        """
+        test = self._test_log[testid]
+        if test['type'] != 'load':
+            self.delete_test(testid)
+            self._run_logged_test(test)
+            return
+        nstage = len(self._load_stages(testid))
+        test_phases = [testid + '_stage_{:.0f}'.format(idx) for idx in range(nstage, len(test['load']))]
+        previous_phase = [test['phase'][-1]] + test_phases[:-1]
+        rows = self._results.rows(testid)
+        ratchetting = bool(np.any(self._results.get('ratchetting', rows)))
+        self._calculate_load_stages(testid, test['load'][nstage:], test_phases, previous_phase,
+                                    ratchetting, True)
+        self._store_test(testid)
+
+    def _test_locations(self, testid):
+        """Output locations with results in a test.
 
         Parameters
         ----------
         testid : str
             Test id.
-        phaseid : str
-            Phase id
-        prevphaseid : str
-            Id of the previous phase.
-        load : np.ndarray
-            (3,) load applied at the end of the phase (Fy, Fx, M).
+
+        Returns
+        -------
+        list
+            Output locations.
         """
-        return NotImplementedError
+        location = []
+        for phaseid in self._results.phases(testid):
+            for loc in self._results.locations(testid, phaseid):
+                if loc not in location:
+                    location.append(loc)
+        return location
 
     def query_yes_no(self, question, default="yes"):
         """Ask yes/no question, keeps asking until acceptable answer.
@@ -1152,6 +2553,72 @@ class Model(ABC):
                 return valid[choice]
             else:
                 sys.stdout.write("Please respond with 'yes' or 'no' " "(or 'y' or 'n').\n")
+
+    @classmethod
+    def _get_async_executor(cls):
+        """Thread pool shared by the asynchronous methods of all the
+        models, with `_async_workers` threads.
+
+        Returns
+        -------
+        ThreadPoolExecutor
+            Thread pool.
+        """
+        if Model._async_executor is None:
+            Model._async_executor = ThreadPoolExecutor(max_workers=Model._async_workers,
+                                                       thread_name_prefix='padtest')
+        return Model._async_executor
+
+    async def _run_async(self, method, *args, testid=None, **kwargs):
+        """Runs a blocking method in the shared thread pool. If the
+        awaiting task is cancelled, the test is stopped before its next
+        phase is added, the method is awaited until it stops and the
+        test is deleted from the model.
+
+        Parameters
+        ----------
+        method : callable
+            Blocking method.
+        *args
+            Method arguments.
+        testid : str, None, optional
+            Id of the test calculated by the method. By default None.
+        **kwargs
+            Method keyword arguments.
+
+        Returns
+        -------
+        object
+            Value returned by the method.
+
+        Raises
+        ------
+        RuntimeError
+            Model already running an asynchronous method.
+        """
+        if self._async_busy:
+            raise RuntimeError('Model is already running an asynchronous method.')
+        loop = asyncio.get_running_loop()
+        executor = self._get_async_executor()
+        existing = testid in self._test_log
+        self._async_busy = True
+        self._cancel_requested = False
+        future = loop.run_in_executor(executor, functools.partial(method, *args, **kwargs))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            self._cancel_requested = True
+            try:
+                await future
+            except Exception:
+                pass
+            self._cancel_requested = False
+            if testid is not None and not existing and testid in self._test_log:
+                await loop.run_in_executor(executor, self.delete_test, testid)
+            raise
+        finally:
+            self._cancel_requested = False
+            self._async_busy = False
     #===================================================================
     # PUBLIC METHODS
     #===================================================================
@@ -1164,13 +2631,35 @@ class Model(ABC):
         pd.DataFrame
             Calculation results.
         """
-        return self._results
+        return self._results.frame()
+
+    @property
+    def call_report(self):
+        """Remote calls to Plaxis by test, phase, padtest method and
+        call, with their count and total time [s]. Only available if
+        the model was created with `instrument=True`.
+
+        Returns
+        -------
+        pd.DataFrame, None
+            Call report, None if the calls are not instrumented.
+        """
+        if getattr(self, '_recorder', None) is None:
+            return None
+        return self._recorder.report()
 
     def build(self):
-        """Builds the model in Plaxis.
+        """Builds the model in Plaxis. With a project cache, a model
+        already built with the same definition is opened from the cache
+        instead.
         """
+        self._remove_project_folder()
+        self._model_key = self._definition_key()
+        if self._open_project():
+            return
         self._set_model()
         self._build_geometry()
+        self._build_soil_registry()
         self._build_materials()
         self._build_load()
         self._build_surface_load()
@@ -1178,6 +2667,7 @@ class Model(ABC):
         self._build_initial_phases()
         self._set_output_precalc()
         self._calculate_initial_phases()
+        self._save_project()
     
     def regen(self, s_i, g_i, g_o, test=False):
         """Regenerates the model in Plaxis. Optinoally it recalculates
@@ -1194,38 +2684,20 @@ class Model(ABC):
         test : bool, optional
             Reclaculate all load tests in Plaxis. By default False.
         """
-        self._s_i = s_i
-        self._g_i = g_i
-        self._g_o = g_o
-        idx = (self._results['phase']=='construction') | (self._results['phase']=='excavation')
-        self._results = self._results[~idx]
-        self._results.reset_index(drop=True, inplace=True)
+        self._set_servers(s_i, g_i, g_o)
+        self._results.drop_test(None)
         self.build()
         if not test:
             return
-        idx = (self._results['phase']=='construction') | (self._results['phase']=='excavation')
-        self._results = self._results[idx]
-        self._results.reset_index(drop=True, inplace=True)
+        for testid in self._results.tests():
+            if testid is not None:
+                self._results.drop_test(testid)
         test_log = copy.deepcopy(self._test_log)
         self._test_log = {}
         for testid, test in test_log.items():
-            if test['type'] == 'load':
-                self.load_test(test['id'], test['load'], start_from=test['start phaseid'], qsurf=test['qsurf'])
-            elif test['type'] == 'failure':
-                self.failure_test(test['id'], test['load'],
-                                  max_load=test['max_load'], start_load=test['start_load'],
-                                  load_factor=test['load_factor'], load_increment=test['load_increment'],
-                                  start_from=test['start phaseid'], qsurf=test['qsurf'])
-            elif test['type'] == 'safety incremental':
-                self.safety_test(test['id'], test['start phaseid'], test='incremental', Msf=test['Msf'], qsurf=test['qsurf'])
-            elif test['type'] == 'safety target':
-                self.safety_test(test['id'], test['start phaseid'], test='target', SumMsf=test['SumMsf'], qsurf=test['qsurf'])
-            elif test['type'] == 'dynamic':
-                self.dynamic_test(test['id'], test['time'], test['load'], start_from=test['start phaseid'], qsurf=test['qsurf'], nsubstep=test['nsubstep'])
-            elif test['type'] == 'shake':
-                self.shake_test(test['id'], test['time'], test['load'], start_from=test['start phaseid'], qsurf=test['qsurf'], nsubstep=test['nsubstep'])
-
-    def save(self, filename):
+            self._run_logged_test(test)
+
+    def save(self, filename, archive=False):
         """Saves model to file. Plaxis objects cannot be stored, only
         input properties and results. When loaded, the model can
         be regenerated with <regen> method.
@@ -1233,7 +2705,13 @@ class Model(ABC):
         Parameters
         ----------
         filename : str
-            File name.
+            File name, or folder name of the archive.
+        archive : bool, optional
+            Saves the model in a versioned archive folder instead of a
+            pickle file: a JSON manifest with the input properties and
+            the test log, and a binary file for each results column,
+            which is memory-mapped when the model is loaded. By default
+            False.
         """
         question = ("WARNIGN: Saving the load test to memory whipes out the Plaxis "
                     "objects. Test results and input parameters will still "
@@ -1247,10 +2725,14 @@ class Model(ABC):
         self._s_i = None
         self._g_i = None
         self._g_o = None
+        self._extractor = None
+        self._remove_project_folder()
+        self._soil_plx = {} # Plaxis soil objects of the polygons
         self._soil_material_plx = {} # Plaxis objects of the materials
         self._plate_material_plx = {} # Plaxis objects of the materials
         self._iphases = {}
         self._ophases = {}
+        self._multipliers = {}
         self._structure_polygons = None
         self._structure_soil = None
         self._phase_polygons = None
@@ -1262,31 +2744,182 @@ class Model(ABC):
         self._mesh = None
         self._surface_load = None
         self._output_point = {}
+        if archive:
+            write_archive(self, filename)
+            return
         with open(filename, 'wb') as handle:
             pickle.dump(self, handle, protocol=pickle.HIGHEST_PROTOCOL)
 
     @classmethod
-    def load(cls, filename):
-        """Loads saved test.
+    def load(cls, filename, tests=None):
+        """Loads saved test, from a pickle file or from an archive
+        folder.
 
         Parameters
         ----------
         filename : str
-            File name.
+            File name, or folder name of the archive.
+        tests : list, None, optional
+            Ids of the tests to load, along with the results of the
+            initial phases. From an archive only the rows of these tests
+            are read from disk, while pickle files are read in full and
+            the rest of the tests are removed. Tests that start from a
+            test not loaded cannot be recalculated with <regen>. If None
+            all the tests are loaded. By default None.
 
         Raises
         ------
         RuntimeError
             File does not contain load test.
+        RuntimeError
+            Requested test not in file.
+        """
+        if is_archive(filename):
+            model = read_archive(filename)
+        else:
+            with open(filename, 'rb') as handle:
+                model = pickle.load(handle)
+        if not isinstance(model, Model):
+            raise RuntimeError('File <{}> does not contain a load test.'.format(filename))
+        if isinstance(model._results, pd.DataFrame):
+            model._results = ModelResults.from_frame(model._results)
+        if tests is not None:
+            model._select_tests(filename, tests)
+        return model
+
+    def _select_tests(self, filename, tests):
+        """Keeps a set of tests of a loaded model and removes the rest.
+
+        Parameters
+        ----------
+        filename : str
+            File name the model was loaded from.
+        tests : list
+            Test ids.
+
+        Raises
+        ------
+        RuntimeError
+            Requested test not in file.
+        """
+        for testid in tests:
+            if testid not in self._test_log:
+                raise RuntimeError('Test <{}> not available in file <{}>.'.format(testid, filename))
+        self._test_log = {testid: test for testid, test in self._test_log.items() if testid in tests}
+        self._test_keys = {testid: key for testid, key in getattr(self, '_test_keys', {}).items()
+                           if testid in tests}
+        self._phase_log = {phaseid: phase for phaseid, phase in getattr(self, '_phase_log', {}).items()
+                           if phase['test'] is None or phase['test'] in tests}
+        self._results = self._results.select(tests)
+
+    def checkpoint(self, path):
+        """Checkpoints the model after every calculated phase, so that
+        it can be resumed after a crash with `Model.resume`. The model
+        is stored in the checkpoint folder and the Plaxis project is
+        saved in it. Load stages, surface load phases and completed and
+        deleted tests are appended to a log with their test log entry
+        and results, and the project is saved along with each record.
+
+        Parameters
+        ----------
+        path : str
+            Checkpoint folder. It must be empty or not exist.
+
+        Raises
+        ------
+        RuntimeError
+            Folder not empty.
+        """
+        if os.path.isdir(path) and len(os.listdir(path)) > 0:
+            raise RuntimeError('Checkpoint folder <{}> is not empty.'.format(path))
+        os.makedirs(path, exist_ok=True)
+        self._g_i.save(os.path.join(path, self._checkpoint_project))
+        model = copy.copy(self)
+        for attr in ['_s_i', '_g_i', '_g_o', '_extractor'] + self._plaxis_attributes:
+            setattr(model, attr, None)
+        # the snapshot gets its own interfaces, without copying their Plaxis objects
+        plaxis_objects = [getattr(interface, attr, None) for interface in self._interfaces.values()
+                          for attr in ['_plx_object', '_material_plx']]
+        model._interfaces = copy.deepcopy(self._interfaces, {id(obj): None for obj in plaxis_objects})
+        model._interfaces.remove_plaxis_objects()
+        model._iphases = {}
+        model._ophases = {}
+        model._output_point = {}
+        snapshot = {'model': model, 'binding': self._checkpoint_binding()}
+        with open(os.path.join(path, self._checkpoint_model), 'wb') as handle:
+            pickle.dump(snapshot, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        self._checkpoint = path
+
+    @classmethod
+    def resume(cls, path, s_i, g_i, g_o):
+        """Restores a checkpointed model after a crash. The checkpoint
+        project is opened in Plaxis, tests and results are restored
+        from the checkpoint log and the test that was being calculated
+        is completed: load tests continue from their last calculated
+        stage and other tests are recalculated. Checkpointing continues
+        in the same folder. Tests that were not started are not in the
+        model and have to be requested again.
+
+        Parameters
+        ----------
+        path : str
+            Checkpoint folder.
+        s_i : Server
+            Plaxis Input Application remote sripting server.
+        g_i : PlxProxyGlobalObject
+            Global object of the current open Plaxis model in Input.
+        g_o : PlxProxyGlobalObject
+            Global object of the current open Plaxis model in Output.
+
+        Returns
+        -------
+        Model
+            Restored model.
+
+        Raises
+        ------
+        RuntimeError
+            Folder does not contain a checkpoint.
         """
+        filename = os.path.join(path, cls._checkpoint_model)
+        if not os.path.isfile(filename):
+            raise RuntimeError('Folder <{}> does not contain a checkpoint.'.format(path))
         with open(filename, 'rb') as handle:
-            model = pickle.load(handle)
-            if not isinstance(model, Model):
-                raise RuntimeError('File <{}> does not contain a load test.'.format(filename))
-            return model
+            snapshot = pickle.load(handle)
+        model = snapshot['model']
+        binding = snapshot['binding']
+        incomplete = []
+        for record in cls._read_checkpoint(path):
+            testid = record['test']
+            if testid in incomplete:
+                incomplete.remove(testid)
+            if record['record'] == 'delete':
+                _ = model._test_log.pop(testid, None)
+                model._results.drop_test(testid)
+            else:
+                model._test_log[testid] = record['log']
+                if record['record'] == 'test':
+                    model._results.drop_test(testid)
+                else:
+                    incomplete.append(testid)
+                model._results.append(record['columns'], record['nrow'])
+            binding = record['binding']
+
+        model._set_servers(s_i, g_i, g_o)
+        model._s_i.open(os.path.join(path, cls._checkpoint_project))
+        model._phase_log = binding['phase_log']
+        model._bind_project(binding['objects'], binding['iphases'], 'construction',
+                            list(binding['iphases'].keys()))
+        names = list(binding['iphases'].values())
+        for phase in [phase for phase in model._g_i.phases if phase.Name.value not in names]:
+            model._g_i.delete(phase)
+        model._checkpoint = path
+        for testid in incomplete:
+            model._resume_test(testid)
+        return model
 
     def load_test(self, testid, load, start_from='construction', qsurf=None, 
-                  delete_fail=True):
+                  delete_fail=True, storage=None, pipeline=False):
         """Conducts a load test in the model.
 
         Parameters
@@ -1314,6 +2947,22 @@ class Model(ABC):
         delete_fail : bool, optional
             Deletes test phases from model if there is a calculation
             error, by default True.
+        storage : str, tuple, None, optional
+            Calculation steps stored and extracted in each test phase:
+            'final' keeps only the last step, ('every', n) every n-th
+            step and ('uniform', n) or ('log', n) n uniformly or
+            logarithmically spaced steps. The last step of each phase is
+            always kept. If None all the steps are kept. By default
+            None.
+        pipeline : bool, optional
+            Extracts the results of each stage from Plaxis Output in a
+            worker thread while Plaxis Input calculates the next stage.
+            The worker shares the Output connection of the model.
+            Results are the same as in the sequential calculation. Only
+            used in models without ratchetting material, where the
+            stages do not depend on the results of the previous ones,
+            without checkpoint and when no stage is shared with a
+            previous test of a test plan. By default False.
 
         Raises
         ------
@@ -1334,29 +2983,80 @@ class Model(ABC):
         self._test_log[testid]['load'] = load
         self._test_log[testid]['phase'] = []
         self._test_log[testid]['qsurf'] = qsurf
+        self._test_log[testid]['storage'] = self._check_storage(storage)
         self._test_log[testid]['start phaseid'] = copy.deepcopy(start_phaseid)
         
+        if self._restore_test(testid):
+            return
         start_phaseid = self._calculate_surface_load(testid, qsurf, start_phaseid, delete_fail)
         
         test_phases = [testid + '_stage_{:.0f}'.format(idx) for idx in range(len(load))]
-        previous_phase = [start_phaseid] + test_phases[:-1]
-        ratchetting = False
-        for load_value, phaseid, prevphaseid in zip(load, test_phases, previous_phase):
-            status = self._calculate_load_phase(testid, phaseid, prevphaseid,
-                                                load_value, ratchetting)
-            self._check_phase_status(status, testid, phaseid, delete_fail)
-            self._set_phase_results(testid, phaseid, prevphaseid, load_value)
-            ratchetting = self._check_ratchetting(testid, phaseid, ratchetting)
+        previous_phase = [start_phaseid] + [self._plan_shared.get(phaseid, phaseid) for phaseid in test_phases[:-1]]
+        shared = any([phaseid in self._plan_shared for phaseid in test_phases])
+        if pipeline and self._ratchetting is None and self._checkpoint is None and len(load) > 1 \
+           and not shared:
+            self._calculate_load_stages_pipelined(testid, load, test_phases,
+                                                  previous_phase, delete_fail)
+        else:
+            self._calculate_load_stages(testid, load, test_phases, previous_phase,
+                                        False, delete_fail)
+        self._store_test(testid)
     
+    def bearing_capacity(self, load=[-1, 0, 0], method='vesic'):
+        """Analytical bearing capacity estimate of the foundation with
+        the model soil layers and water table. Strip foundations are
+        assumed in plane strain models and circular foundations in
+        axisymmetric models. See `padtest.bearing_capacity`.
+
+        Parameters
+        ----------
+        load : numeric, array-like, optional
+            (3,) load direction (Fy, Fx, M), with compressive Fy
+            negative. Numeric input is assue as Fy , with Fx and M
+            being zeros. By default [-1, 0, 0].
+        method : str, optional
+            'terzaghi', 'meyerhof' or 'vesic'. By default 'vesic'.
+
+        Returns
+        -------
+        dict
+            Bearing capacity estimate. The 'model load' key holds the
+            (3,) ultimate load (Fy, Fx, M) as applied to the model.
+        """
+        load = self._load_format(load)
+        soil = [self._soil_material['strata_{:.0f}'.format(idx + 1)] for idx in range(self._nstrata)]
+        estimate = bearing_capacity(self._b, soil, d=self._d, dstrata=self._dstrata,
+                                    wt=self._global_wt, load=load,
+                                    model_type=self._model_type, method=method)
+        estimate['model load'] = self._capacity_load(estimate['load'])
+        return estimate
+
     def failure_test(self, testid, load, max_load=[np.inf, np.inf, np.inf],
                      load_factor=2, load_increment=[0, 0, 0], qsurf=None,
-                     start_from='construction', delete_fail=True):
+                     start_from='construction', delete_fail=True,
+                     search='increment', tolerance=0.05, warm_start=False,
+                     first_guess=None, storage=None):
         """Test the foundation until the model does not converge. A
         first trial is done using the start_load value. If lack of
         convergence is not achieved, the load is incremented as: 
 
         load = load_factor * load + load_increment.
 
+        With the 'bisection' search, once the failure load is
+        bracketed between the last converged and the first failed
+        trial, the bracket is halved until its width is smaller than
+        the tolerance. The results of the lowest failed trial are
+        kept. All the trials are recorded in the test log.
+
+        With warm start, converged trials are kept in the model as
+        test stages (<testid>_stage_<n>) and the next trial starts from
+        the last converged stage, so only the load increment is
+        applied. The failed trial is the last test phase.
+
+        With a first guess, `load` only sets the load direction and the
+        first trial is the fraction `first_guess` of the analytical
+        bearing capacity in that direction (see `bearing_capacity`).
+
         Parameters
         ----------
         testid : str
@@ -1388,17 +3088,44 @@ class Model(ABC):
         delete_fail : bool, optional
             Deletes surface load phase from model if there is a
             calculation error, by default True.
+        search : str, optional
+            Failure load search: 'increment' stops at the first trial
+            that does not converge, 'bisection' refines the failure
+            load between the last converged and the first failed
+            trials. By default 'increment'.
+        tolerance : float, optional
+            Bracket width relative to the failure load at which the
+            bisection search stops. By default 0.05.
+        warm_start : bool, optional
+            Start each trial from the last converged trial instead of
+            the test start phase. By default False.
+        first_guess : float, None, optional
+            Fraction of the Vesic bearing capacity estimate used as the
+            first trial load. E.g. 0.5 with the default load factor
+            brackets the estimate with the first two trials. If None
+            `load` is the first trial load. By default None.
+        storage : str, tuple, None, optional
+            Calculation steps stored and extracted in each test phase:
+            'final' keeps only the last step, ('every', n) every n-th
+            step and ('uniform', n) or ('log', n) n uniformly or
+            logarithmically spaced steps. The last step of each phase is
+            always kept. If None all the steps are kept. By default
+            None.
 
         Raises
         ------
         RuntimeError
             Duplicated test id.
+        RuntimeError
+            Unsupported search.
         """
         start_phaseid = self._get_start_phase(start_from)
         load = self._load_format(load)
         load_increment = self._load_format(load_increment)
         if testid in self._test_log.keys():
             raise RuntimeError('Duplicated test id <{}>.'.format(testid))
+        if search not in ['increment', 'bisection']:
+            raise RuntimeError("Supported failure searches are 'increment' and 'bisection'.")
         self._test_log[testid] = {}
         self._test_log[testid]['id'] = testid
         self._test_log[testid]['type'] = 'failure'
@@ -1409,27 +3136,37 @@ class Model(ABC):
         self._test_log[testid]['start phaseid'] = copy.deepcopy(start_phaseid)
         self._test_log[testid]['max_load'] = max_load
         self._test_log[testid]['qsurf'] = qsurf
+        self._test_log[testid]['storage'] = self._check_storage(storage)
+        self._test_log[testid]['search'] = search
+        self._test_log[testid]['tolerance'] = tolerance
+        self._test_log[testid]['warm_start'] = warm_start
+        self._test_log[testid]['first_guess'] = first_guess
+        self._test_log[testid]['trials'] = []
         
 
+        if first_guess is not None:
+            estimate = self.bearing_capacity(load)
+            self._test_log[testid]['estimate'] = estimate
+            load = first_guess * estimate['model load']
+
+        if self._restore_test(testid):
+            return
         start_phaseid = self._calculate_surface_load(testid, qsurf, start_phaseid, delete_fail)
 
         phaseid = testid
-        status = 'OK'
-        status = self._calculate_load_phase(testid, phaseid, start_phaseid, load, False)
-        while status == 'OK' and not any(np.greater_equal(np.abs(load), max_load)):
-            for phase in self._g_i.phases:
-                if phase.Identification.value == phaseid:
-                    self._g_i.delete(phase)
-            _ = self._iphases.pop(phaseid)
-            self._test_log[testid]['phase'] = []
-            load = load_factor * load + load_increment
-            status = self._calculate_load_phase(testid, phaseid, start_phaseid, load, False)
+        load, prevphaseid, chain = self._search_failure_load(testid, phaseid, start_phaseid, load,
+                                                             max_load, load_factor, load_increment,
+                                                             search, tolerance, warm_start)
         self._g_i.view(self._g_i.Model.CurrentPhase)
         self._ophases[phaseid] = self._g_o.phases[-1]
-        self._set_phase_results(testid, phaseid, start_phaseid, load)
+        for stageid, stage_prevphaseid, stage_load in chain:
+            self._get_output_phase(stageid)
+            self._set_phase_results(testid, stageid, stage_prevphaseid, stage_load)
+        self._set_phase_results(testid, phaseid, prevphaseid, load)
+        self._store_test(testid)
 
     def safety_test(self, testid, start_from, test='incremental', SumMsf=None,
-                    Msf=0.1, qsurf=None, delete_fail=True):
+                    Msf=0.1, qsurf=None, delete_fail=True, storage=None):
         """Conducts a safety test on the model.
 
         Parameters
@@ -1458,6 +3195,13 @@ class Model(ABC):
         delete_fail : bool, optional
             Deletes surface load phase from model if there is a
             calculation error, by default True.
+        storage : str, tuple, None, optional
+            Calculation steps stored and extracted in each test phase:
+            'final' keeps only the last step, ('every', n) every n-th
+            step and ('uniform', n) or ('log', n) n uniformly or
+            logarithmically spaced steps. The last step of each phase is
+            always kept. If None all the steps are kept. By default
+            None.
 
         Raises
         ------
@@ -1489,15 +3233,17 @@ class Model(ABC):
         self._test_log[testid]['phase'] = []
         self._test_log[testid]['start phaseid'] = copy.deepcopy(start_phaseid)
         self._test_log[testid]['qsurf'] = qsurf
+        self._test_log[testid]['storage'] = self._check_storage(storage)
         
 
+        if self._restore_test(testid):
+            return
         start_phaseid = self._calculate_surface_load(testid, qsurf, start_phaseid, delete_fail)
-        self._iphases[testid] = self._g_i.phase(self._iphases[start_phaseid])
-        self._iphases[testid].Identification = testid
+        self._add_phase(testid, start_phaseid, testid)
 
         self._g_i.Model.CurrentPhase = self._iphases[testid]
         self._g_i.set(self._g_i.Model.CurrentPhase.DeformCalcType, "Safety")
-        self._g_i.set(self._g_i.Model.CurrentPhase.MaxStepsStored, 1000)
+        self._set_steps_stored(testid, 1000)
         if test == 'target':
             self._g_i.set(self._g_i.Model.CurrentPhase.Deform.LoadingType, "Target SumMsf")
             self._g_i.set(self._g_i.Model.CurrentPhase.Deform.Loading.SumMsf, SumMsf)
@@ -1508,9 +3254,11 @@ class Model(ABC):
         self._g_i.view(self._g_i.Model.CurrentPhase)
         self._ophases[testid] = self._g_o.phases[-1]
         self._set_phase_results(testid, testid, start_phaseid, self._get_phase_load(start_phaseid, 'end', target=False))
+        self._store_test(testid)
 
     def dynamic_test(self, testid, time, load, start_from='construction',
-                     nsubstep=10, qsurf=None, delete_fail=True):
+                     nsubstep=10, qsurf=None, delete_fail=True, chunk=None,
+                     compression=None, storage=None):
         """Apply a dynamic load to the foundation.
 
         Parameters
@@ -1538,14 +3286,39 @@ class Model(ABC):
         delete_fail : bool, optional
             Deletes test phases from model if there is a calculation
             error, by default True.
+        chunk : int, None, optional
+            Maximum number of time steps of each dynamic phase, up to
+            10,000. Longer time histories are calculated as consecutive
+            dynamic phases, each one starting from the previous one,
+            and their results are joined in a single test. If None,
+            histories with up to 10,000 time steps are calculated in a
+            single phase. By default None.
+        compression : float, None, optional
+            Uploads to Plaxis only the breakpoints of a piecewise linear
+            signal that reproduces the history within this error,
+            relative to the peak of each component. Breakpoints are
+            shared by all the components. The number of breakpoints and
+            the achieved error are stored in the test log, and the
+            results keep the full resolution history. If None all the
+            time steps are uploaded. By default None.
+        storage : str, tuple, None, optional
+            Calculation steps stored and extracted in each test phase:
+            'final' keeps only the last step, ('every', n) every n-th
+            step and ('uniform', n) or ('log', n) n uniformly or
+            logarithmically spaced steps. The last step of each phase is
+            always kept. If None all the steps are kept. By default
+            None.
 
         Raises
         ------
         RuntimeError
             Duplicated test id.
+        RuntimeError
+            Number of time steps in each phase out of range.
         """
         start_phaseid = self._get_start_phase(start_from)
         time, input_load, load = self._set_dynamic_load(time, load)
+        chunks = self._dynamic_chunks(len(time), chunk)
         
         if testid in self._test_log.keys():
             raise RuntimeError('Duplicated test id <{}>.'.format(testid))
@@ -1555,21 +3328,25 @@ class Model(ABC):
         self._test_log[testid]['time'] = time
         self._test_log[testid]['load'] = input_load
         self._test_log[testid]['nsubstep'] = nsubstep
+        self._test_log[testid]['chunk'] = chunk
         self._test_log[testid]['phase'] = []
         self._test_log[testid]['start phaseid'] = copy.deepcopy(start_phaseid)
         self._test_log[testid]['qsurf'] = qsurf
+        self._test_log[testid]['storage'] = self._check_storage(storage)
+        breakpoints = self._compress_history(testid, time, load, chunks, compression)
 
+        if self._restore_test(testid):
+            return
         start_phaseid = self._calculate_surface_load(testid, qsurf, start_phaseid, delete_fail)
         
-        self._set_dynamic_test_phase(testid, time, start_phaseid, nsubstep, False)
-
-        status = self._calculate_dynamic_load_phase(time, load)
-        self._check_phase_status(status, testid, testid, delete_fail)
-        self._set_phase_results(testid, testid, start_phaseid, [0, 0, 0])
+        self._calculate_dynamic_phases(testid, time, load, start_phaseid, nsubstep,
+                                       chunks, False, delete_fail, breakpoints=breakpoints)
         self._set_dynamic_load_result(testid, time, load)
+        self._store_test(testid)
 
     def shake_test(self, testid, time, acceleration, start_from='construction',
-                   qsurf=None, nsubstep=10, delete_fail=True):
+                   qsurf=None, nsubstep=10, delete_fail=True, chunk=None,
+                   compression=None, storage=None):
         """Apply a displacement time history at the model base.
 
         Parameters
@@ -1597,6 +3374,28 @@ class Model(ABC):
         delete_fail : bool, optional
             Deletes test phases from model if there is a calculation
             error, by default True.
+        chunk : int, None, optional
+            Maximum number of time steps of each dynamic phase, up to
+            10,000. Longer time histories are calculated as consecutive
+            dynamic phases, each one starting from the previous one,
+            and their results are joined in a single test. If None,
+            histories with up to 10,000 time steps are calculated in a
+            single phase. By default None.
+        compression : float, None, optional
+            Uploads to Plaxis only the breakpoints of a piecewise linear
+            signal that reproduces the history within this error,
+            relative to the peak of each component. Breakpoints are
+            shared by all the components. The number of breakpoints and
+            the achieved error are stored in the test log, and the
+            results keep the full resolution history. If None all the
+            time steps are uploaded. By default None.
+        storage : str, tuple, None, optional
+            Calculation steps stored and extracted in each test phase:
+            'final' keeps only the last step, ('every', n) every n-th
+            step and ('uniform', n) or ('log', n) n uniformly or
+            logarithmically spaced steps. The last step of each phase is
+            always kept. If None all the steps are kept. By default
+            None.
 
         Raises
         ------
@@ -1606,11 +3405,11 @@ class Model(ABC):
             Duplicated test id.
         RuntimeError
             Time is not 1-dimensional.
-        RuntimeError
-            More than 10,000 time steps.
         RuntimeError
             Length of base displacement array does not match the time
             array.
+        RuntimeError
+            Number of time steps in each phase out of range.
         """
         if not self._boundary_interface_flag:
             msg = ("Boundary interfaces must be included in the model, set "
@@ -1623,8 +3422,6 @@ class Model(ABC):
         time = np.array(time)
         if time.ndim != 1:
             raise RuntimeError('Time must be defined by a 1-dimensional array.')
-        if len(time) > 10000:
-            raise RuntimeError('Number of time steps must be <=10,000.')
         
         acceleration = np.array(acceleration)
         if acceleration.ndim == 1:
@@ -1632,6 +3429,7 @@ class Model(ABC):
         if acceleration.shape[1] != len(time):
             msg = 'Base acceleration and time arrays must have the same length.'
             raise RuntimeError(msg)
+        chunks = self._dynamic_chunks(len(time), chunk)
 
         start_phaseid = self._get_start_phase(start_from)
         self._test_log[testid] = {}
@@ -1640,57 +3438,152 @@ class Model(ABC):
         self._test_log[testid]['time'] = time
         self._test_log[testid]['load'] = acceleration
         self._test_log[testid]['nsubstep'] = nsubstep
+        self._test_log[testid]['chunk'] = chunk
         self._test_log[testid]['phase'] = []
         self._test_log[testid]['start phaseid'] = copy.deepcopy(start_phaseid)
         self._test_log[testid]['qsurf'] = qsurf
+        self._test_log[testid]['storage'] = self._check_storage(storage)
+        breakpoints = self._compress_history(testid, time, acceleration, chunks, compression)
 
+        if self._restore_test(testid):
+            return
         start_phaseid = self._calculate_surface_load(testid, qsurf, start_phaseid, delete_fail)
         
-        self._set_dynamic_test_phase(testid, time, start_phaseid, nsubstep, True)
-        
-        accel_x = self._g_i.displmultiplier()
-        self._g_i.set(accel_x.Signal, "Table")
-        self._g_i.set(accel_x.DataType, "Accelerations")
-        for idx, (t, accel) in enumerate(zip(time, acceleration[0])):
-            accel_x.Table.add()
-            self._g_i.set(accel_x.Table[idx].Time, t)
-            self._g_i.set(accel_x.Table[idx].Multiplier, accel)
-        
-        accel_y = self._g_i.displmultiplier()
-        self._g_i.set(accel_y.Signal, "Table")
-        self._g_i.set(accel_y.DataType, "Accelerations")
-        for idx, (t, accel) in enumerate(zip(time, acceleration[1])):
-            accel_y.Table.add()
-            self._g_i.set(accel_y.Table[idx].Time, t)
-            self._g_i.set(accel_y.Table[idx].Multiplier, accel)
+        self._calculate_dynamic_phases(testid, time, acceleration, start_phaseid, nsubstep,
+                                       chunks, True, delete_fail, breakpoints=breakpoints)
+        for loc in self._output_point.keys():
+            idx2 = self._results.rows(testid, location=loc)
+            result_time = self._results.get('time', idx2)
+            self._results.set('agx', idx2, np.interp(result_time, time, acceleration[0]))
+            self._results.set('agy', idx2, np.interp(result_time, time, acceleration[1]))
+        self._store_test(testid)
+
+    async def abuild(self):
+        """Asynchronous `build`. The blocking calls to Plaxis run in a
+        thread pool shared by all the models, so a single event loop
+        can drive several Plaxis servers.
+        """
+        await self._run_async(self.build)
 
-        self._g_i.activate(self._g_i.DynLineDisplacement_1_1, self._g_i.Model.CurrentPhase)
-       
-        self._g_i.set(self._g_i.DynLineDisplacement_1_1.Multiplierx, self._g_i.Model.CurrentPhase, accel_x)
-        self._g_i.set(self._g_i.DynLineDisplacement_1_1.Multipliery, self._g_i.Model.CurrentPhase, accel_y)
-        self._g_i.set(self._g_i.LineDisplacement_1_1.Displacement_x, self._g_i.Model.CurrentPhase, "Prescribed")
-        self._g_i.set(self._g_i.LineDisplacement_1_1.Displacement_y, self._g_i.Model.CurrentPhase, "Prescribed")
-        self._g_i.set(self._g_i.LineDisplacement_1_1.ux_start, self._g_i.Model.CurrentPhase, 1)
-        self._g_i.set(self._g_i.LineDisplacement_1_1.uy_start, self._g_i.Model.CurrentPhase, 1)
-        
-        if not self._symmetric:
-            self._g_i.activate(self._g_i.DynLineDisplacement_1_2, self._g_i.Model.CurrentPhase)
-            self._g_i.set(self._g_i.DynLineDisplacement_1_2.Multiplierx, self._g_i.Model.CurrentPhase, accel_x)
-            self._g_i.set(self._g_i.DynLineDisplacement_1_2.Multipliery, self._g_i.Model.CurrentPhase, accel_y)
-            self._g_i.set(self._g_i.LineDisplacement_1_2.Displacement_x, self._g_i.Model.CurrentPhase, "Prescribed")
-            self._g_i.set(self._g_i.LineDisplacement_1_2.Displacement_y, self._g_i.Model.CurrentPhase, "Prescribed")
-            self._g_i.set(self._g_i.LineDisplacement_1_2.ux_start, self._g_i.Model.CurrentPhase, 1)
-            self._g_i.set(self._g_i.LineDisplacement_1_2.uy_start, self._g_i.Model.CurrentPhase, 1)
+    async def aload_test(self, testid, *args, **kwargs):
+        """Asynchronous `load_test`. The blocking calls to Plaxis run
+        in a thread pool shared by all the models. Cancelling the task
+        stops the test before its next phase and deletes it from the
+        model.
 
-        status = self._g_i.calculate(self._g_i.Model.CurrentPhase)
-        self._check_phase_status(status, testid, testid, delete_fail)
-        self._set_phase_results(testid, testid, start_phaseid, [0, 0, 0])
-        idx = (self._results['test'] == testid)
-        for loc in self._output_point.keys():
-            idx2 = idx & (self._results['location']==loc)
-            result_time = self._results.loc[idx2, 'time'].to_numpy(dtype='float64')
-            self._results.loc[idx2, 'agx'] = np.interp(result_time, time, acceleration[0])
-            self._results.loc[idx2, 'agy'] = np.interp(result_time, time, acceleration[1])
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        *args, **kwargs
+            `load_test` parameters.
+        """
+        await self._run_async(self.load_test, testid, *args, testid=testid, **kwargs)
+
+    async def afailure_test(self, testid, *args, **kwargs):
+        """Asynchronous `failure_test`. The blocking calls to Plaxis run
+        in a thread pool shared by all the models. Cancelling the task
+        stops the test before its next phase and deletes it from the
+        model.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        *args, **kwargs
+            `failure_test` parameters.
+        """
+        await self._run_async(self.failure_test, testid, *args, testid=testid, **kwargs)
+
+    async def asafety_test(self, testid, *args, **kwargs):
+        """Asynchronous `safety_test`. The blocking calls to Plaxis run
+        in a thread pool shared by all the models. Cancelling the task
+        stops the test before its next phase and deletes it from the
+        model.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        *args, **kwargs
+            `safety_test` parameters.
+        """
+        await self._run_async(self.safety_test, testid, *args, testid=testid, **kwargs)
+
+    async def adynamic_test(self, testid, *args, **kwargs):
+        """Asynchronous `dynamic_test`. The blocking calls to Plaxis run
+        in a thread pool shared by all the models. Cancelling the task
+        stops the test before its next phase and deletes it from the
+        model.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        *args, **kwargs
+            `dynamic_test` parameters.
+        """
+        await self._run_async(self.dynamic_test, testid, *args, testid=testid, **kwargs)
+
+    async def ashake_test(self, testid, *args, **kwargs):
+        """Asynchronous `shake_test`. The blocking calls to Plaxis run
+        in a thread pool shared by all the models. Cancelling the task
+        stops the test before its next phase and deletes it from the
+        model.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+        *args, **kwargs
+            `shake_test` parameters.
+        """
+        await self._run_async(self.shake_test, testid, *args, testid=testid, **kwargs)
+
+    def run_plan(self, tests):
+        """Calculates a test plan sharing the common phases of the
+        tests. The load paths of all the tests are merged in a tree
+        where tests with the same start phase, surface load, first
+        load stages and step storage policy share those phases. Each
+        distinct phase is calculated once, by the first test that
+        reaches it. The following tests add the shared phases to their
+        test log and copy their results, keeping the stage numbering of
+        the test, and branch off the last shared phase, so every test
+        of the plan is in the model with the same results as when
+        calculated on its own. The full load path of each test is
+        stored in the 'path' key of the test log.
+
+        Load test stages are not shared in models with ratchetting,
+        since the post ratchetting material depends on the history of
+        each test.
+
+        Parameters
+        ----------
+        tests : list
+            Tests in calculation order. Each test is a dictionary with
+            the test method in the 'test' key, e.g. 'load_test', and
+            the method parameters, e.g.
+            {'test': 'safety_test', 'testid': 'fs', 'start_from': 'a'}.
+            Tests in the plan are used as start configurations through
+            their test id or (test id, stage number).
+
+        Returns
+        -------
+        PhaseTree
+            Phase tree of the plan, see `PhaseTree.report` and
+            `PhaseTree.savings`.
+        """
+        tree = PhaseTree(self._load_format, share_stages=self._ratchetting is None)
+        for test in tests:
+            tree.add(test)
+        self._plan_shared = tree.shared()
+        try:
+            for testid, method, parameters in tree.calls():
+                getattr(self, method)(**parameters)
+                self._test_log[testid]['path'] = tree.path(testid)
+        finally:
+            self._plan_shared = {}
+        return tree
 
     def delete_test(self, testid, delete_phases=True):
         """Deletes a test from the model.
@@ -1710,25 +3603,11 @@ class Model(ABC):
         if testid not in self._test_log:
             msg = 'Test <{}> not in results'.format(testid)
             raise RuntimeError(msg)
-        test_phases = self._test_log[testid]['phase']
         _ = self._test_log.pop(testid)
-        if delete_phases:
-            test_phases.reverse()
-            for phaseid in test_phases:
-                for phase in self._g_i.phases:
-                    if phase.Identification.value == phaseid:
-                        self._g_i.delete(phase)
-                for phase in self._g_o.phases:
-                    if phase.Identification.value == phaseid:
-                        self._g_o.delete(phase)
-            test_phases.reverse()
-        for phaseid in test_phases:
-            if phaseid in self._iphases:
-                _ = self._iphases.pop(phaseid)
-            if phaseid in self._ophases:
-                _ = self._ophases.pop(phaseid)
-        self._results = self._results[self._results['test']!=testid]
-        self._results.reset_index(drop=True, inplace=True)
+        for phaseid in reversed(self._test_phases(testid)):
+            self._delete_phase(phaseid, delete_phase=delete_phases)
+        self._results.drop_test(testid)
+        self._write_checkpoint({'record': 'delete', 'test': testid})
 
     def plot_test(self, testid, force=None, displacement=None,
                   phase=None, location=None, 
@@ -1843,28 +3722,28 @@ class Model(ABC):
             for key in y_lim:
                 y_lim[key] = ylim
 
-        if testid not in self._results['test'].to_list():
+        if testid not in self._results.tests():
             raise RuntimeError('Test <{}> not available in restuls.'.format(testid))
-        idx = self._results['test'] == testid
 
         if phase is None:
-            phase = self._results[idx]['phase'].unique()
+            phase = self._results.phases(testid)
         elif isinstance(phase, (str, numbers.Number)):
             phase = [phase]
+        phase = list(phase)
         phase_order = []
         for pidx in range(len(phase)):
             if isinstance(phase[pidx], numbers.Number):
                 phase[pidx] = '{}_stage_{:.0f}'.format(testid, phase[pidx])
-            if phase[pidx] not in self._results[idx]['phase'].to_list():
+            if phase[pidx] not in self._results.phases(testid):
                 msg = 'Phase <{}> not available in test <{}> not available in restuls'
                 msg = msg.format(phase[pidx], testid)
                 raise RuntimeError(msg)
-            idx2 = idx & (self._results['phase']==phase[pidx])
-            phase_order.append(int(self._results[idx2]['plx id'].unique()[0][6:]))
+            idx2 = self._results.rows(testid, phase[pidx])
+            phase_order.append(int(self._results.get('plx id', idx2)[0][6:]))
         phase = [x for _, x in sorted(zip(phase_order, phase))]
 
         if location is None:
-            location = self._results[idx]['location'].unique()
+            location = self._test_locations(testid)
         elif isinstance(location, (str, numbers.Number)):
             location = [location]
 
@@ -1888,12 +3767,12 @@ class Model(ABC):
                 ax = axes[idxf, idxd]
                 for loc in location:
                     for phaseid in phase:
-                        idx2 = idx & (self._results['phase']==phaseid) * (self._results['location']==loc)
+                        idx2 = self._results.rows(testid, phaseid, loc)
                         u0 = 0
                         if reset_start:
-                            u0 = self._results.loc[idx2, d].to_numpy()[0]
-                        ax.plot(dsign[d] * (self._results.loc[idx2, d] - u0)  *100,
-                                fsign[f] * self._results.loc[idx2, f],
+                            u0 = self._results.get(d, idx2)[0]
+                        ax.plot(dsign[d] * (self._results.get(d, idx2) - u0)  *100,
+                                fsign[f] * self._results.get(f, idx2),
                                 label='{} - {}'.format(loc, phaseid))
                 ax.set_xlim(x_lim[d])
                 ax.set_ylim(y_lim[f])
@@ -1976,15 +3855,13 @@ class Model(ABC):
             for key in y_lim:
                 y_lim[key] = ylim
 
-        if testid not in self._results['test'].to_list():
+        if testid not in self._results.tests():
             raise RuntimeError('Test <{}> not available in restuls.'.format(testid))
         if self._test_log[testid]['type'] not in ['safety incremental', 'safety target']:
             raise RuntimeError('Only safety tests can be plotted.')
-        
-        idx = self._results['test'] == testid
 
         if location is None:
-            location = self._results[idx]['location'].unique()
+            location = self._test_locations(testid)
         elif isinstance(location, (str, numbers.Number)):
             location = [location]
 
@@ -1999,12 +3876,12 @@ class Model(ABC):
         for idxd, d in enumerate(displacement): 
             ax = axes[idxd]
             for loc in location:
-                idx2 = (self._results['test']==testid) * (self._results['location']==loc)
+                idx2 = self._results.rows(testid, location=loc)
                 u0 = 0
                 if reset_start:
-                    u0 = self._results.loc[idx2, d].to_numpy()[0]
-                ax.plot(self._results.loc[idx2, 'SumMsf'], 
-                        dsign[d] * (self._results.loc[idx2, d] - u0) * 100,
+                    u0 = self._results.get(d, idx2)[0]
+                ax.plot(self._results.get('SumMsf', idx2), 
+                        dsign[d] * (self._results.get(d, idx2) - u0) * 100,
                         label='{}'.format(loc))
             if legend:
                 ax.legend()
@@ -2098,9 +3975,8 @@ class Model(ABC):
                 raise RuntimeError(msg)
         nf = len(force)        
 
-        idx = self._results['test'] == testid
         if location is None:
-            location = self._results[idx]['location'].unique()
+            location = self._test_locations(testid)
         elif isinstance(location, (str, numbers.Number)):
             location = [location]
 
@@ -2130,14 +4006,14 @@ class Model(ABC):
         fig, axes = plt.subplots(nd + nf, 1, figsize=(figsize[0], figsize[1] * (nd + nf)))
         for var, ax in zip(displacement + force, axes):
             if var in valid_forces:
-                idx2 = idx & (self._results['location']=='top')
-                ax.plot(self._results.loc[idx2, 'time'],
-                        self._results.loc[idx2, var] * scale_factor[var] * sign[var])
+                idx2 = self._results.rows(testid, location='top')
+                ax.plot(self._results.get('time', idx2),
+                        self._results.get(var, idx2) * scale_factor[var] * sign[var])
             else:
                 for loc in location:
-                    idx2 = idx & (self._results['location']==loc)
-                    ax.plot(self._results.loc[idx2, 'time'],
-                            self._results.loc[idx2, var] * scale_factor[var] * sign[var],
+                    idx2 = self._results.rows(testid, location=loc)
+                    ax.plot(self._results.get('time', idx2),
+                            self._results.get(var, idx2) * scale_factor[var] * sign[var],
                             label=loc)
                 if legend:
                     ax.legend()
@@ -2220,9 +4096,8 @@ class Model(ABC):
                 raise RuntimeError(msg)
         na = len(acceleration)
 
-        idx = self._results['test'] == testid
         if location is None:
-            location = self._results[idx]['location'].unique()
+            location = self._test_locations(testid)
         elif isinstance(location, (str, numbers.Number)):
             location = [location]
 
@@ -2246,14 +4121,14 @@ class Model(ABC):
         fig, axes = plt.subplots(nd + na, 1, figsize=(figsize[0], figsize[1] * (nd + na)))
         for var, ax in zip(displacement + acceleration, axes):
             if var in ['agx', 'agy']:
-                idx2 = idx & (self._results['location']=='top')
-                ax.plot(self._results.loc[idx2, 'time'],
-                        self._results.loc[idx2, var] * scale_factor[var] * sign[var])
+                idx2 = self._results.rows(testid, location='top')
+                ax.plot(self._results.get('time', idx2),
+                        self._results.get(var, idx2) * scale_factor[var] * sign[var])
             else:
                 for loc in location:
-                    idx2 = idx & (self._results['location']==loc)
-                    ax.plot(self._results.loc[idx2, 'time'],
-                            self._results.loc[idx2, var] * scale_factor[var] * sign[var],
+                    idx2 = self._results.rows(testid, location=loc)
+                    ax.plot(self._results.get('time', idx2),
+                            self._results.get(var, idx2) * scale_factor[var] * sign[var],
                             label=loc)
                 if legend:
                     ax.legend()
@@ -0,0 +1,295 @@
+import copy
+import numbers
+
+import pandas as pd
+
+
+_TESTS = ['load_test', 'failure_test', 'safety_test', 'dynamic_test', 'shake_test']
+
+
+class PhaseTree():
+    """Union of the load paths of a test plan. Each test path is a
+    chain of phases that starts from a phase of the model, optionally
+    followed by a surface load phase, the load test stages and the
+    failure, safety, dynamic or shake test phase. Tests that share the
+    start phase, the surface load and the first load stages, with the
+    same step storage policy, share the nodes of the tree, so each
+    distinct phase is calculated once and the remaining phases branch
+    off the last shared one. Each node keeps the phase id given by the
+    first test that reaches it.
+
+    Parameters
+    ----------
+    load_format : callable
+        Function that formats a load stage as a (3,) array (Fy, Fx, M).
+    share_stages : bool, optional
+        Share load test stages between tests. If False only the start
+        and surface load phases are shared. By default True.
+
+    Methods
+    -------
+    add(test)
+        Adds a test to the tree.
+    calls()
+        Test method calls of the plan.
+    shared()
+        Test phases calculated by a previous test of the plan.
+    path(testid)
+        Phase ids of the full load path of a test.
+    report()
+        Nodes of the tree.
+    savings()
+        Number of phases requested by the tests and calculated in the
+        tree.
+    """
+
+    def __init__(self, load_format, share_stages=True):
+        """Initialize a new instance of `PhaseTree`.
+
+        Parameters
+        ----------
+        load_format : callable
+            Function that formats a load stage as a (3,) array (Fy, Fx,
+            M).
+        share_stages : bool, optional
+            Share load test stages between tests. If False only the
+            start and surface load phases are shared. By default True.
+        """
+        self._load_format = load_format
+        self._share_stages = share_stages
+        self._nodes = []
+        self._children = {}
+        self._paths = {}
+        self._stages = {}
+        self._phases = {}
+        self._tests = []
+
+    #===================================================================
+    # PRIVATE METHODS
+    #===================================================================
+    def _child(self, parent, key, kind, testid, phaseid):
+        """Node of the tree, created if it does not exist.
+
+        Parameters
+        ----------
+        parent : int, None
+            Parent node index.
+        key : tuple
+            Node key, unique among the parent children.
+        kind : str
+            'start', 'qsurf', 'load', 'failure', 'safety', 'dynamic'
+            or 'shake'.
+        testid : str
+            Test id.
+        phaseid : str
+            Phase id used if the node is created.
+
+        Returns
+        -------
+        int
+            Node index.
+        """
+        if (parent, key) in self._children:
+            node = self._children[(parent, key)]
+            self._nodes[node]['tests'].append(testid)
+            return node
+        self._nodes.append({'parent': parent, 'kind': kind, 'owner': testid,
+                            'tests': [testid], 'phase': phaseid})
+        self._children[(parent, key)] = len(self._nodes) - 1
+        return len(self._nodes) - 1
+
+    def _start_node(self, start, testid):
+        """Node of a test start phase.
+
+        Parameters
+        ----------
+        start : str, tuple
+            Test start phase, see `Model.load_test`.
+        testid : str
+            Test id.
+
+        Returns
+        -------
+        int
+            Node index.
+
+        Raises
+        ------
+        RuntimeError
+            Failure, safety, dynamic or shake test requested as start
+            configuration.
+        RuntimeError
+            Stage not available in test.
+        """
+        if isinstance(start, tuple) and start[0] in self._stages:
+            stages = self._stages[start[0]]
+            if not isinstance(start[1], int) or start[1] >= len(stages):
+                msg = 'Requested start stage <{}> not available in test <{}>.'
+                raise RuntimeError(msg.format(start[1], start[0]))
+            return stages[start[1]]
+        if isinstance(start, str) and start in self._paths:
+            if start not in self._stages:
+                raise RuntimeError('Only load tests can be used as start configurations in a test plan.')
+            return self._paths[start][-1]
+        return self._child(None, ('start', start), 'start', testid, start)
+
+    #===================================================================
+    # PUBLIC METHODS
+    #===================================================================
+    def add(self, test):
+        """Adds a test to the tree.
+
+        Parameters
+        ----------
+        test : dict
+            Test method in the 'test' key and its parameters, e.g.
+            {'test': 'load_test', 'testid': 'a', 'load': [-100, -200]}.
+
+        Raises
+        ------
+        RuntimeError
+            Unsupported test.
+        RuntimeError
+            Duplicated test id.
+        """
+        test = copy.deepcopy(test)
+        method = test.get('test')
+        if method not in _TESTS:
+            msg = ("Unsupported test <{}>. Supported tests are 'load_test', "
+                   "'failure_test', 'safety_test', 'dynamic_test' and 'shake_test'.")
+            raise RuntimeError(msg.format(method))
+        testid = test['testid']
+        if testid in self._paths:
+            raise RuntimeError('Duplicated test id <{}>.'.format(testid))
+        start = test.get('start_from', 'construction')
+        storage = test.get('storage', None)
+        if isinstance(storage, list):
+            storage = tuple(storage)
+        path = [self._start_node(start, testid)]
+        phases = []
+
+        qsurf = test.get('qsurf', None)
+        if qsurf is not None:
+            phaseid = '{}_qsurf'.format(testid)
+            path.append(self._child(path[-1], ('qsurf', qsurf, storage), 'qsurf', testid, phaseid))
+            phases.append((phaseid, path[-1]))
+
+        if method == 'load_test':
+            load = test['load']
+            if isinstance(load, numbers.Number):
+                load = [load]
+            stages = []
+            for idx, load_value in enumerate(load):
+                load_value = tuple(float(value) for value in self._load_format(load_value))
+                key = ('load', load_value, storage) if self._share_stages else ('load', testid, idx)
+                phaseid = '{}_stage_{:.0f}'.format(testid, idx)
+                node = self._child(path[-1], key, 'load', testid, phaseid)
+                path.append(node)
+                stages.append(node)
+                phases.append((phaseid, node))
+            self._stages[testid] = stages
+        else:
+            path.append(self._child(path[-1], ('test', testid), method.replace('_test', ''),
+                                    testid, testid))
+        self._paths[testid] = path
+        self._phases[testid] = phases
+        self._tests.append(test)
+
+    def calls(self):
+        """Test method calls of the plan, in calculation order and with
+        the parameters of the test definition. The phases of each test
+        found in `shared` are calculated by a previous test.
+
+        Returns
+        -------
+        list
+            (test id, method, parameters) of each call.
+        """
+        calls = []
+        for test in self._tests:
+            test = copy.deepcopy(test)
+            method = test.pop('test')
+            calls.append((test['testid'], method, test))
+        return calls
+
+    def shared(self):
+        """Test phases calculated by a previous test of the plan.
+
+        Returns
+        -------
+        dict
+            Phase id of the shared phases in each test and phase id of
+            the node in the tree, given by the test that calculates it.
+        """
+        shared = {}
+        for testid, phases in self._phases.items():
+            for phaseid, node in phases:
+                if self._nodes[node]['owner'] != testid:
+                    shared[phaseid] = self._nodes[node]['phase']
+        return shared
+
+    def path(self, testid):
+        """Phase ids of the full load path of a test, including the
+        phases shared with other tests and the phases of the tests in
+        the plan it starts from.
+
+        Parameters
+        ----------
+        testid : str
+            Test id.
+
+        Returns
+        -------
+        list
+            Phase ids.
+        """
+        path = []
+        node = self._paths[testid][-1]
+        while self._nodes[node]['kind'] != 'start':
+            path.insert(0, self._nodes[node]['phase'])
+            node = self._nodes[node]['parent']
+        return path
+
+    def report(self):
+        """Nodes of the tree.
+
+        Returns
+        -------
+        pd.DataFrame
+            Phase id, parent phase id, node type, test that calculates
+            the phase, tests that share it and their number, and depth
+            in the tree. Start phases are not calculated in the plan
+            and have no test.
+        """
+        rows = []
+        for node in self._nodes:
+            parent = None if node['parent'] is None else self._nodes[node['parent']]['phase']
+            depth = 0
+            ancestor = node['parent']
+            while ancestor is not None:
+                depth += 1
+                ancestor = self._nodes[ancestor]['parent']
+            rows.append({'phase': node['phase'],
+                         'parent': parent,
+                         'type': node['kind'],
+                         'test': None if node['kind'] == 'start' else node['owner'],
+                         'tests': list(node['tests']),
+                         'shared': len(node['tests']),
+                         'depth': depth})
+        return pd.DataFrame(rows, columns=['phase', 'parent', 'type', 'test', 'tests', 'shared', 'depth'])
+
+    def savings(self):
+        """Number of phases requested by the tests and calculated in the
+        tree.
+
+        Returns
+        -------
+        dict
+            'requested' phases if each test was calculated from its
+            start phase, 'calculated' phases in the tree and 'saved'
+            phases.
+        """
+        requested = sum([len(path) - 1 for path in self._paths.values()])
+        calculated = len([node for node in self._nodes if node['kind'] != 'start'])
+        return {'requested': requested, 'calculated': calculated,
+                'saved': requested - calculated}
@@ -0,0 +1,725 @@
+import numpy as np
+import os
+import pandas as pd
+
+
+class ModelResults():
+    """Columnar storage of the model results. Each column is kept in a
+    preallocated numpy array whose capacity is doubled when full, so
+    adding the results of a phase costs O(rows in the phase). The
+    pandas DataFrame is only created when requested and it is cached
+    until the results are modified.
+
+    String columns (test, phase, location, ...) are stored as int32
+    codes into a list of categories, with -1 for missing values, and
+    they are returned as categoricals in the DataFrame. Missing
+    numeric values are NaN. Displacement and force columns can be
+    stored in single precision to reduce the memory of long dynamic
+    tests.
+
+    Rows are indexed by test, phase and location, each entry holding
+    the row ranges of that block, so the rows of a test, phase or
+    location are found without scanning the whole table. The index
+    is updated when rows are added or removed.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Initial number of rows allocated. By default 1024.
+    dtype : str, optional
+        Floating point type of the displacement and force columns:
+        'float64' or 'float32'. By default 'float64'.
+
+    Methods
+    -------
+    append(columns, nrow)
+        Adds rows at the end of the results.
+    get(column, rows=None)
+        Values of a column.
+    set(column, rows, values)
+        Sets values of a column.
+    keep(rows)
+        Keeps the selected rows and removes the rest.
+    drop_test(testid)
+        Removes the rows of a test.
+    select(tests)
+        Results of a set of tests.
+    tests()
+        Test ids in the results.
+    phases(testid)
+        Phase ids of a test.
+    locations(testid, phaseid)
+        Output locations of a test phase.
+    phase_test(phaseid)
+        Test id of a phase.
+    rows(testid, phaseid=None, location=None)
+        Rows of a test, phase or location.
+    frame()
+        Results as a DataFrame.
+    from_frame(df, dtype='float64')
+        Creates the results from a DataFrame.
+    to_archive(folder)
+        Writes the columns to an archive folder.
+    from_archive(folder, meta)
+        Creates the results from an archive folder.
+    materialize()
+        Reads the memory-mapped columns into memory.
+    """
+
+    _COLUMNS = ['test', 'phase', 'previous', 'plx id', 'previous plx id',
+                'location', 'step', 'time', 'sumMstage', 'SumMsf', 'uy',
+                'ux', 'Fy', 'Fx', 'M', 'qy0', 'qy1', 'qx', 'agx', 'agy',
+                'Fy target', 'Fx target', 'M target', 'ratchetting']
+    _CATEGORY_COLUMNS = ['test', 'phase', 'previous', 'plx id',
+                         'previous plx id', 'location']
+    _BOOL_COLUMNS = ['ratchetting']
+    _REDUCED_COLUMNS = ['uy', 'ux', 'Fy', 'Fx', 'M', 'qy0', 'qy1', 'qx',
+                        'Fy target', 'Fx target', 'M target']
+    _FLOAT_DTYPES = {'float64': np.float64, 'float32': np.float32}
+
+    def __init__(self, capacity=1024, dtype='float64'):
+        """Initialize a new instance of `ModelResults`.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Initial number of rows allocated. By default 1024.
+        dtype : str, optional
+            Floating point type of the displacement and force columns:
+            'float64' or 'float32'. By default 'float64'.
+
+        Raises
+        ------
+        RuntimeError
+            Unsupported dtype.
+        """
+        if dtype not in self._FLOAT_DTYPES:
+            msg = 'Results dtype <{}> not supported. Supported values are: {}.'
+            raise RuntimeError(msg.format(dtype, ', '.join(self._FLOAT_DTYPES)))
+        self._float_dtype = dtype
+        self._size = 0
+        self._capacity = 0
+        self._data = {}
+        self._categories = {column: np.array([None], dtype=object) for column in self._CATEGORY_COLUMNS}
+        self._category_code = {column: {} for column in self._CATEGORY_COLUMNS}
+        self._frame = None
+        self._index = {}
+        self._phase_test = {}
+        self._allocate(capacity)
+
+    def __len__(self):
+        return self._size
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_data'] = {col: values[:self._size].copy() for col, values in self._data.items()}
+        state['_capacity'] = self._size
+        state['_frame'] = None
+        return state
+
+    #===================================================================
+    # PRIVATE METHODS
+    #===================================================================
+    def _dtype(self, column):
+        """Data type of a column.
+
+        Parameters
+        ----------
+        column : str
+            Column name.
+
+        Returns
+        -------
+        type
+            numpy data type.
+        """
+        if column in self._CATEGORY_COLUMNS:
+            return np.int32
+        if column in self._BOOL_COLUMNS:
+            return bool
+        if column in self._REDUCED_COLUMNS:
+            return self._FLOAT_DTYPES[self._float_dtype]
+        return np.float64
+
+    def _empty(self, column, nrow):
+        """Empty column array.
+
+        Parameters
+        ----------
+        column : str
+            Column name.
+        nrow : int
+            Number of rows.
+
+        Returns
+        -------
+        np.ndarray
+            (nrow,) array filled with the missing value of the column.
+        """
+        dtype = self._dtype(column)
+        if column in self._CATEGORY_COLUMNS:
+            return np.full(nrow, -1, dtype=dtype)
+        if dtype is bool:
+            return np.zeros(nrow, dtype=bool)
+        return np.full(nrow, np.nan, dtype=dtype)
+
+    def _allocate(self, capacity):
+        """Sets the number of rows allocated in each column.
+
+        Parameters
+        ----------
+        capacity : int
+            Number of rows.
+        """
+        for column in self._COLUMNS:
+            values = self._empty(column, capacity)
+            if column in self._data:
+                values[:self._size] = self._data[column][:self._size]
+            self._data[column] = values
+        self._capacity = capacity
+
+    def _reserve(self, nrow):
+        """Makes room for new rows, doubling the allocated capacity
+        when needed.
+
+        Parameters
+        ----------
+        nrow : int
+            Number of rows to be added.
+        """
+        required = self._size + nrow
+        if required <= self._capacity:
+            return
+        self._allocate(max(2 * self._capacity, required, 1))
+
+    @staticmethod
+    def _is_missing(value):
+        """Checks if a value is None or NaN.
+
+        Parameters
+        ----------
+        value : object
+            Value.
+
+        Returns
+        -------
+        bool
+            True if the value is missing.
+        """
+        return value is None or (isinstance(value, float) and np.isnan(value))
+
+    def _encode(self, column, value):
+        """Category code of a value, adding it to the categories of
+        the column when new.
+
+        Parameters
+        ----------
+        column : str
+            Column name.
+        value : str, float, None
+            Value.
+
+        Returns
+        -------
+        int
+            Category code, -1 for missing values.
+        """
+        if self._is_missing(value):
+            return -1
+        codes = self._category_code[column]
+        if value not in codes:
+            codes[value] = len(codes)
+            categories = self._categories[column]
+            self._categories[column] = np.concatenate([categories[:-1], np.array([value, None], dtype=object)])
+        return codes[value]
+
+    def _encode_values(self, column, values, nrow):
+        """Category codes of the values added to a column.
+
+        Parameters
+        ----------
+        column : str
+            Column name.
+        values : str, float, None, array-like
+            Value repeated in all the rows or (nrow,) values.
+        nrow : int
+            Number of rows.
+
+        Returns
+        -------
+        np.ndarray
+            (nrow,) category codes.
+        """
+        if not isinstance(values, (list, tuple, np.ndarray)):
+            return np.full(nrow, self._encode(column, values), dtype=np.int32)
+        inverse, uniques = pd.factorize(np.asarray(values, dtype=object), use_na_sentinel=True)
+        codes = np.array([self._encode(column, value) for value in uniques] + [-1], dtype=np.int32)
+        return codes[inverse]
+
+    def _compact_categories(self):
+        """Removes the categories no longer used by any row.
+        """
+        for column in self._CATEGORY_COLUMNS:
+            values = self._data[column][:self._size]
+            used = np.unique(values[values >= 0])
+            categories = self._categories[column]
+            if len(used) == len(categories) - 1:
+                continue
+            remap = np.full(len(categories), -1, dtype=np.int32)
+            remap[used] = np.arange(len(used), dtype=np.int32)
+            values[:] = remap[values]
+            self._categories[column] = np.concatenate([categories[used], np.array([None], dtype=object)])
+            self._category_code[column] = {value: code for code, value in enumerate(self._categories[column][:-1])}
+
+    def _add_range(self, testid, phaseid, location, start, stop):
+        """Adds a row range to the index.
+
+        Parameters
+        ----------
+        testid : str, None
+            Test id.
+        phaseid : str
+            Phase id.
+        location : str, float
+            Output location.
+        start : int
+            First row.
+        stop : int
+            Row after the last one.
+        """
+        phases = self._index.setdefault(testid, {})
+        locations = phases.setdefault(phaseid, {})
+        ranges = locations.setdefault(location, [])
+        self._phase_test.setdefault(phaseid, testid) # phases shared by tests keep their first test
+        if len(ranges) > 0 and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], stop)
+            return
+        ranges.append((start, stop))
+
+    def _index_rows(self, start, stop):
+        """Adds new rows to the index, grouping consecutive rows
+        with the same test, phase and location.
+
+        Parameters
+        ----------
+        start : int
+            First new row.
+        stop : int
+            Row after the last new one.
+        """
+        if stop <= start:
+            return
+        columns = ['test', 'phase', 'location']
+        keys = [self._data[column][start:stop] for column in columns]
+        change = np.zeros(stop - start - 1, dtype=bool)
+        for values in keys:
+            change |= values[1:] != values[:-1]
+        bounds = np.concatenate([[0], np.flatnonzero(change) + 1, [stop - start]])
+        labels = [self._categories[column][values[bounds[:-1]]] for column, values in zip(columns, keys)]
+        for bidx, (first, last) in enumerate(zip(bounds[:-1], bounds[1:])):
+            self._add_range(labels[0][bidx], labels[1][bidx], labels[2][bidx],
+                            start + int(first), start + int(last))
+
+    def _reindex(self, rows):
+        """Updates the index after removing rows.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            (nrow,) boolean mask with the rows kept.
+        """
+        kept_before = np.concatenate([[0], np.cumsum(rows)])
+        index = self._index
+        self._index = {}
+        self._phase_test = {}
+        for testid, phases in index.items():
+            for phaseid, locations in phases.items():
+                for location, ranges in locations.items():
+                    for start, stop in ranges:
+                        new_start = int(kept_before[start])
+                        new_stop = int(kept_before[stop])
+                        if new_stop > new_start:
+                            self._add_range(testid, phaseid, location, new_start, new_stop)
+
+    @staticmethod
+    def _ranges_rows(ranges):
+        """Rows covered by a list of ranges.
+
+        Parameters
+        ----------
+        ranges : list
+            List of (start, stop) row ranges.
+
+        Returns
+        -------
+        slice, np.ndarray
+            Slice if there is a single range, otherwise the row
+            indexes.
+        """
+        if len(ranges) == 1:
+            return slice(*ranges[0])
+        if len(ranges) == 0:
+            return np.array([], dtype=int)
+        return np.concatenate([np.arange(start, stop) for start, stop in ranges])
+
+    #===================================================================
+    # PUBLIC METHODS
+    #===================================================================
+    def append(self, columns, nrow):
+        """Adds rows at the end of the results.
+
+        Parameters
+        ----------
+        columns : dict
+            Column values. Scalars are repeated in all the new rows,
+            array-like values must have length nrow. Missing columns
+            are filled with NaN, None or False.
+        nrow : int
+            Number of rows to add.
+
+        Raises
+        ------
+        RuntimeError
+            Unknown column.
+        """
+        for column in columns:
+            if column not in self._data:
+                raise RuntimeError('Unknown results column <{}>.'.format(column))
+        self._reserve(nrow)
+        start = self._size
+        stop = start + nrow
+        for column in self._COLUMNS:
+            if column not in columns:
+                self._data[column][start:stop] = self._empty(column, nrow)
+                continue
+            value = columns[column]
+            if column in self._CATEGORY_COLUMNS:
+                value = self._encode_values(column, value, nrow)
+            elif value is None:
+                value = self._empty(column, nrow)
+            self._data[column][start:stop] = value
+        self._size = stop
+        self._frame = None
+        self._index_rows(start, stop)
+
+    def get(self, column, rows=None):
+        """Values of a column.
+
+        Parameters
+        ----------
+        column : str
+            Column name.
+        rows : slice, np.ndarray, None, optional
+            Slice, boolean mask or row indexes. If None all the rows are
+            returned. By default None.
+
+        Returns
+        -------
+        np.ndarray
+            Column values. A view when rows is None or a slice, except
+            for string columns that are decoded from their category
+            codes.
+        """
+        values = self._data[column][:self._size]
+        if rows is not None:
+            values = values[rows]
+        if column in self._CATEGORY_COLUMNS:
+            return self._categories[column][values]
+        return values
+
+    def set(self, column, rows, values):
+        """Sets values of a column.
+
+        Parameters
+        ----------
+        column : str
+            Column name.
+        rows : slice, np.ndarray
+            Slice, boolean mask or row indexes.
+        values : numeric, array-like
+            New values.
+
+        Raises
+        ------
+        RuntimeError
+            String columns cannot be modified.
+        """
+        if column in self._CATEGORY_COLUMNS:
+            raise RuntimeError('Results column <{}> cannot be modified.'.format(column))
+        self._data[column][:self._size][rows] = values
+        self._frame = None
+
+    def keep(self, rows):
+        """Keeps the selected rows and removes the rest.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            (nrow,) boolean mask with the rows to keep.
+        """
+        rows = np.asarray(rows, dtype=bool)
+        nkeep = int(np.count_nonzero(rows))
+        for column in self._COLUMNS:
+            values = self._data[column]
+            values[:nkeep] = values[:self._size][rows]
+            values[nkeep:self._size] = self._empty(column, self._size - nkeep)
+        self._reindex(rows)
+        self._size = nkeep
+        self._compact_categories()
+        self._frame = None
+
+    def drop_test(self, testid):
+        """Removes the rows of a test.
+
+        Parameters
+        ----------
+        testid : str, None
+            Test id. None removes the rows of the initial phases.
+        """
+        if testid not in self._index:
+            return
+        rows = np.ones(self._size, dtype=bool)
+        rows[self.rows(testid)] = False
+        self.keep(rows)
+
+    def select(self, tests):
+        """Results of a set of tests and of the initial phases. Only
+        the rows of the selected tests are read, so memory-mapped
+        results are not loaded from disk.
+
+        Parameters
+        ----------
+        tests : list
+            Test ids.
+
+        Returns
+        -------
+        ModelResults
+            New results with the rows of the selected tests.
+        """
+        selected = [testid for testid in self._index if testid is None or testid in tests]
+        columns = [{column: self.get(column, self.rows(testid)) for column in self._COLUMNS}
+                   for testid in selected]
+        nrow = sum([len(test_columns['step']) for test_columns in columns])
+        results = ModelResults(capacity=max(nrow, 1), dtype=self._float_dtype)
+        for test_columns in columns:
+            results.append(test_columns, len(test_columns['step']))
+        return results
+
+    def tests(self):
+        """Test ids in the results.
+
+        Returns
+        -------
+        list
+            Test ids, None for the initial phases.
+        """
+        return list(self._index.keys())
+
+    def phases(self, testid):
+        """Phase ids of a test.
+
+        Parameters
+        ----------
+        testid : str, None
+            Test id.
+
+        Returns
+        -------
+        list
+            Phase ids in the order they were added.
+        """
+        return list(self._index.get(testid, {}).keys())
+
+    def locations(self, testid, phaseid):
+        """Output locations of a test phase.
+
+        Parameters
+        ----------
+        testid : str, None
+            Test id.
+        phaseid : str
+            Phase id.
+
+        Returns
+        -------
+        list
+            Output locations in the order they were added.
+        """
+        return list(self._index.get(testid, {}).get(phaseid, {}).keys())
+
+    def phase_test(self, phaseid):
+        """Test id of a phase.
+
+        Parameters
+        ----------
+        phaseid : str
+            Phase id.
+
+        Returns
+        -------
+        str, None
+            Test id.
+
+        Raises
+        ------
+        RuntimeError
+            Phase not in results.
+        """
+        if phaseid not in self._phase_test:
+            raise RuntimeError('Phase <{}> not available in results.'.format(phaseid))
+        return self._phase_test[phaseid]
+
+    def rows(self, testid, phaseid=None, location=None):
+        """Rows of a test, phase or location.
+
+        Parameters
+        ----------
+        testid : str, None
+            Test id.
+        phaseid : str, None, optional
+            Phase id. If None the rows of all the test phases are
+            returned. By default None.
+        location : str, float, None, optional
+            Output location. If None the rows of all the locations
+            are returned. By default None.
+
+        Returns
+        -------
+        slice, np.ndarray
+            Slice if the rows are contiguous, otherwise the row
+            indexes.
+        """
+        phases = self._index.get(testid, {})
+        if phaseid is not None:
+            phases = {phaseid: phases.get(phaseid, {})}
+        ranges = []
+        for locations in phases.values():
+            if location is not None:
+                ranges.extend(locations.get(location, []))
+                continue
+            for loc_ranges in locations.values():
+                ranges.extend(loc_ranges)
+        ranges.sort()
+        merged = []
+        for start, stop in ranges:
+            if len(merged) > 0 and merged[-1][1] == start:
+                merged[-1] = (merged[-1][0], stop)
+            else:
+                merged.append((start, stop))
+        return self._ranges_rows(merged)
+
+    def frame(self):
+        """Results as a DataFrame. The DataFrame is created on the
+        first request and reused until the results change.
+
+        Returns
+        -------
+        pd.DataFrame
+            Calculation results.
+        """
+        if self._frame is None:
+            data = {}
+            for column in self._COLUMNS:
+                values = self._data[column][:self._size].copy()
+                if column in self._CATEGORY_COLUMNS:
+                    values = pd.Categorical.from_codes(values, categories=pd.Index(self._categories[column][:-1], dtype=object))
+                data[column] = values
+            self._frame = pd.DataFrame(data)
+        return self._frame
+
+    @classmethod
+    def from_frame(cls, df, dtype='float64'):
+        """Creates the results from a DataFrame.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Results DataFrame.
+        dtype : str, optional
+            Floating point type of the displacement and force columns:
+            'float64' or 'float32'. By default 'float64'.
+
+        Returns
+        -------
+        ModelResults
+            Results with the DataFrame rows.
+        """
+        results = cls(capacity=max(len(df), 1), dtype=dtype)
+        columns = {}
+        for column in cls._COLUMNS:
+            if column not in df.columns:
+                continue
+            values = df[column].to_numpy(dtype=object)
+            if column not in cls._CATEGORY_COLUMNS:
+                values = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=results._dtype(column))
+            columns[column] = values
+        results.append(columns, len(df))
+        return results
+
+    def to_archive(self, folder):
+        """Writes each column to a binary `.npy` file in a folder.
+        Category labels and the row index are returned to be stored in
+        the archive manifest.
+
+        Parameters
+        ----------
+        folder : str
+            Archive folder.
+
+        Returns
+        -------
+        dict
+            Number of rows, floating point type, column files, category
+            labels, row index and phase tests.
+        """
+        self._compact_categories()
+        files = {}
+        for idx, column in enumerate(self._COLUMNS):
+            files[column] = 'column_{:02d}.npy'.format(idx)
+            np.save(os.path.join(folder, files[column]), self._data[column][:self._size])
+        return {'size': self._size,
+                'dtype': self._float_dtype,
+                'files': files,
+                'categories': {column: list(self._categories[column][:-1]) for column in self._CATEGORY_COLUMNS},
+                'index': self._index,
+                'phase test': self._phase_test}
+
+    @classmethod
+    def from_archive(cls, folder, meta):
+        """Creates the results from an archive folder. Column files are
+        memory-mapped copy-on-write, so only the rows that are accessed
+        are read from disk and the files are never modified. Rows added
+        later are stored in memory.
+
+        Parameters
+        ----------
+        folder : str
+            Archive folder.
+        meta : dict
+            Results data returned by `to_archive`.
+
+        Returns
+        -------
+        ModelResults
+            Results with the archived rows.
+        """
+        results = cls(capacity=0, dtype=meta['dtype'])
+        for column in cls._COLUMNS:
+            results._data[column] = np.asarray(np.load(os.path.join(folder, meta['files'][column]), mmap_mode='c'))
+        for column in cls._CATEGORY_COLUMNS:
+            categories = meta['categories'][column]
+            results._categories[column] = np.array(categories + [None], dtype=object)
+            results._category_code[column] = {value: code for code, value in enumerate(categories)}
+        results._size = meta['size']
+        results._capacity = meta['size']
+        results._index = meta['index']
+        results._phase_test = meta['phase test']
+        return results
+
+    def materialize(self):
+        """Reads the memory-mapped columns into memory, so the files
+        of the archive they were loaded from can be replaced.
+        """
+        self._allocate(self._capacity)
+        self._frame = None
@@ -0,0 +1,8 @@
+try:
+    from plxscripting.plx_scripting_exceptions import PlxScriptingError
+except ImportError: # plxscripting is only available with Plaxis
+    class PlxScriptingError(Exception):
+        """Error raised by the Plaxis remote scripting server when it
+        rejects a command. Used when plxscripting is not installed, e.g.
+        with the fake Plaxis server of `padtest.testing`.
+        """
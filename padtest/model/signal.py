@@ -0,0 +1,100 @@
+import numpy as np
+
+
+def _segment_error(time, scaled, start, end):
+    """Interpolation error of the inner samples of a segment.
+
+    Parameters
+    ----------
+    time : np.ndarray
+        (nt,) time array.
+    scaled : np.ndarray
+        (ncomp, nt) time history scaled by the peak of each component.
+    start : int
+        Index of the first sample of the segment.
+    end : int
+        Index of the last sample of the segment.
+
+    Returns
+    -------
+    np.ndarray
+        (end - start - 1,) maximum error among the components of each
+        inner sample.
+    """
+    inner = time[start + 1:end]
+    duration = time[end] - time[start]
+    if duration == 0:
+        weight = np.zeros_like(inner)
+    else:
+        weight = (inner - time[start]) / duration
+    line = scaled[:, [start]] + (scaled[:, [end]] - scaled[:, [start]]) * weight
+    return np.max(np.abs(scaled[:, start + 1:end] - line), axis=0)
+
+
+def compress_history(time, history, tolerance, keep=None):
+    """Reduces a time history to the breakpoints of a piecewise linear
+    signal that reproduces it within a tolerance. Breakpoints are
+    shared by all the components of the history and selected by
+    recursively splitting each segment at the sample with the largest
+    interpolation error (Ramer-Douglas-Peucker), so constant and linear
+    stretches such as holds, ramps and zero padding are reduced to their
+    end points.
+
+    Parameters
+    ----------
+    time : np.ndarray
+        (nt,) time array.
+    history : np.ndarray
+        (ncomp, nt) time history, e.g. (Fy, Fx, M) or (ax, ay).
+    tolerance : float
+        Maximum interpolation error relative to the peak absolute value
+        of each component.
+    keep : array-like, None, optional
+        Indexes of samples that must be kept as breakpoints, e.g. the
+        first and last steps of the dynamic phases. By default None.
+
+    Returns
+    -------
+    np.ndarray
+        (nt,) boolean mask of the breakpoints.
+    float
+        Achieved maximum interpolation error relative to the peak
+        absolute value of each component.
+
+    Raises
+    ------
+    RuntimeError
+        Negative tolerance.
+    """
+    if tolerance < 0:
+        raise RuntimeError('Compression tolerance must be positive.')
+    time = np.asarray(time, dtype=float)
+    history = np.atleast_2d(np.asarray(history, dtype=float))
+    nt = len(time)
+    peak = np.max(np.abs(history), axis=1, keepdims=True)
+    peak[peak == 0] = 1
+    scaled = history / peak
+
+    mask = np.zeros(nt, dtype=bool)
+    mask[[0, nt - 1]] = True
+    if keep is not None:
+        mask[np.asarray(keep, dtype=int)] = True
+    anchors = np.flatnonzero(mask)
+    segments = [(start, end) for start, end in zip(anchors[:-1], anchors[1:]) if end - start > 1]
+    while len(segments) > 0:
+        start, end = segments.pop()
+        error = _segment_error(time, scaled, start, end)
+        idx = int(np.argmax(error))
+        if error[idx] <= tolerance:
+            continue
+        split = start + 1 + idx
+        mask[split] = True
+        if split - start > 1:
+            segments.append((start, split))
+        if end - split > 1:
+            segments.append((split, end))
+
+    idxs = np.flatnonzero(mask)
+    approx = np.vstack([np.interp(time, time[idxs], component[idxs]) for component in scaled])
+    error = float(np.max(np.abs(approx - scaled))) if nt > 0 else 0.0
+    return mask, error
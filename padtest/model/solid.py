@@ -1,7 +1,6 @@
 import copy
 import numpy as np
 import numbers
-import pandas as pd
 
 from padtest.geometry.solid import SymmetricSolidGeometry as SG
 from padtest.geometry.solid import NonSymmetricSolidGeometry as NSG
@@ -46,6 +45,26 @@ class SolidModel():
             self._load = self._g_i.lineload([xmin, zload], [self._b1 / 2, zload])
         self._g_i.set(self._load[3].Distribution, "Linear")
     
+    def _capacity_load(self, load):
+        """Converts a load on the whole foundation to the load applied
+        to the model. In axisymmetric models the column load is
+        distributed over its radius.
+
+        Parameters
+        ----------
+        load : np.ndarray
+            (3,) load on the whole foundation (Fy, Fx, M) [kN/m] in
+            plane strain or [kN] in axisymmetry.
+
+        Returns
+        -------
+        np.ndarray
+            (3,) model load (Fy, Fx, M).
+        """
+        if self._model_type == 'axisymmetry':
+            return 4 * load / (np.pi * self._b1)
+        return load
+
     def _set_load(self, load):
         """Sets load value in the current phase.
 
@@ -81,7 +100,7 @@ class SolidModel():
         """
         for poly_idx in self._foundation:
             self._g_i.activate(self._structure_polygons[poly_idx], self._g_i.phases[phaseidx])
-            self._set_soil_material(self._g_i, poly_idx + 1, phaseidx, 'concrete')
+        self._set_soil_materials(phaseidx, [(poly_idx + 1, 'concrete') for poly_idx in self._foundation])
 
     def _set_output_precalc(self):
         """Select output points before calcualtion. Used for points in
@@ -130,19 +149,56 @@ class SolidModel():
             (nstep, nloc) ux displacement at the output locations.
         """
 
-        Uy = np.zeros((len(self._output_location) + 1, nstep))
-        Ux = np.zeros((len(self._output_location) + 1, nstep))
-        sumMstage = np.zeros(nstep)
+        ophase = self._ophases[phaseid]
+        points = list(self._output_point.values())
+        result_types = [self._g_o.ResultTypes.Soil.Uy, self._g_o.ResultTypes.Soil.Ux]
+        Uy, Ux = self._extractor.phase_results(ophase, points, result_types, nstep)
+        reached = self._extractor.phase_reached(ophase, ['SumMstage'], nstep, point=points[0],
+                                                result_group=self._g_o.ResultTypes.Soil)
+        return reached['SumMstage'], Uy, Ux
+
+    def _phase_input(self, phaseid, prevphaseid):
+        """Reads from Plaxis Input the phase data needed to add the
+        phase results to the results dataframe.
 
-        for sidx, step in enumerate(self._ophases[phaseid].Steps.value):
-            sumMstage[sidx] = step.Reached.SumMstage.value
-            for locidx, node in enumerate(self._output_point.keys()):
-                Uy[locidx, sidx] = self._g_o.getcurveresults(self._output_point[node], step, self._g_o.ResultTypes.Soil.Uy)
-                Ux[locidx, sidx] = self._g_o.getcurveresults(self._output_point[node], step, self._g_o.ResultTypes.Soil.Ux)
-        return sumMstage, Uy, Ux
+        Parameters
+        ----------
+        phaseid : str
+            Phase id
+        prevphaseid : str
+            Id of the previous phase.
+
+        Returns
+        -------
+        dict
+            Phase names and line load (qy0, qy1, qx) at the end of the
+            previous phase and of the phase, None if not active.
+        """
+        iphase = self._iphases[phaseid]
+        previphase = self._iphases[prevphaseid]
+        start_load = (0, 0, 0)
+        end_load = None
+        if self._g_i.LineLoad_1_1.Active[previphase] is not None:
+            if self._g_i.LineLoad_1_1.Active[previphase].value:
+                start_load = (self._g_i.LineLoad_1_1.qy_start[previphase].value,
+                              self._g_i.LineLoad_1_1.qy_end[previphase].value,
+                              self._g_i.LineLoad_1_1.qx_start[previphase].value)
+        
+        if self._g_i.LineLoad_1_1.Active[iphase] is not None:
+            if self._g_i.LineLoad_1_1.Active[iphase].value:
+                end_load = (self._g_i.LineLoad_1_1.qy_start[iphase].value,
+                            self._g_i.LineLoad_1_1.qy_end[iphase].value,
+                            self._g_i.LineLoad_1_1.qx_start[iphase].value)
+        return {'phase': iphase.Identification.value,
+                'previous': previphase.Identification.value,
+                'plx id': iphase.Name.value,
+                'previous plx id': previphase.Name.value,
+                'start load': start_load,
+                'end load': end_load}
 
-    def _set_phase_results(self, testid, phaseid, prevphaseid, load):
-        """Adds phase results to the results dataframe.
+    def _extract_phase_results(self, testid, phaseid, prevphaseid, load, phase_input):
+        """Extracts the phase results from Plaxis Output and adds them
+        to the results dataframe.
 
         Parameters
         ----------
@@ -154,14 +210,16 @@ class SolidModel():
             Id of the previous phase.
         load : np.ndarray
             (3,) load applied at the end of the phase (Fy, Fx, M).
+        phase_input : dict
+            Phase data read from Plaxis Input, see `_phase_input`.
         """
-        iphase = self._iphases[phaseid]
-        previphase = self._iphases[prevphaseid]
         ophase = self._ophases[phaseid]
         prevophase = self._ophases[prevphaseid]
 
-        nstep = len(list(ophase.Steps.value))
-        steps = np.linspace(0, nstep, nstep + 1)
+        nstored = len(list(ophase.Steps.value))
+        stored = self._stored_steps(testid, nstored)
+        nstep = len(stored)
+        steps = np.append(0, stored + 1.0)
         time = np.zeros(nstep + 1)
         sumMstage = np.zeros(nstep + 1)
         SumMsf = np.zeros(nstep + 1)
@@ -180,18 +238,20 @@ class SolidModel():
         Ux = np.zeros((len(self._output_location) + 1, nstep + 1))
         
         # start with last step from previous phase
+        points = list(self._output_point.values())
+        result_group = self._g_o.ResultTypes.Soil
+        result_types = [result_group.Uy, result_group.Ux]
         step = prevophase.Steps.value[-1]
-        for locidx, node in enumerate(self._output_point.keys()):
-            Uy[locidx, 0] = self._g_o.getcurveresults(self._output_point[node], step, self._g_o.ResultTypes.Soil.Uy)
-            Ux[locidx, 0] = self._g_o.getcurveresults(self._output_point[node], step, self._g_o.ResultTypes.Soil.Ux)
-        
-        for sidx, step in enumerate(ophase.Steps.value):
-            sumMstage[sidx + 1] = step.Reached.SumMstage.value
-            SumMsf[sidx + 1] = step.Reached.SumMsf.value
-            time[sidx + 1]  = step.Reached.DynamicTime.value
-            for locidx, node in enumerate(self._output_point.keys()):
-                Uy[locidx, sidx + 1] = self._g_o.getcurveresults(self._output_point[node], step, self._g_o.ResultTypes.Soil.Uy)
-                Ux[locidx, sidx + 1] = self._g_o.getcurveresults(self._output_point[node], step, self._g_o.ResultTypes.Soil.Ux)
+        Uy[:, 0], Ux[:, 0] = self._extractor.step_results(points, step, result_types)
+
+        Uy[:, 1:], Ux[:, 1:] = self._extractor.phase_results(ophase, points, result_types, nstored,
+                                                             steps=stored)
+        reached = self._extractor.phase_reached(ophase, ['SumMstage', 'SumMsf', 'DynamicTime'],
+                                                nstored, point=points[0], result_group=result_group,
+                                                steps=stored)
+        sumMstage[1:] = reached['SumMstage']
+        SumMsf[1:] = reached['SumMsf']
+        time[1:] = reached['DynamicTime']
         
         target_load_start = self._get_phase_load(prevphaseid, 'end', target=True)
         # Target loads
@@ -200,62 +260,46 @@ class SolidModel():
         M_target = target_load_start[2] + (load[2] - target_load_start[2]) * sumMstage
         
         # Applied loads
-        qy0_start = 0
-        qy0_end = 0
-        qy1_start = 0
-        qy1_end = 0
-        qx_start = 0
-        qx_end = 0
-        if self._g_i.LineLoad_1_1.Active[previphase] is not None:
-            if self._g_i.LineLoad_1_1.Active[previphase].value:
-                qy0_start = self._g_i.LineLoad_1_1.qy_start[previphase].value
-                qy1_start = self._g_i.LineLoad_1_1.qy_end[previphase].value
-                qx_start = self._g_i.LineLoad_1_1.qx_start[previphase].value
-        
-        if self._g_i.LineLoad_1_1.Active[iphase] is not None:
-            if self._g_i.LineLoad_1_1.Active[iphase].value:
-                qy0_end = self._g_i.LineLoad_1_1.qy_start[iphase].value
-                qy1_end = self._g_i.LineLoad_1_1.qy_end[iphase].value
-                qx_end = self._g_i.LineLoad_1_1.qx_start[iphase].value
-
-                qy0 = qy0_start + (qy0_end - qy0_start) * sumMstage
-                qy1 = qy1_start + (qy1_end - qy1_start) * sumMstage
-                qx = qx_start + (qx_end - qx_start) * sumMstage
-                Fy = (qy0 + qy1) * self._b1 / 2
-                Fx = qx * self._b1
-                M = (qy1 - qy0) * self._b1**2 / 12
+        qy0_start, qy1_start, qx_start = phase_input['start load']
+        if phase_input['end load'] is not None:
+            qy0_end, qy1_end, qx_end = phase_input['end load']
+            qy0 = qy0_start + (qy0_end - qy0_start) * sumMstage
+            qy1 = qy1_start + (qy1_end - qy1_start) * sumMstage
+            qx = qx_start + (qx_end - qx_start) * sumMstage
+            Fy = (qy0 + qy1) * self._b1 / 2
+            Fx = qx * self._b1
+            M = (qy1 - qy0) * self._b1**2 / 12
         
-        # ad results to dataframe
+        # ad results to the results table
+        phase_name = phase_input['phase']
+        prev_phase_name = phase_input['previous']
+        plx_id = phase_input['plx id']
+        prev_plx_id = phase_input['previous plx id']
         for locidx, loc in enumerate(self._output_point):
-            df = pd.DataFrame({'test':[testid] * (nstep + 1),
-                               'phase':[iphase.Identification.value] * (nstep + 1),
-                               'previous':[previphase.Identification.value] * (nstep + 1),
-                               'plx id':[iphase.Name.value] * (nstep + 1),
-                               'previous plx id':[previphase.Name.value] * (nstep + 1),
-                               'location': [loc] * (nstep + 1),
-                               'step': steps,
-                               'time': time,
-                               'sumMstage':sumMstage, 
-                               'SumMsf':SumMsf,
-                               'uy': Uy[locidx, :],
-                               'ux': Ux[locidx, :],
-                               'Fy': Fy,
-                               'Fx': Fx,
-                               'M':M,
-                               'qy0':qy0,
-                               'qy1':qy1,
-                               'qx':qx,
-                               'agx':base_accel_x,
-                               'agy':base_accel_y,
-                               'Fy target':Fy_target,
-                               'Fx target':Fx_target,
-                               'M target':M_target,                               
-                               'ratchetting': [False] * (nstep + 1)})
-            if len(self._results) == 0:
-                self._results = df
-            else:
-                self._results = pd.concat([self._results, df])
-            self._results.reset_index(inplace=True, drop=True)
+            self._results.append({'test': testid,
+                                  'phase': phase_name,
+                                  'previous': prev_phase_name,
+                                  'plx id': plx_id,
+                                  'previous plx id': prev_plx_id,
+                                  'location': loc,
+                                  'step': steps,
+                                  'time': time,
+                                  'sumMstage': sumMstage,
+                                  'SumMsf': SumMsf,
+                                  'uy': Uy[locidx, :],
+                                  'ux': Ux[locidx, :],
+                                  'Fy': Fy,
+                                  'Fx': Fx,
+                                  'M': M,
+                                  'qy0': qy0,
+                                  'qy1': qy1,
+                                  'qx': qx,
+                                  'agx': base_accel_x,
+                                  'agy': base_accel_y,
+                                  'Fy target': Fy_target,
+                                  'Fx target': Fx_target,
+                                  'M target': M_target,
+                                  'ratchetting': False}, nstep + 1)
 
     def _set_dynamic_load(self, time, load):
         """Sets dynamic load.
@@ -281,8 +325,6 @@ class SolidModel():
         ------
         RuntimeError
             Time is not 1-dimensional.
-        RuntimeError
-            More than 10,000 time steps.
         RuntimeError
             Load has horizontal component in symmetric model.
         RuntimeError
@@ -290,8 +332,6 @@ class SolidModel():
         """
         if time.ndim != 1:
             raise RuntimeError('Time must be defined by a 1-dimensional array.')
-        if len(time) > 10000:
-            raise RuntimeError('Number of time steps must be <=10,000.')
     
         nt = time.size
         input_load = copy.deepcopy(load)
@@ -305,11 +345,13 @@ class SolidModel():
             raise RuntimeError(msg)
         return time, input_load, load
 
-    def _calculate_dynamic_load_phase(self, time, load):
+    def _calculate_dynamic_load_phase(self, phaseid, time, load):
         """Calcualtes a dynamic load phase.
 
         Parameters
         ----------
+        phaseid : str
+            Phase id.
         time : np.ndarray
             (nt,) time array.
         load : np.ndaarray
@@ -321,19 +363,8 @@ class SolidModel():
             Calculation status.
         """
 
-        lmFy = self._g_i.loadmultiplier()
-        self._g_i.set(lmFy.Signal, "Table")
-        for idx, (t, Fy) in enumerate(zip(time, load[0])):
-            lmFy.Table.add()
-            self._g_i.set(lmFy.Table[idx].Time, t)
-            self._g_i.set(lmFy.Table[idx].Multiplier, Fy / self._b1)
-        
-        lmFx = self._g_i.loadmultiplier()
-        self._g_i.set(lmFx.Signal, "Table")
-        for idx, (t, Fx) in enumerate(zip(time, load[1])):
-            lmFx.Table.add()
-            self._g_i.set(lmFx.Table[idx].Time, t)
-            self._g_i.set(lmFx.Table[idx].Multiplier, Fx / self._b1)
+        lmFy = self._set_table_multiplier(phaseid, 'load', time, load[0] / self._b1)
+        lmFx = self._set_table_multiplier(phaseid, 'load', time, load[1] / self._b1)
         
         self._g_i.deactivate(self._g_i.LineLoad_1_1, self._g_i.Model.CurrentPhase)
         self._g_i.activate(self._g_i.DynLineLoad_1_1, self._g_i.Model.CurrentPhase)
@@ -358,17 +389,16 @@ class SolidModel():
         load : np.ndarray
             (2, nt) Load array (Fy, Fx).
         """
-        idx = (self._results['test'] == testid)
         for loc in self._output_point.keys():
-            idx2 = idx & (self._results['location']==loc)
-            result_time = self._results.loc[idx2, 'time'].to_numpy(dtype='float64')
+            idx2 = self._results.rows(testid, location=loc)
+            result_time = self._results.get('time', idx2)
             Fy = np.interp(result_time, time, load[0])
             Fx = np.interp(result_time, time, load[1])
-            self._results.loc[idx2, 'Fy'] = Fy
-            self._results.loc[idx2, 'Fx'] = Fx
-            self._results.loc[idx2, 'qy0'] = Fy / self._b1
-            self._results.loc[idx2, 'qy1'] = Fy / self._b1
-            self._results.loc[idx2, 'qx'] = Fx / self._b1
+            self._results.set('Fy', idx2, Fy)
+            self._results.set('Fx', idx2, Fx)
+            self._results.set('qy0', idx2, Fy / self._b1)
+            self._results.set('qy1', idx2, Fy / self._b1)
+            self._results.set('qx', idx2, Fx / self._b1)
 
 
 class SymmetricSolidModel(SG, SolidModel, Model):
@@ -478,6 +508,23 @@ class SymmetricSolidModel(SG, SolidModel, Model):
         Include boundary interfaces needed for a base shake test.
         This requires a much denser mesh and more computationally
         demanding models. By default False.
+    results_dtype : str, optional
+        Floating point type used to store the displacement and force
+        results: 'float64' or 'float32'. Single precision halves the
+        memory of long dynamic and shake tests. By default 'float64'.
+    instrument : bool, optional
+        Count and time the remote calls to Plaxis. The report is
+        available in `call_report`. By default False.
+    cache : ResultsCache, str, None, optional
+        Persistent cache of calculated tests, or its folder. Tests
+        already calculated with the same model and test definition are
+        restored from the cache without calling Plaxis. By default
+        None.
+    project_cache : ProjectCache, str, None, optional
+        Persistent cache of built Plaxis projects, or its folder.
+        Models with the same definition open the cached project instead
+        of building it and calculating the initial phases. By default
+        None.
     
     Methods
     -------
@@ -486,13 +533,19 @@ class SymmetricSolidModel(SG, SolidModel, Model):
     regen(s_i, g_i, g_o, test=False) : 
         Regenerates the model in Plaxis. Optinoally it recalculates
         previous load tests.
-    save(filename)
+    save(filename, archive=False)
         Saves model to file. Plaxis objects cannot be stored, only
         input properties and results. When loaded, the model can
         be regenerated with <regen> method.
-    load(filename)
+    load(filename, tests=None)
         Loads saved test.
-    failure_test(testid, load, max_load=[np.inf, np.inf, np.inf], load_factor=2, load_increment=[0, 0, 0], qsurf=None, start_from='construction', delete_fail=True)
+    checkpoint(path)
+        Checkpoints the model after every calculated phase.
+    resume(path, s_i, g_i, g_o)
+        Restores a checkpointed model after a crash.
+    bearing_capacity(load=[-1, 0, 0], method='vesic')
+        Analytical bearing capacity estimate of the foundation.
+    failure_test(testid, load, max_load=[np.inf, np.inf, np.inf], load_factor=2, load_increment=[0, 0, 0], qsurf=None, start_from='construction', delete_fail=True, search='increment', tolerance=0.05, warm_start=False, first_guess=None)
         Test the foundation until the model does not converge.
     load_test(testid, load, start_from='construction', qsurf=None, delete_fail=True)
         Conducts a load test in the model.
@@ -502,6 +555,10 @@ class SymmetricSolidModel(SG, SolidModel, Model):
         Apply a dynamic load to the foundation.
     shake_test(testid, time, acceleration, start_from='construction', qsurf=None, nsubstep=10, delete_fail=True)
         Apply a displacement time history at the model base.
+    abuild(), aload_test(testid, ...), afailure_test(testid, ...), asafety_test(testid, ...), adynamic_test(testid, ...), ashake_test(testid, ...)
+        Asynchronous versions of the build and test methods.
+    run_plan(tests)
+        Calculates a test plan sharing the common phases of the tests.
     delete_test( testid, delete_phases=True) 
         Deletes a test from the model.
     plot(figsize=2.5, foundation=True, fill=True, soil=True, excavation=False, ratchetting=True, wt=True, interface=False, output_location=False)
@@ -539,7 +596,9 @@ class SymmetricSolidModel(SG, SolidModel, Model):
                  locations=[0, 0.25, 0.5, 0.75, 1], build=True, excavation=True,
                  deformation_boundary_condition=None,
                  dynamic_boundary_condtions=None, 
-                 shake_boundary_condtions=None, boundary_interface=False):
+                 shake_boundary_condtions=None, boundary_interface=False,
+                 results_dtype='float64', instrument=False,
+                 cache=None, project_cache=None):
         """Initialize a new instance of `SymmetricSolidModel`.
 
         Parameters
@@ -645,6 +704,23 @@ class SymmetricSolidModel(SG, SolidModel, Model):
             Include boundary interfaces needed for a base shake test.
             This requires a much denser mesh and more computationally
             demanding models. By default False.
+        results_dtype : str, optional
+            Floating point type used to store the displacement and force
+            results: 'float64' or 'float32'. Single precision halves the
+            memory of long dynamic and shake tests. By default 'float64'.
+        instrument : bool, optional
+            Count and time the remote calls to Plaxis. The report is
+            available in `call_report`. By default False.
+        cache : ResultsCache, str, None, optional
+            Persistent cache of calculated tests, or its folder. Tests
+            already calculated with the same model and test definition are
+            restored from the cache without calling Plaxis. By default
+            None.
+        project_cache : ProjectCache, str, None, optional
+            Persistent cache of built Plaxis projects, or its folder.
+            Models with the same definition open the cached project
+            instead of building it and calculating the initial phases. By
+            default None.
         """
         SG.__init__(self, b, d, b1, d1, dstrata=dstrata, wt=wt,
                     fill_angle=fill_angle, bfill=bfill, nfill=nfill,
@@ -658,7 +734,11 @@ class SymmetricSolidModel(SG, SolidModel, Model):
                        deformation_boundary_condition=deformation_boundary_condition,
                        dynamic_boundary_condtions=dynamic_boundary_condtions,
                        shake_boundary_condtions=shake_boundary_condtions,
-                       boundary_interface=boundary_interface)
+                       boundary_interface=boundary_interface,
+                       results_dtype=results_dtype,
+                       instrument=instrument,
+                       cache=cache,
+                       project_cache=project_cache)
         self._init_foundation_material(concrete)
         if build:
             self.build()
@@ -795,6 +875,23 @@ class NonSymmetricSolidModel(NSG, SolidModel, Model):
         Include boundary interfaces needed for a base shake test.
         This requires a much denser mesh and more computationally
         demanding models. By default False.
+    results_dtype : str, optional
+        Floating point type used to store the displacement and force
+        results: 'float64' or 'float32'. Single precision halves the
+        memory of long dynamic and shake tests. By default 'float64'.
+    instrument : bool, optional
+        Count and time the remote calls to Plaxis. The report is
+        available in `call_report`. By default False.
+    cache : ResultsCache, str, None, optional
+        Persistent cache of calculated tests, or its folder. Tests
+        already calculated with the same model and test definition are
+        restored from the cache without calling Plaxis. By default
+        None.
+    project_cache : ProjectCache, str, None, optional
+        Persistent cache of built Plaxis projects, or its folder.
+        Models with the same definition open the cached project instead
+        of building it and calculating the initial phases. By default
+        None.
     
     Methods
     -------
@@ -803,13 +900,19 @@ class NonSymmetricSolidModel(NSG, SolidModel, Model):
     regen(s_i, g_i, g_o, test=False) : 
         Regenerates the model in Plaxis. Optinoally it recalculates
         previous load tests.
-    save(filename)
+    save(filename, archive=False)
         Saves model to file. Plaxis objects cannot be stored, only
         input properties and results. When loaded, the model can
         be regenerated with <regen> method.
-    load(filename)
+    load(filename, tests=None)
         Loads saved test.
-    failure_test(testid, load, max_load=[np.inf, np.inf, np.inf], load_factor=2, load_increment=[0, 0, 0], qsurf=None, start_from='construction', delete_fail=True)
+    checkpoint(path)
+        Checkpoints the model after every calculated phase.
+    resume(path, s_i, g_i, g_o)
+        Restores a checkpointed model after a crash.
+    bearing_capacity(load=[-1, 0, 0], method='vesic')
+        Analytical bearing capacity estimate of the foundation.
+    failure_test(testid, load, max_load=[np.inf, np.inf, np.inf], load_factor=2, load_increment=[0, 0, 0], qsurf=None, start_from='construction', delete_fail=True, search='increment', tolerance=0.05, warm_start=False, first_guess=None)
         Test the foundation until the model does not converge.
     load_test(testid, load, start_from='construction', qsurf=None, delete_fail=True)
         Conducts a load test in the model.
@@ -819,6 +922,10 @@ class NonSymmetricSolidModel(NSG, SolidModel, Model):
         Apply a dynamic load to the foundation.
     shake_test(testid, time, acceleration, start_from='construction', qsurf=None, nsubstep=10, delete_fail=True)
         Apply a displacement time history at the model base.
+    abuild(), aload_test(testid, ...), afailure_test(testid, ...), asafety_test(testid, ...), adynamic_test(testid, ...), ashake_test(testid, ...)
+        Asynchronous versions of the build and test methods.
+    run_plan(tests)
+        Calculates a test plan sharing the common phases of the tests.
     delete_test( testid, delete_phases=True) 
         Deletes a test from the model.
     plot(figsize=2.5, foundation=True, fill=True, soil=True, excavation=False, ratchetting=True, wt=True, interface=False, output_location=False)
@@ -858,7 +965,9 @@ class NonSymmetricSolidModel(NSG, SolidModel, Model):
                  deformation_boundary_condition=None,
                  dynamic_boundary_condtions=None,
                  shake_boundary_condtions=None, 
-                 boundary_interface=False):
+                 boundary_interface=False,
+                 results_dtype='float64', instrument=False,
+                 cache=None, project_cache=None):
         """Initialize a new instance of `NonSymmetricSolidModel`.
 
         Parameters
@@ -968,6 +1077,23 @@ class NonSymmetricSolidModel(NSG, SolidModel, Model):
             Include boundary interfaces needed for a base shake test.
             This requires a much denser mesh and more computationally
             demanding models. By default False.
+        results_dtype : str, optional
+            Floating point type used to store the displacement and force
+            results: 'float64' or 'float32'. Single precision halves the
+            memory of long dynamic and shake tests. By default 'float64'.
+        instrument : bool, optional
+            Count and time the remote calls to Plaxis. The report is
+            available in `call_report`. By default False.
+        cache : ResultsCache, str, None, optional
+            Persistent cache of calculated tests, or its folder. Tests
+            already calculated with the same model and test definition are
+            restored from the cache without calling Plaxis. By default
+            None.
+        project_cache : ProjectCache, str, None, optional
+            Persistent cache of built Plaxis projects, or its folder.
+            Models with the same definition open the cached project
+            instead of building it and calculating the initial phases. By
+            default None.
         """
         NSG.__init__(self, b, d, b1, d1, b2=b2, dstrata=dstrata, wt=wt,
                      fill_angle=fill_angle, bfill=bfill, nfill=nfill,
@@ -981,7 +1107,11 @@ class NonSymmetricSolidModel(NSG, SolidModel, Model):
                        deformation_boundary_condition=deformation_boundary_condition,
                        dynamic_boundary_condtions=dynamic_boundary_condtions,
                        shake_boundary_condtions=shake_boundary_condtions,
-                       boundary_interface=boundary_interface)
+                       boundary_interface=boundary_interface,
+                       results_dtype=results_dtype,
+                       instrument=instrument,
+                       cache=cache,
+                       project_cache=project_cache)
         self._init_foundation_material(concrete)
         if build:
             self.build()
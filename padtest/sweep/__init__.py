@@ -0,0 +1 @@
+from padtest.sweep.runner import Sweep, plaxis_server
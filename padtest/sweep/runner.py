@@ -0,0 +1,295 @@
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import copy
+import functools
+import multiprocessing
+import time
+
+import pandas as pd
+
+from padtest.model.plate import SymmetricPlateModel as SPlate
+from padtest.model.plate import NonSymmetricPlateModel as Plate
+from padtest.model.solid import SymmetricSolidModel as SSolid
+from padtest.model.solid import NonSymmetricSolidModel as Solid
+
+
+_MODELS = {'SSolid': SSolid, 'Solid': Solid, 'SPlate': SPlate, 'Plate': Plate}
+_TESTS = ['load_test', 'failure_test', 'safety_test', 'dynamic_test', 'shake_test']
+_worker = {} # servers of the worker process
+
+
+def plaxis_server(port_input, port_output, host='localhost', password=''):
+    """Connects to the Plaxis Input and Output remote scripting
+    servers. Default server factory of `Sweep`.
+
+    Parameters
+    ----------
+    port_input : int
+        Input server port.
+    port_output : int
+        Output server port.
+    host : str, optional
+        Server host. By default 'localhost'.
+    password : str, optional
+        Remote scripting password. By default ''.
+
+    Returns
+    -------
+    Server
+        Plaxis Input Application remote sripting server.
+    PlxProxyGlobalObject
+        Global object of the current open Plaxis model in Input.
+    PlxProxyGlobalObject
+        Global object of the current open Plaxis model in Output.
+    """
+    from plxscripting.easy import new_server
+    s_i, g_i = new_server(host, port_input, password=password)
+    _, g_o = new_server(host, port_output, password=password)
+    return s_i, g_i, g_o
+
+
+def _init_worker(ports, server_factory):
+    """Binds a worker process to a pair of server ports.
+
+    Parameters
+    ----------
+    ports : multiprocessing.Queue
+        Queue with the (input, output) ports not bound to a worker.
+    server_factory : callable
+        Server factory.
+    """
+    _worker['ports'] = ports.get()
+    _worker['factory'] = server_factory
+    _worker['servers'] = None
+
+
+def _run_case(index, case, tests, share_phases):
+    """Builds a model and runs the test plan in the worker process.
+
+    Parameters
+    ----------
+    index : int
+        Case index.
+    case : dict
+        Model constructor parameters, with the model class in the
+        'model' key.
+    tests : list
+        Test plan.
+    share_phases : bool
+        Runs the test plan with `Model.run_plan`, sharing the common
+        phases of the tests.
+
+    Returns
+    -------
+    dict
+        Case outcome with keys 'case', 'port', 'status', 'time' and
+        'results'.
+    """
+    start = time.perf_counter()
+    outcome = {'case': index, 'port': _worker['ports'], 'status': 'OK', 'results': None}
+    try:
+        if _worker['servers'] is None:
+            _worker['servers'] = _worker['factory'](*_worker['ports'])
+        case = copy.deepcopy(case)
+        model = _MODELS[case.pop('model', 'SSolid')](*_worker['servers'], **case)
+        if share_phases:
+            model.run_plan(tests)
+        else:
+            for test in copy.deepcopy(tests):
+                getattr(model, test.pop('test'))(**test)
+        outcome['results'] = model.results
+    except Exception as error:
+        # the connection is opened again for the next case
+        _worker['servers'] = None
+        outcome['status'] = '{}: {}'.format(type(error).__name__, error)
+    outcome['time'] = time.perf_counter() - start
+    return outcome
+
+
+class Sweep():
+    """Runs a parametric sweep of models over a pool of worker
+    processes, each one bound to its own pair of Plaxis Input and
+    Output server ports. Failed cases are retried in the next free
+    worker and the results of all the cases are merged in a single
+    table.
+
+    Worker processes are started with the `spawn` method, so scripts
+    running a sweep must be protected by `if __name__ == '__main__':`.
+
+    Parameters
+    ----------
+    ports : list
+        (input port, output port) of each Plaxis instance. One worker
+        process is started per pair.
+    server_factory : callable, None, optional
+        Function that takes the input and output ports and returns
+        `s_i`, `g_i` and `g_o`. It must be picklable, e.g. a module
+        level function or a `functools.partial`. If None
+        `plaxis_server` is used with the provided host and password.
+        By default None.
+    retries : int, optional
+        Number of times a failed case is run again. By default 1.
+    host : str, optional
+        Server host. By default 'localhost'.
+    password : str, optional
+        Remote scripting password. By default ''.
+    share_phases : bool, optional
+        Runs the test plan of each case with `Model.run_plan`, so the
+        phases common to several tests are calculated once. If False
+        the tests are run one after the other. By default False.
+
+    Methods
+    -------
+    run(cases, tests)
+        Runs the test plan in each case.
+    """
+
+    def __init__(self, ports, server_factory=None, retries=1,
+                 host='localhost', password='', share_phases=False):
+        """Initialize a new instance of `Sweep`.
+
+        Parameters
+        ----------
+        ports : list
+            (input port, output port) of each Plaxis instance. One
+            worker process is started per pair.
+        server_factory : callable, None, optional
+            Function that takes the input and output ports and returns
+            `s_i`, `g_i` and `g_o`. It must be picklable, e.g. a module
+            level function or a `functools.partial`. If None
+            `plaxis_server` is used with the provided host and
+            password. By default None.
+        retries : int, optional
+            Number of times a failed case is run again. By default 1.
+        host : str, optional
+            Server host. By default 'localhost'.
+        password : str, optional
+            Remote scripting password. By default ''.
+        share_phases : bool, optional
+            Runs the test plan of each case with `Model.run_plan`, so
+            the phases common to several tests are calculated once. If
+            False the tests are run one after the other. By default
+            False.
+
+        Raises
+        ------
+        RuntimeError
+            No server ports.
+        """
+        ports = [tuple(port) for port in ports]
+        if len(ports) == 0:
+            raise RuntimeError('At least one pair of server ports <(input, output)> is required.')
+        if server_factory is None:
+            server_factory = functools.partial(plaxis_server, host=host, password=password)
+        self._ports = ports
+        self._server_factory = server_factory
+        self._retries = retries
+        self._share_phases = share_phases
+        self._summary = None
+
+    #===================================================================
+    # PRIVATE METHODS
+    #===================================================================
+    @staticmethod
+    def _check_cases(cases, tests):
+        """Validates the cases and the test plan.
+
+        Parameters
+        ----------
+        cases : list
+            Model constructor parameters of each case.
+        tests : list
+            Test plan.
+
+        Raises
+        ------
+        RuntimeError
+            Unsupported model.
+        RuntimeError
+            Unsupported test.
+        """
+        for case in cases:
+            model = case.get('model', 'SSolid')
+            if model not in _MODELS:
+                msg = "Unsupported model <{}>. Supported models are 'SSolid', 'Solid', 'SPlate' and 'Plate'."
+                raise RuntimeError(msg.format(model))
+        for test in tests:
+            if test.get('test') not in _TESTS:
+                msg = ("Unsupported test <{}>. Supported tests are 'load_test', "
+                       "'failure_test', 'safety_test', 'dynamic_test' and 'shake_test'.")
+                raise RuntimeError(msg.format(test.get('test')))
+
+    #===================================================================
+    # PUBLIC METHODS
+    #===================================================================
+    @property
+    def summary(self):
+        """Outcome of each case of the last sweep: model, status ('OK'
+        or the error message), number of attempts, ports of the
+        last attempt and time [s] of the last attempt."""
+        return self._summary
+
+    def run(self, cases, tests):
+        """Runs the test plan in each case.
+
+        Parameters
+        ----------
+        cases : list
+            Model constructor parameters of each case, excluding the
+            servers. The 'model' key selects the model, 'SSolid',
+            'Solid', 'SPlate' or 'Plate', by default 'SSolid'.
+        tests : list
+            Test plan run in every case. Each test is a dictionary with
+            the test method in the 'test' key, e.g. 'load_test', and
+            the method parameters, e.g.
+            {'test': 'failure_test', 'testid': 'failure', 'load': -100}.
+
+        Returns
+        -------
+        pd.DataFrame
+            Results of the successful cases with the case index in the
+            'case' column. See `summary` for the outcome of each case.
+        """
+        self._check_cases(cases, tests)
+        context = multiprocessing.get_context('spawn')
+        ports = context.Queue()
+        for port in self._ports:
+            ports.put(port)
+
+        attempts = [0] * len(cases)
+        outcomes = [None] * len(cases)
+        with ProcessPoolExecutor(max_workers=len(self._ports), mp_context=context,
+                                 initializer=_init_worker,
+                                 initargs=(ports, self._server_factory)) as executor:
+            pending = set()
+            for index, case in enumerate(cases):
+                pending.add(executor.submit(_run_case, index, case, tests, self._share_phases))
+                attempts[index] += 1
+            while len(pending) > 0:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcome = future.result()
+                    index = outcome['case']
+                    outcomes[index] = outcome
+                    if outcome['status'] != 'OK' and attempts[index] <= self._retries:
+                        pending.add(executor.submit(_run_case, index, cases[index], tests,
+                                                     self._share_phases))
+                        attempts[index] += 1
+
+        self._summary = pd.DataFrame({'case': range(len(cases)),
+                                      'model': [case.get('model', 'SSolid') for case in cases],
+                                      'status': [outcome['status'] for outcome in outcomes],
+                                      'attempts': attempts,
+                                      'port': [outcome['port'] for outcome in outcomes],
+                                      'time': [outcome['time'] for outcome in outcomes]})
+        results = []
+        for outcome in outcomes:
+            if outcome['results'] is not None:
+                frame = outcome['results']
+                frame.insert(0, 'case', outcome['case'])
+                results.append(frame)
+        if len(results) == 0:
+            return pd.DataFrame()
+        categories = [column for column, dtype in results[0].dtypes.items() if dtype == 'category']
+        results = pd.concat(results, ignore_index=True)
+        results[categories] = results[categories].astype('category')
+        return results
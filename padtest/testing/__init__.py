@@ -0,0 +1 @@
+from padtest.testing.fake_plaxis import FakePlaxis
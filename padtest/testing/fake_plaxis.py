@@ -0,0 +1,621 @@
+import collections
+import pickle
+import time
+
+from padtest.model.scripting import PlxScriptingError
+
+
+_SERVERS = {} # servers by (input port, output port) in this process
+
+
+class FakeObject():
+    """Generic object of the fake Plaxis scripting interface. Any
+    attribute is created on first access, values are stored in the
+    `value` attribute and calling the object returns a new object.
+
+    Parameters
+    ----------
+    server : FakePlaxis
+        Fake Plaxis server.
+    path : str
+        Object name used to store phase dependent values.
+    value : object, optional
+        Object value. By default None.
+    """
+
+    def __init__(self, server, path, value=None):
+        """Initialize a new instance of `FakeObject`.
+
+        Parameters
+        ----------
+        server : FakePlaxis
+            Fake Plaxis server.
+        path : str
+            Object name used to store phase dependent values.
+        value : object, optional
+            Object value. By default None.
+        """
+        object.__setattr__(self, '_server', server)
+        object.__setattr__(self, '_path', path)
+        object.__setattr__(self, '_children', {})
+        object.__setattr__(self, 'value', value)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        child = self._children.get(name)
+        if child is None:
+            child = FakeObject(self._server, self._path + '.' + name)
+            self._children[name] = child
+        return child
+
+    def __setattr__(self, name, value):
+        if isinstance(value, FakePhase):
+            self._children[name] = value
+            return
+        if name == 'value':
+            object.__setattr__(self, name, value)
+            return
+        self._server._count('set')
+        getattr(self, name).value = value
+
+    def __getitem__(self, key):
+        if isinstance(key, FakePhase):
+            return FakeObject(self._server, self._path, self._server.g_i._lookup(self._path, key))
+        if isinstance(key, int):
+            return getattr(self, '_{}'.format(key))
+        return FakeObject(self._server, self._path)
+
+    def __iter__(self):
+        return iter([self[idx] for idx in range(4)])
+
+    def __call__(self, *args, **kwargs):
+        command = self._path.split('.')[-1]
+        self._server._count(command)
+        result = FakeObject(self._server, self._path + '()')
+        if self._path.startswith('g_i.'):
+            self._server.g_i._name(result, command)
+        return result
+
+    def setmaterial(self, *args):
+        self._server._count('setmaterial')
+
+
+class FakePhase(FakeObject):
+    """Calculation phase of the fake Plaxis Input.
+
+    Parameters
+    ----------
+    server : FakePlaxis
+        Fake Plaxis server.
+    parent : FakePhase, None
+        Parent phase.
+    number : int
+        Phase number.
+    """
+
+    def __init__(self, server, parent, number):
+        """Initialize a new instance of `FakePhase`.
+
+        Parameters
+        ----------
+        server : FakePlaxis
+            Fake Plaxis server.
+        parent : FakePhase, None
+            Parent phase.
+        number : int
+            Phase number.
+        """
+        name = 'InitialPhase' if number == 0 else 'Phase_{}'.format(number)
+        super().__init__(server, name)
+        object.__setattr__(self, 'parent', parent)
+        self.Name.value = name
+        self.Identification.value = name
+        self.Number.value = number
+
+
+class FakeStep():
+    """Calculation step of the fake Plaxis Output.
+
+    Parameters
+    ----------
+    server : FakePlaxis
+        Fake Plaxis server.
+    index : int
+        Step index in the phase.
+    nstep : int
+        Number of steps in the phase.
+    phase : FakePhase
+        Input phase of the step.
+    """
+
+    def __init__(self, server, index, nstep, phase):
+        """Initialize a new instance of `FakeStep`.
+
+        Parameters
+        ----------
+        server : FakePlaxis
+            Fake Plaxis server.
+        index : int
+            Step index in the phase.
+        nstep : int
+            Number of steps in the phase.
+        phase : FakePhase
+            Input phase of the step.
+        """
+        self.index = index
+        self.Reached = FakeObject(server, 'Reached')
+        self.Reached.SumMstage.value = (index + 1) / nstep
+        self.Reached.SumMsf.value = 1 + 0.1 * index
+        duration = phase.Deform.TimeIntervalSeconds.value or 0
+        self.Reached.DynamicTime.value = duration * (index + 1) / nstep
+
+
+class FakeInput(FakeObject):
+    """Global object of the fake Plaxis Input. Phase dependent values
+    set with `set`, `activate` and `deactivate` are stored by phase
+    and inherited by the child phases.
+
+    Parameters
+    ----------
+    server : FakePlaxis
+        Fake Plaxis server.
+    """
+
+    def __init__(self, server):
+        """Initialize a new instance of `FakeInput`.
+
+        Parameters
+        ----------
+        server : FakePlaxis
+            Fake Plaxis server.
+        """
+        super().__init__(server, 'g_i')
+        object.__setattr__(self, '_store', {})
+        object.__setattr__(self, 'phases', [])
+        object.__setattr__(self, 'polygons', [])
+        object.__setattr__(self, 'Soils', [])
+        object.__setattr__(self, 'InitialPhase', None)
+        object.__setattr__(self, '_names', collections.Counter())
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        method = getattr(type(self), '_call_' + name, None)
+        if method is None:
+            return FakeObject.__getattr__(self, name)
+        server = self._server
+
+        def remote_call(*args, **kwargs):
+            server._count(name)
+            return method(self, *args, **kwargs)
+        return remote_call
+
+    def _reset(self):
+        """Removes all the objects of the model."""
+        self._store.clear()
+        self.phases.clear()
+        self.polygons.clear()
+        self.Soils.clear()
+        self._children.clear()
+        self._names.clear()
+        phase = FakePhase(self._server, None, 0)
+        self.phases.append(phase)
+        object.__setattr__(self, 'InitialPhase', phase)
+
+    def _name(self, obj, command):
+        """Names a new object after the command that created it, so it
+        can be retrieved by name as in Plaxis.
+
+        Parameters
+        ----------
+        obj : FakeObject
+            New object.
+        command : str
+            Command name.
+        """
+        self._names[command] += 1
+        name = '{}_{}'.format(command, self._names[command])
+        obj.Name.value = name
+        self._children[name] = obj
+
+    def _lookup(self, path, phase):
+        """Value of a phase dependent property.
+
+        Parameters
+        ----------
+        path : str
+            Object name.
+        phase : FakePhase
+            Phase.
+
+        Returns
+        -------
+        object
+            Value in the phase or in its closest ancestor.
+        """
+        while phase is not None:
+            key = (path, phase.Name.value)
+            if key in self._store:
+                return self._store[key]
+            phase = phase.parent
+        return False if path.endswith('Active') else 0
+
+    def _call_set(self, target, *args):
+        if isinstance(target, FakePhase) and len(args) == 1:
+            self.Model._children['CurrentPhase'] = args[0]
+        elif len(args) == 1:
+            target.value = args[0]
+        else:
+            self._store[(target._path, args[0].Name.value)] = args[1]
+
+    def _call_activate(self, target, phase):
+        self._store[(target._path + '.Active', phase.Name.value)] = True
+
+    def _call_deactivate(self, target, phase):
+        self._store[(target._path + '.Active', phase.Name.value)] = False
+
+    def _call_phase(self, parent):
+        number = max(phase.Number.value for phase in self.phases) + 1
+        phase = FakePhase(self._server, parent, number)
+        self.phases.append(phase)
+        return phase
+
+    def _call_polygon(self, *vertices):
+        number = len(self.polygons) + 1
+        polygon = FakeObject(self._server, 'Polygon_{}'.format(number))
+        soil = FakeObject(self._server, 'Soil_{}'.format(number))
+        for obj in [polygon, soil]:
+            obj.Name.value = obj._path
+            self._children[obj._path] = obj
+        self.polygons.append(polygon)
+        soil_in_phase = FakeObject(self._server, 'Soil_{}_1'.format(number))
+        soil_in_phase.Name.value = 'Soil_{}_1'.format(number)
+        self.Soils.append(soil_in_phase)
+        return polygon, soil
+
+    def _call_calculate(self, phase):
+        self._server._calculate(phase)
+        for (path, name), value in self._store.items():
+            if name == phase.Name.value and path.split('.')[-1] in ('Fy', 'qy_start', 'qy_end'):
+                if abs(value) > self._server.capacity:
+                    return 'Calculation failed'
+        return 'OK'
+
+    def _call_save(self, filename):
+        self._server._save(filename)
+
+    def _call_view(self, phase):
+        self._server.g_o._sync()
+
+    def _call_delete(self, target):
+        if target in self.phases:
+            self.phases.remove(target)
+            self._server._calculated.discard(target.Name.value)
+            self._server.g_o._mirror.pop(target.Name.value, None)
+
+
+class FakeOutput(FakeObject):
+    """Global object of the fake Plaxis Output. The calculated phases
+    are mirrored when a phase is viewed and can be retrieved by their
+    Input name, e.g. `g_o.Phase_1`.
+
+    Parameters
+    ----------
+    server : FakePlaxis
+        Fake Plaxis server.
+    """
+
+    def __init__(self, server):
+        """Initialize a new instance of `FakeOutput`.
+
+        Parameters
+        ----------
+        server : FakePlaxis
+            Fake Plaxis server.
+        """
+        super().__init__(server, 'g_o')
+        object.__setattr__(self, 'phases', [])
+        object.__setattr__(self, '_mirror', {})
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name in self._mirror and self._mirror[name] in self.phases:
+            return self._mirror[name]
+        method = getattr(type(self), '_call_' + name, None)
+        if method is None:
+            return FakeObject.__getattr__(self, name)
+        server = self._server
+
+        def remote_call(*args, **kwargs):
+            server._count(name)
+            return method(self, *args, **kwargs)
+        return remote_call
+
+    def _reset(self):
+        """Removes all the phases."""
+        self._mirror.clear()
+        self.phases.clear()
+
+    def _sync(self):
+        """Updates the phases with the calculated Input phases."""
+        self.phases.clear()
+        for phase in self._server.g_i.phases:
+            name = phase.Name.value
+            if name not in self._server._calculated:
+                continue
+            if name not in self._mirror:
+                ophase = FakeObject(self._server, 'o' + name)
+                ophase.Identification.value = phase.Identification.value
+                ophase.Name.value = name
+                nstep = phase.Deform.MaxSteps.value or self._server.nstep
+                ophase.Steps.value = [FakeStep(self._server, idx, nstep, phase) for idx in range(nstep)]
+                self._mirror[name] = ophase
+            self._mirror[name].Identification.value = phase.Identification.value
+            self.phases.append(self._mirror[name])
+
+    def _call_addcurvepoint(self, kind, obj, coordinates):
+        point = FakeObject(self._server, 'CurvePoint')
+        point.x.value = coordinates[0]
+        return point
+
+    def _call_get_equivalent(self, obj):
+        return obj
+
+    def _call_update(self):
+        pass
+
+    def _call_delete(self, phase):
+        if phase in self.phases:
+            self.phases.remove(phase)
+
+    def _call_getcurveresults(self, point, step, result_type):
+        return -1e-4 * (step.index + 1) * (1 + abs(point.x.value or 0))
+
+    def _call_getcurveresultspath(self, point, phase_start, phase_end, result_type):
+        if not self._server.path_results:
+            raise PlxScriptingError('getcurveresultspath not available.')
+        steps = self._mirror[phase_start.Name.value].Steps.value
+        name = result_type._path.split('.')[-1]
+        if name in ['SumMstage', 'SumMsf', 'DynamicTime']:
+            return [getattr(step.Reached, name).value for step in steps]
+        return [self._call_getcurveresults(point, step, result_type) for step in steps]
+
+
+class FakePlaxis():
+    """Offline stand-in for the Plaxis remote scripting server with
+    its Input (`g_i`) and Output (`g_o`) global objects. It returns
+    synthetic phases, steps and curve results so that padtest models
+    can be built and tested without Plaxis, e.g. to measure the
+    padtest overhead. Every remote method call is counted in `calls`
+    and can be delayed to emulate the network latency.
+
+    Parameters
+    ----------
+    nstep : int, optional
+        Number of steps of the calculated phases that do not set
+        `MaxSteps`. By default 10.
+    capacity : float, optional
+        Calculations with a point load or line load larger than the
+        capacity fail. By default 1e9.
+    latency : float, optional
+        Delay of each remote call [s]. By default 0.
+    calculation_time : float, optional
+        Delay of each calculated step [s]. By default 0.
+    path_results : bool, optional
+        Support `getcurveresultspath` in Output. By default True.
+    command_batches : bool, optional
+        Support `call_and_handle_commands`. By default True.
+    failures : int, optional
+        Number of the first calls to `new` that raise a
+        ConnectionError, to emulate unavailable servers. By default 0.
+
+    Methods
+    -------
+    connect(port_input, port_output, **kwargs)
+        Fake server listening in a pair of ports.
+    new()
+        Starts a new project.
+    open(filename)
+        Opens a project saved with `g_i.save`.
+    call_and_handle_commands(*commands)
+        Runs a batch of commands.
+    reset_calls()
+        Resets the call counter.
+    """
+
+    def __init__(self, nstep=10, capacity=1e9, latency=0, calculation_time=0,
+                 path_results=True, command_batches=True, failures=0):
+        """Initialize a new instance of `FakePlaxis`.
+
+        Parameters
+        ----------
+        nstep : int, optional
+            Number of steps of the calculated phases that do not set
+            `MaxSteps`. By default 10.
+        capacity : float, optional
+            Calculations with a point load or line load larger than
+            the capacity fail. By default 1e9.
+        latency : float, optional
+            Delay of each remote call [s]. By default 0.
+        calculation_time : float, optional
+            Delay of each calculated step [s]. By default 0.
+        path_results : bool, optional
+            Support `getcurveresultspath` in Output. By default True.
+        command_batches : bool, optional
+            Support `call_and_handle_commands`. By default True.
+        failures : int, optional
+            Number of the first calls to `new` that raise a
+            ConnectionError, to emulate unavailable servers. By
+            default 0.
+        """
+        self.nstep = nstep
+        self.capacity = capacity
+        self.latency = latency
+        self.calculation_time = calculation_time
+        self.path_results = path_results
+        self.command_batches = command_batches
+        self.failures = failures
+        self.calls = collections.Counter()
+        self.commands = []
+        self._calculated = set()
+        self.g_i = FakeInput(self)
+        self.g_o = FakeOutput(self)
+
+    #===================================================================
+    # PRIVATE METHODS
+    #===================================================================
+    def _count(self, name):
+        """Counts a remote call.
+
+        Parameters
+        ----------
+        name : str
+            Call name.
+        """
+        self.calls[name] += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def _calculate(self, phase):
+        """Marks a phase as calculated.
+
+        Parameters
+        ----------
+        phase : FakePhase
+            Input phase.
+        """
+        self._calculated.add(phase.Name.value)
+        if self.calculation_time > 0:
+            nstep = phase.Deform.MaxSteps.value or self.nstep
+            time.sleep(self.calculation_time * nstep)
+
+    def _state(self):
+        """Objects of the open project.
+
+        Returns
+        -------
+        dict
+            Input and Output objects and calculated phases.
+        """
+        names = ['_store', 'phases', 'polygons', 'Soils', '_children', 'InitialPhase', '_names']
+        state = {'g_i.' + name: getattr(self.g_i, name) for name in names}
+        state.update({'g_o.' + name: getattr(self.g_o, name) for name in ['phases', '_mirror', '_children']})
+        state['calculated'] = self._calculated
+        return state
+
+    def _save(self, filename):
+        """Saves the open project to a file. The server is pickled as
+        a reference, so the project can be opened in any fake server.
+
+        Parameters
+        ----------
+        filename : str
+            Project file name.
+        """
+        server = self
+
+        class Pickler(pickle.Pickler):
+            def persistent_id(self, obj):
+                return 'server' if obj is server else None
+
+        with open(filename, 'wb') as handle:
+            Pickler(handle, protocol=pickle.HIGHEST_PROTOCOL).dump(self._state())
+
+    #===================================================================
+    # PUBLIC METHODS
+    #===================================================================
+    @classmethod
+    def connect(cls, port_input, port_output, **kwargs):
+        """Fake server listening in a pair of ports. As with Plaxis,
+        connecting again to the same ports in the same process returns
+        the same server. It has the signature of the server factories
+        of `padtest.sweep.Sweep`.
+
+        Parameters
+        ----------
+        port_input : int
+            Input server port.
+        port_output : int
+            Output server port.
+        **kwargs
+            `FakePlaxis` parameters used when the server is created.
+
+        Returns
+        -------
+        FakePlaxis
+            Input server.
+        FakeInput
+            Input global object.
+        FakeOutput
+            Output global object.
+        """
+        key = (port_input, port_output)
+        if key not in _SERVERS:
+            _SERVERS[key] = cls(**kwargs)
+        server = _SERVERS[key]
+        return server, server.g_i, server.g_o
+
+    def new(self):
+        """Starts a new project.
+
+        Raises
+        ------
+        ConnectionError
+            Emulated unavailable server.
+        """
+        self._count('new')
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError('Fake Plaxis server not available.')
+        self._calculated = set()
+        self.g_o._reset()
+        self.g_i._reset()
+
+    def open(self, filename):
+        """Opens a project saved with `g_i.save`.
+
+        Parameters
+        ----------
+        filename : str
+            Project file name.
+        """
+        self._count('open')
+        server = self
+
+        class Unpickler(pickle.Unpickler):
+            def persistent_load(self, pid):
+                return server
+
+        with open(filename, 'rb') as handle:
+            state = Unpickler(handle).load()
+        for key, value in state.items():
+            if key == 'calculated':
+                self._calculated = value
+            else:
+                target, name = key.split('.')
+                object.__setattr__(getattr(self, target), name, value)
+
+    def call_and_handle_commands(self, *commands):
+        """Runs a batch of commands. Commands are only stored.
+
+        Parameters
+        ----------
+        *commands : str
+            Plaxis commands.
+
+        Raises
+        ------
+        PlxScriptingError
+            Command batches not supported.
+        """
+        self._count('call_and_handle_commands')
+        if not self.command_batches:
+            raise PlxScriptingError('Command batches not available.')
+        self.commands.extend(commands)
+
+    def reset_calls(self):
+        """Resets the call counter."""
+        self.calls = collections.Counter()
+        self.commands = []
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+import padtest
+from padtest.model.extraction import ResultsExtractor
+from padtest.model.scripting import PlxScriptingError
+from padtest.testing import FakePlaxis
+
+
+SOIL = {'SoilModel': 'mc', 'gammaUnsat': 18, 'gammaSat': 20, 'ERef': 1e4,
+        'nu': 0.3, 'cref': 5, 'phi': 30}
+CONCRETE = {'SoilModel': 'linear elastic', 'gammaUnsat': 24, 'gammaSat': 24,
+            'ERef': 3e7, 'nu': 0.2}
+NSTEP = 5
+
+
+@pytest.fixture
+def model():
+    srv = FakePlaxis(nstep=NSTEP)
+    return padtest.SSolid(srv, srv.g_i, srv.g_o, 1.5, 1, 0.3, 0.3, SOIL, CONCRETE)
+
+
+def read(model, extractor):
+    """Reads the construction phase displacements and counts the calls."""
+    srv = model._s_i
+    ophase = model._ophases['construction']
+    points = list(model._output_point.values())
+    result_types = [srv.g_o.ResultTypes.Soil.Uy, srv.g_o.ResultTypes.Soil.Ux]
+    srv.reset_calls()
+    results = extractor.phase_results(ophase, points, result_types, NSTEP)
+    return results, srv.calls, len(points), len(result_types)
+
+
+def test_path_read(model):
+    results, calls, npoint, ntype = read(model, ResultsExtractor(model._g_o))
+    assert calls['getcurveresultspath'] == npoint * ntype
+    assert calls['getcurveresults'] == 0
+    steps, _, _, _ = read(model, ResultsExtractor(model._g_o, use_path=False))
+    np.testing.assert_array_equal(results, steps)
+
+
+def test_step_read(model):
+    _, calls, npoint, ntype = read(model, ResultsExtractor(model._g_o, use_path=False))
+    assert calls['getcurveresultspath'] == 0
+    assert calls['getcurveresults'] == npoint * ntype * NSTEP
+
+
+def test_fallback_read_is_not_sticky(model, monkeypatch):
+    reference, _, _, _ = read(model, ResultsExtractor(model._g_o, use_path=False))
+    path = type(model._g_o)._call_getcurveresultspath
+    failures = [1]
+
+    def flaky_path(self, *args):
+        if failures[0] > 0:
+            failures[0] -= 1
+            raise PlxScriptingError('Transient failure.')
+        return path(self, *args)
+
+    monkeypatch.setattr(type(model._g_o), '_call_getcurveresultspath', flaky_path)
+    extractor = ResultsExtractor(model._g_o)
+    results, calls, npoint, ntype = read(model, extractor)
+    np.testing.assert_array_equal(results, reference)
+    assert calls['getcurveresultspath'] == npoint * ntype
+    assert calls['getcurveresults'] == NSTEP
+
+    results, calls, npoint, ntype = read(model, extractor)
+    np.testing.assert_array_equal(results, reference)
+    assert calls['getcurveresultspath'] == npoint * ntype
+    assert calls['getcurveresults'] == 0
+
+
+def test_fallback_read_without_path_support(model):
+    model._s_i.path_results = False
+    reference, _, _, _ = read(model, ResultsExtractor(model._g_o, use_path=False))
+    results, calls, npoint, ntype = read(model, ResultsExtractor(model._g_o))
+    np.testing.assert_array_equal(results, reference)
+    assert calls['getcurveresults'] == npoint * ntype * NSTEP